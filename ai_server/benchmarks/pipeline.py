@@ -0,0 +1,231 @@
+"""
+new_posts 처리 벤치마크
+메시지마다 consume_message_queue를 순서대로 (기존 소비자) vs ArticlePipeline (단계별 동시 실행 제한 + 호스트별 크롤링 간격)
+
+실제 블로그, Upstage, DB 대신 단계마다 지정한 시간만큼 기다리는 함수를 넣어 소비자 구조만 비교한다.
+- db: 중복 확인 / 저장
+- crawl: 블로그 본문 요청 + 파싱
+- llm: Upstage 분류
+기존 소비자는 호스트와 상관없이 글마다 --sleep(기본 2초)을 쉬고, 파이프라인은 HostRateLimiter로
+같은 호스트에만 --host-rate 간격을 지킨다.
+
+큐에 섞인 플랫폼 비율(--mix)마다 실행한다. 기본은 네이버만 / 세 플랫폼 같은 비율 / 네이버 위주.
+메시지는 PipelineWorker로 넘기고 완료 순서대로 ack한 시각을 기록한다.
+출력: 처리 시간, 초당 글 수, 메시지 ack 지연 p50/p95, 일부 글이 NonRetryableMessageError / 일반 오류일 때의 ack/nack 수,
+같은 호스트 요청 사이 최소 간격 (1 / host-rate보다 짧으면 실패)
+
+사용법 (ai_server 디렉토리에서):
+    python benchmarks/pipeline.py
+    python benchmarks/pipeline.py --messages 60 --mix naver,tistory,velog --host-rate 1
+    python benchmarks/pipeline.py --mix naver=3,tistory,velog --crawl-concurrency 8 --llm-concurrency 8
+"""
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline import ArticlePipeline, PipelineWorker
+from politeness import HostRateLimiter
+from messages import NonRetryableMessageError
+
+# 플랫폼별 글 링크 (실제 크롤링 대상과 같은 호스트 모양)
+LINK_FORMATS = {
+    "naver": "https://blog.naver.com/user{i}/{j}",
+    "tistory": "https://user{i}.tistory.com/{j}",
+    "velog": "https://velog.io/@user{i}/{j}",
+}
+
+DEFAULT_MIXES = ["naver", "naver,tistory,velog", "naver=3,tistory,velog"]
+
+class Stages:
+    """단계 지연만 흉내 내는 service 함수 대역"""
+
+    def __init__(self, args, seed: int = 0):
+        self.args = args
+        self.random = random.Random(seed)
+        self.saved = 0
+        self.requests = []   # (호스트, 크롤링 요청 시각)
+        self._keys = HostRateLimiter(host_rates={}, shared_domains=None)
+        self._lock = threading.Lock()
+
+    def _wait(self, ms: float):
+        time.sleep(ms / 1000 * (0.5 + self.random.random()))
+
+    def check_exists(self, link, user_id, platform_name):
+        self._wait(self.args.db_ms)
+        if platform_name == "unknown":
+            raise NonRetryableMessageError(f"Platform not found: {platform_name}")
+        return False
+
+    def crawl(self, link):
+        with self._lock:
+            self.requests.append((self._keys.host_key(link), time.perf_counter()))
+        self._wait(self.args.crawl_ms)
+        if link.endswith("/broken"):
+            raise ConnectionError(link)
+        return {"title": link, "content": "본문"}
+
+    def classify(self, text):
+        self._wait(self.args.llm_ms)
+        return ["tech"]
+
+    def save(self, url, title, date, topics, user_id, platform_name):
+        self._wait(self.args.db_ms)
+        with self._lock:
+            self.saved += 1
+
+    def min_gap(self) -> float:
+        """같은 호스트 크롤링 요청 사이 최소 간격 (초, 요청이 하나뿐인 호스트만 있으면 inf)"""
+        last, gap = {}, float("inf")
+        for host, at in sorted(self.requests, key=lambda r: r[1]):
+            if host in last:
+                gap = min(gap, at - last[host])
+            last[host] = at
+        return gap
+
+def parse_mix(mix: str):
+    """"naver=3,tistory,velog" -> 가중치만큼 반복한 플랫폼 순서"""
+    order = []
+    for item in mix.split(","):
+        platform, _, weight = item.strip().partition("=")
+        order += [platform] * int(weight or 1)
+    return order
+
+def build_messages(count: int, per_message: int, mix: str, failures: bool):
+    """(data, articles) 목록 - failures면 마지막 두 메시지는 없는 플랫폼 / 크롤링 오류"""
+    order = parse_mix(mix)
+    messages = []
+    for i in range(count):
+        platform = order[i % len(order)]
+        articles = [{"link": LINK_FORMATS[platform].format(i=i, j=j), "published_at": "2025-11-17T03:00:00"} for j in range(per_message)]
+        messages.append(({"user_id": f"user{i}", "platform": platform}, articles))
+    if failures and count >= 2:
+        messages[-2][0]["platform"] = "unknown"
+        messages[-1][1][-1]["link"] += "/broken"
+    return messages
+
+def run_sequential(stages: Stages, messages, interval: float):
+    """기존 callback_new_posts: 메시지를 받은 스레드에서 글을 하나씩 처리하고 호스트와 상관없이 글마다 interval만큼 쉼"""
+    started = time.perf_counter()
+    latencies, outcomes = [], {"ack": 0, "nack": 0, "requeue": 0}
+    for data, articles in messages:
+        try:
+            for article in articles:
+                if stages.check_exists(article["link"], data["user_id"], data["platform"]):
+                    continue
+                crawled = stages.crawl(article["link"])
+                topics = stages.classify(crawled["content"])
+                stages.save(article["link"], crawled["title"], article["published_at"], topics, data["user_id"], data["platform"])
+                time.sleep(interval)
+            outcomes["ack"] += 1
+        except NonRetryableMessageError:
+            outcomes["nack"] += 1
+        except Exception:
+            outcomes["requeue"] += 1
+        # 모든 메시지가 시작 시각에 큐에 있었던 것으로 보고 ack까지 걸린 시간
+        latencies.append(time.perf_counter() - started)
+    return time.perf_counter() - started, latencies, outcomes
+
+def run_pipeline(stages: Stages, messages, args):
+    pipeline = ArticlePipeline(
+        check_exists=stages.check_exists,
+        crawl=stages.crawl,
+        classify=stages.classify,
+        save=stages.save,
+        permanent_errors=(NonRetryableMessageError,),
+        limiter=HostRateLimiter(rate=args.host_rate, burst=1, host_rates={}),
+        crawl_concurrency=args.crawl_concurrency,
+        llm_concurrency=args.llm_concurrency,
+        db_concurrency=args.db_concurrency,
+    )
+    worker = PipelineWorker(pipeline)
+    worker.start()
+
+    latencies, outcomes = [], {"ack": 0, "nack": 0, "requeue": 0}
+    lock = threading.Lock()
+    done = threading.Semaphore(0)
+    # 브로커 prefetch처럼 ack하지 않은 메시지가 prefetch개 차면 다음 메시지를 받지 않음
+    inflight = threading.Semaphore(args.prefetch)
+    started = time.perf_counter()
+
+    def finish(future):
+        error = future.exception()
+        with lock:
+            latencies.append(time.perf_counter() - started)
+            outcomes["ack" if error is None else "nack" if isinstance(error, NonRetryableMessageError) else "requeue"] += 1
+        inflight.release()
+        done.release()
+
+    for data, articles in messages:
+        inflight.acquire()
+        worker.submit(data, articles).add_done_callback(finish)
+    for _ in messages:
+        done.acquire()
+    elapsed = time.perf_counter() - started
+    worker.stop()
+    return elapsed, latencies, outcomes
+
+def percentile(values, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+def main(args) -> bool:
+    print(
+        f"{args.messages} messages x {args.articles_per_message} articles, stage ms db {args.db_ms} / crawl {args.crawl_ms} / llm {args.llm_ms}, "
+        f"sequential sleep {args.sleep}s, pipeline crawl {args.crawl_concurrency} / llm {args.llm_concurrency} / db {args.db_concurrency}, "
+        f"host rate {args.host_rate}/s, prefetch {args.prefetch}\n"
+    )
+    print(
+        f"{'mix':<24}{'consumer':<12}{'sec':>8}{'articles/s':>12}{'ack p50 s':>11}{'ack p95 s':>11}{'ack':>6}{'nack':>6}{'requeue':>9}"
+        f"{'speedup':>9}{'min host gap s':>16}"
+    )
+
+    ok = True
+    min_allowed_gap = 1 / args.host_rate if args.host_rate > 0 else 0.0
+    for mix in args.mix:
+        messages = build_messages(args.messages, args.articles_per_message, mix, args.failures)
+        articles = sum(len(a) for _, a in messages)
+        results = []
+        for label, run in (
+            ("sequential", lambda stages: run_sequential(stages, messages, args.sleep)),
+            ("pipeline", lambda stages: run_pipeline(stages, messages, args)),
+        ):
+            stages = Stages(args)
+            elapsed, latencies, outcomes = run(stages)
+            results.append((label, elapsed, outcomes))
+            gap = stages.min_gap()
+            if label == "pipeline" and gap < min_allowed_gap * 0.99:
+                ok = False
+            print(
+                f"{mix:<24}{label:<12}{elapsed:>8.2f}{articles / elapsed:>12.2f}{percentile(latencies, 0.5):>11.2f}{percentile(latencies, 0.95):>11.2f}"
+                f"{outcomes['ack']:>6}{outcomes['nack']:>6}{outcomes['requeue']:>9}{results[0][1] / elapsed:>8.1f}x{gap:>16.2f}"
+            )
+        # 두 소비자의 ack/nack 판정이 같아야 함
+        ok = ok and results[0][2] == results[1][2]
+    return ok
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=15, help="플랫폼 비율마다 보낼 new_posts 메시지 수")
+    parser.add_argument("--articles-per-message", type=int, default=1, help="메시지당 글 수 (1이면 예전 형식)")
+    parser.add_argument("--db-ms", type=float, default=10, help="DB 확인/저장 평균 지연")
+    parser.add_argument("--crawl-ms", type=float, default=300, help="블로그 크롤링 평균 지연")
+    parser.add_argument("--llm-ms", type=float, default=800, help="Upstage 분류 평균 지연")
+    parser.add_argument("--mix", nargs="+", default=DEFAULT_MIXES, help="큐의 플랫폼 비율 (naver / tistory / velog, =가중치)")
+    parser.add_argument("--sleep", type=float, default=2.0, help="기존 소비자가 글마다 쉬는 시간")
+    parser.add_argument("--host-rate", type=float, default=0.5, help="AI_CRAWL_HOST_RATE (호스트당 초당 크롤링 수)")
+    parser.add_argument("--crawl-concurrency", type=int, default=4, help="AI_CRAWL_CONCURRENCY")
+    parser.add_argument("--llm-concurrency", type=int, default=4, help="AI_LLM_CONCURRENCY")
+    parser.add_argument("--db-concurrency", type=int, default=2, help="AI_DB_CONCURRENCY")
+    parser.add_argument("--prefetch", type=int, default=16, help="AI_PREFETCH_COUNT")
+    parser.add_argument("--no-failures", dest="failures", action="store_false", help="실패 메시지 없이")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(0 if main(parse_args()) else 1)
@@ -5,11 +5,14 @@ from dotenv import load_dotenv
 import ssl
 import logging
 from enum import Enum
-from service import consume_message_queue, refresh_materialized_view, NonRetryableMessageError
+from service import consume_message_queue, refresh_materialized_view, create_article_pipeline
+from messages import NonRetryableMessageError, new_post_articles
+from pipeline import PipelineWorker, PREFETCH_COUNT
 from dependencies.database import Base, engine
 from models.models import Posts
 from pika.channel import Channel
 from threading import Thread
+from functools import partial
 
 Base.metadata.create_all(bind=engine)
 
@@ -24,8 +27,13 @@ logging.basicConfig(
 )
 
 
-total_article_count = 0
-current_article_count = 0
+# 발행됐지만 아직 처리(ack 또는 버림)되지 않은 새 글 수 (refresh init만큼 늘고 progress만큼 줄어듦)
+# init마다 0부터 다시 세면 앞선 tick/배포 요청의 글이 아직 처리 중일 때 다음 init 몫으로 세어지므로 누적한다.
+# progress가 init보다 먼저 오면 음수가 될 수 있다.
+pending_article_count = 0
+
+# new_posts 글 처리 파이프라인 (별도 이벤트 루프 스레드)
+pipeline_worker = PipelineWorker(create_article_pipeline())
 
 # 오타 방지
 class Channels(Enum):
@@ -65,8 +73,9 @@ def get_rabbitmq_connection():
 
 
 
-def publish_progress(ch):
-    msg = json.dumps({"type": "progress"}, ensure_ascii=False)
+def publish_progress(ch, count: int = 1):
+    # count: 이번에 처리한 글 수 (배치 메시지는 글 수만큼 한 번에)
+    msg = json.dumps({"type": "progress", "count": count}, ensure_ascii=False)
     ch.basic_publish(exchange='', routing_key=Channels.REFRESH.value, body=msg)
 
 def publish_platform_register_progress(ch, user_id: str, platform: str):
@@ -78,24 +87,41 @@ def callback_new_posts(ch: Channel, method, properties, body):
     logger.info(f"Received message: {data}")
     logger.info(f"type: {type(data)}")
     try:
-        consume_message_queue(data['article']['link'], data['user_id'], data['platform'], data['article']['published_at'])
-        publish_progress(ch)
-        ch.basic_ack(delivery_tag=method.delivery_tag)
+        articles = new_post_articles(data)
     except NonRetryableMessageError as e:
-        logger.error(f"Non-retryable failure(new_posts): {e}")
-        publish_progress(ch)
-        ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
-        return
-    except Exception as e:
-        logger.exception(f"Retryable failure(new_posts): {e}")
-        # 실패한 경우라도 카운팅은 해야하니 publish_progress(ch)를 호출
-        publish_progress(ch)
-        ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+        finish_new_posts(ch, method.delivery_tag, 1, e)
         return
+
+    # 파이프라인에 넘기고 바로 다음 메시지를 받음 (동시 처리 메시지 수는 prefetch로 제한)
+    # 배치는 한 단위로 처리: 글 하나라도 실패하면 통째로 다시 받고, 이미 저장한 글은 _check_exist_post에서 건너뜀
+    future = pipeline_worker.submit(data, articles)
+    future.add_done_callback(
+        lambda f: ch.connection.add_callback_threadsafe(
+            partial(finish_new_posts, ch, method.delivery_tag, len(articles), f.exception())
+        )
+    )
+
+def finish_new_posts(ch: Channel, delivery_tag: int, count: int, error: Exception | None):
+    """
+    new_posts 메시지 처리 결과로 ack/nack (소비 스레드에서 실행)
+
+    진행률은 메시지가 아니라 글 단위로 센다 (refresh init count = 새 글 수)
+    다시 받을 메시지(requeue)는 세지 않고 ack하거나 버릴 때만 센다. (재시도마다 세면 저장 전에 refresh됨)
+    """
+    if error is None:
+        publish_progress(ch, count)
+        ch.basic_ack(delivery_tag=delivery_tag)
+    elif isinstance(error, NonRetryableMessageError):
+        logger.error(f"Non-retryable failure(new_posts): {error}")
+        publish_progress(ch, count)
+        ch.basic_nack(delivery_tag=delivery_tag, requeue=False)
+    else:
+        logger.error(f"Retryable failure(new_posts): {error}", exc_info=error)
+        ch.basic_nack(delivery_tag=delivery_tag, requeue=True)
     
 
 def callback_refresh(ch: Channel, method, properties, body):
-    global total_article_count, current_article_count
+    global pending_article_count
     data = json.loads(body)
     logger.info(f"Received message: {data}")
 
@@ -104,8 +130,14 @@ def callback_refresh(ch: Channel, method, properties, body):
         logger.info(f"Processing message type: {msg_type}")
 
         if msg_type == 'init':
-            total_article_count = data['count']
-            current_article_count = 0
+            previous_count = pending_article_count
+            pending_article_count += data['count']
+            logger.info(f"Pending article count: {pending_article_count}")
+            # 이 init의 글이 모두 먼저 처리된 경우
+            if previous_count < 0 and pending_article_count <= 0 < data['count']:
+                logger.info("All articles processed")
+                refresh_materialized_view()
+                logger.info("Materialized view refreshed")
             ch.basic_ack(delivery_tag=method.delivery_tag)
             return
 
@@ -118,10 +150,12 @@ def callback_refresh(ch: Channel, method, properties, body):
             ch.basic_ack(delivery_tag=method.delivery_tag)
             return
 
-        current_article_count += 1
-        logger.info(f"Current article count: {current_article_count}")
-        logger.info(f"Total article count: {total_article_count}")
-        if current_article_count == total_article_count:
+        # 예전 progress 메시지에는 count가 없음 (글 하나)
+        previous_count = pending_article_count
+        pending_article_count -= data.get('count', 1)
+        logger.info(f"Pending article count: {pending_article_count}")
+        # 배치 progress는 여러 개씩 줄어드므로 남은 글이 0 이하가 되는 순간 한 번만
+        if previous_count > 0 >= pending_article_count:
             logger.info("All articles processed")
             refresh_materialized_view()
             logger.info("Materialized view refreshed")
@@ -153,13 +187,19 @@ def callback_platform_register(ch: Channel, method, properties, body):
 
 def start_worker():
     channel = get_rabbitmq_connection().channel()
+    # ack하지 않은 메시지를 이만큼만 받아 파이프라인에 동시에 올라가는 글 수 제한
+    channel.basic_qos(prefetch_count=PREFETCH_COUNT)
     channel.queue_declare(queue=Channels.NEW_POSTS.value)
     channel.basic_consume(queue=Channels.NEW_POSTS.value, on_message_callback=callback_new_posts)
     channel.queue_declare(queue=Channels.REFRESH.value)
     channel.basic_consume(queue=Channels.REFRESH.value, on_message_callback=callback_refresh)
     channel.queue_declare(queue=Channels.PLATFORM_REGISTER.value)
     channel.basic_consume(queue=Channels.PLATFORM_REGISTER.value, on_message_callback=callback_platform_register)
-    channel.start_consuming()
+    pipeline_worker.start()
+    try:
+        channel.start_consuming()
+    finally:
+        pipeline_worker.stop()
 
 
 start_worker()
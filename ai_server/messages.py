@@ -0,0 +1,16 @@
+class NonRetryableMessageError(Exception):
+    """Permanent failure for invalid or unsupported queue payloads."""
+
+
+def new_post_articles(data: dict) -> list:
+    """
+    new_posts 메시지의 글 목록
+
+    post_observer는 사용자-플랫폼의 새 글을 {"user_id", "platform", "articles": [...]} 한 메시지로 묶어 보내고,
+    이전 형식 {"user_id", "platform", "article": {...}} (글마다 메시지 하나)도 그대로 받는다.
+    """
+    if 'articles' in data:
+        return data['articles']
+    if 'article' in data:
+        return [data['article']]
+    raise NonRetryableMessageError("new_posts message has neither 'articles' nor 'article'")
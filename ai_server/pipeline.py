@@ -0,0 +1,133 @@
+import os
+import asyncio
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Thread
+from typing import Callable, Dict, List, Optional, Tuple, Type
+from politeness import HostRateLimiter
+
+logger = logging.getLogger(__name__)
+
+# 단계별 동시 실행 수 (크롤링 / Upstage 분류 / DB 확인·저장)
+CRAWL_CONCURRENCY = int(os.getenv("AI_CRAWL_CONCURRENCY", "4"))
+LLM_CONCURRENCY = int(os.getenv("AI_LLM_CONCURRENCY", "4"))
+DB_CONCURRENCY = int(os.getenv("AI_DB_CONCURRENCY", "2"))
+
+# new_posts 큐에서 ack 전에 미리 받아 둘 메시지 수 (동시에 처리 중인 메시지 상한)
+PREFETCH_COUNT = int(os.getenv("AI_PREFETCH_COUNT", "16"))
+
+
+class ArticlePipeline:
+    """
+    new_posts 글 처리 파이프라인 (DB 중복 확인 -> 크롤링 -> Upstage 분류 -> DB 저장)
+
+    각 단계는 기존 service 함수(동기)를 스레드에서 실행하고, 단계마다 세마포어로 동시 실행 수를 따로 제한한다.
+    한 글이 크롤링 응답을 기다리는 동안 다른 글은 분류나 저장을 진행하므로 글 하나씩 순서대로 처리할 때보다
+    단계 대기 시간이 겹친다.
+    """
+
+    def __init__(
+        self,
+        check_exists: Callable[[str, str, str], bool],
+        crawl: Callable[[str], Dict[str, str]],
+        classify: Callable[[str], List[str]],
+        save: Callable[..., None],
+        permanent_errors: Tuple[Type[BaseException], ...] = (),
+        limiter: Optional[HostRateLimiter] = None,
+        crawl_concurrency: int = CRAWL_CONCURRENCY,
+        llm_concurrency: int = LLM_CONCURRENCY,
+        db_concurrency: int = DB_CONCURRENCY,
+    ):
+        self.check_exists = check_exists
+        self.crawl = crawl
+        self.classify = classify
+        self.save = save
+        self.permanent_errors = permanent_errors
+        self.limiter = limiter
+        self._crawl_slots = asyncio.Semaphore(max(1, crawl_concurrency))
+        self._llm_slots = asyncio.Semaphore(max(1, llm_concurrency))
+        self._db_slots = asyncio.Semaphore(max(1, db_concurrency))
+        # 모든 단계가 동시에 꽉 차도 스레드를 기다리지 않도록
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, crawl_concurrency) + max(1, llm_concurrency) + max(1, db_concurrency),
+            thread_name_prefix="pipeline",
+        )
+
+    async def _run(self, slots: asyncio.Semaphore, fn, *args):
+        async with slots:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def _crawl_page(self, link: str) -> Dict[str, str]:
+        # 호스트 토큰은 크롤링 슬롯을 잡은 뒤 요청 직전에 확인한다. (슬롯 밖에서 기다리면 슬롯이 비는 순간
+        # 같은 호스트 요청이 한꺼번에 나감) 토큰이 없으면 슬롯을 놓고 기다려 다른 호스트의 글을 막지 않는다.
+        loop = asyncio.get_running_loop()
+        while True:
+            async with self._crawl_slots:
+                wait = self.limiter.try_acquire(link) if self.limiter is not None else 0.0
+                if not wait:
+                    return await loop.run_in_executor(self._executor, self.crawl, link)
+            await asyncio.sleep(wait)
+
+    async def process_article(self, link: str, user_id: str, platform_name: str, date: str):
+        """service.consume_message_queue와 같은 처리"""
+        if await self._run(self._db_slots, self.check_exists, link, user_id, platform_name):
+            return
+        crawled_data = await self._crawl_page(link)
+
+        content = crawled_data.get("content", "")
+        title = crawled_data.get("title", "")
+
+        if content:
+            input_text = f"제목: {title}\n본문: {content}"
+            topics = await self._run(self._llm_slots, self.classify, input_text)
+            await self._run(self._db_slots, self.save, link, title, date, topics, user_id, platform_name)
+        else:
+            logger.info(f"No content found for URL: {link}")
+
+    async def process_message(self, data: dict, articles: list):
+        """
+        new_posts 메시지 하나를 한 단위로 처리 (배치의 글은 동시에)
+
+        글 하나라도 실패하면 예외를 올린다. permanent_errors(NonRetryableMessageError)가 있으면 그것을 우선한다.
+        (배치는 같은 사용자-플랫폼이라 플랫폼이 없으면 모든 글이 같은 이유로 실패)
+        """
+        results = await asyncio.gather(
+            *(self.process_article(article['link'], data['user_id'], data['platform'], article['published_at']) for article in articles),
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            raise next((e for e in errors if isinstance(e, self.permanent_errors)), errors[0])
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class PipelineWorker:
+    """
+    ArticlePipeline을 돌리는 이벤트 루프 스레드
+
+    pika BlockingConnection은 스레드 안전하지 않으므로 소비 스레드는 메시지를 넘기기만 하고,
+    완료 후 ack/nack는 connection.add_callback_threadsafe로 소비 스레드에서 실행한다.
+    """
+
+    def __init__(self, pipeline: ArticlePipeline):
+        self.pipeline = pipeline
+        self.loop = asyncio.new_event_loop()
+        self._thread = Thread(target=self._run, name="article-pipeline", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, data: dict, articles: list) -> Future:
+        """메시지 처리를 루프에 넘기고 완료 Future 반환 (어느 스레드에서나 호출 가능)"""
+        return asyncio.run_coroutine_threadsafe(self.pipeline.process_message(data, articles), self.loop)
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.pipeline.close()
@@ -0,0 +1,117 @@
+import os
+import time
+import logging
+from threading import Lock
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# 호스트 하나에 보낼 크롤링 요청 수 (초당, 기본 0.5 = 2초에 한 번 - 기존 글마다 time.sleep(2)와 같은 간격)
+CRAWL_HOST_RATE = float(os.getenv("AI_CRAWL_HOST_RATE", "0.5"))
+
+# 쉬고 있던 호스트에 간격 없이 연달아 보낼 수 있는 요청 수
+CRAWL_HOST_BURST = int(os.getenv("AI_CRAWL_HOST_BURST", "1"))
+
+# 호스트별 요청 수 (초당) 덮어쓰기 - "blog.naver.com=0.5,velog.io=1"
+CRAWL_HOST_RATES = {
+    host.strip(): float(rate)
+    for host, _, rate in (item.partition("=") for item in os.getenv("AI_CRAWL_HOST_RATES", "").split(",") if item.strip())
+}
+
+# 서브도메인이 달라도 같은 서버로 보고 한 호스트로 묶을 도메인
+# (티스토리 블로그마다 서브도메인, 네이버는 크롤링할 때 m.blog.naver.com으로 바꿈)
+CRAWL_SHARED_DOMAINS = [
+    domain.strip() for domain in os.getenv("AI_CRAWL_SHARED_DOMAINS", "tistory.com,blog.naver.com").split(",") if domain.strip()
+]
+
+
+class _Bucket:
+    __slots__ = ("interval", "tolerance", "next_at")
+
+    def __init__(self, rate: float, burst: int):
+        self.interval = 1 / rate if rate > 0 else 0.0
+        # 토큰이 burst개 쌓여 있으면 next_at보다 이만큼 앞서 보내도 됨
+        self.tolerance = self.interval * (max(1, burst) - 1)
+        self.next_at = 0.0   # 예약된 요청이 모두 간격을 지켜 나간 뒤 다음 요청 시각 (monotonic)
+
+
+class HostRateLimiter:
+    """
+    호스트별 크롤링 요청 간격 제한 (토큰 버킷)
+
+    호스트마다 초당 rate개의 토큰이 burst개까지 쌓이고 요청마다 하나를 쓴다.
+    - reserve: 토큰을 미리 예약하고 기다릴 시간만 돌려준다. 기다린 직후 바로 요청하는 스레드용 (time.sleep)
+    - try_acquire: 토큰이 있을 때만 쓴다. 동시 실행 슬롯 안에서 요청 직전에 확인하는 파이프라인용
+    요청이 없던 호스트의 글은 기다리지 않는다.
+    """
+
+    def __init__(
+        self,
+        rate: float = CRAWL_HOST_RATE,
+        burst: int = CRAWL_HOST_BURST,
+        host_rates: Optional[Dict[str, float]] = None,
+        shared_domains: Optional[List[str]] = None,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.host_rates = CRAWL_HOST_RATES if host_rates is None else host_rates
+        self.shared_domains = CRAWL_SHARED_DOMAINS if shared_domains is None else shared_domains
+        self._buckets: Dict[str, _Bucket] = {}
+        self._lock = Lock()
+
+    def host_key(self, url: str) -> str:
+        """간격을 지킬 단위 호스트 (공유 도메인의 서브도메인은 도메인 하나로)"""
+        host = (urlsplit(url).hostname or "").lower()
+        for domain in self.shared_domains:
+            if host == domain or host.endswith("." + domain):
+                return domain
+        return host
+
+    def rate_for(self, key: str) -> float:
+        return self.host_rates.get(key, self.rate)
+
+    def _bucket(self, key: str) -> _Bucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket(self.rate_for(key), self.burst)
+        return bucket
+
+    def reserve(self, url: str, now: Optional[float] = None) -> float:
+        """
+        url의 호스트에 요청 하나를 예약하고 기다려야 할 시간(초) 반환
+
+        rate가 0 이하인 호스트는 제한하지 않는다.
+        """
+        key = self.host_key(url)
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            bucket = self._bucket(key)
+            if not bucket.interval:
+                return 0.0
+            next_at = max(bucket.next_at, now)
+            delay = max(0.0, next_at - bucket.tolerance - now)
+            bucket.next_at = next_at + bucket.interval
+        if delay:
+            logger.debug(f"Waiting {delay:.2f}s before crawling {key}")
+        return delay
+
+    def try_acquire(self, url: str, now: Optional[float] = None) -> float:
+        """
+        토큰이 있으면 써서 0을, 없으면 쓰지 않고 토큰이 생길 때까지 남은 시간(초)을 반환
+
+        reserve와 달리 예약하지 않으므로, 기다린 뒤 다시 호출해 토큰을 얻은 바로 그때 요청을 보내야 한다.
+        (동시 실행 슬롯을 잡은 뒤 호출해 슬롯을 기다리는 동안 간격이 무너지지 않도록)
+        """
+        key = self.host_key(url)
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            bucket = self._bucket(key)
+            if not bucket.interval:
+                return 0.0
+            next_at = max(bucket.next_at, now)
+            wait = next_at - bucket.tolerance - now
+            if wait > 0:
+                return wait
+            bucket.next_at = next_at + bucket.interval
+        return 0.0
@@ -10,6 +10,9 @@ from dependencies.database import DbSession
 from models.models import Posts, Platform
 from sqlalchemy.orm import Session
 from sqlalchemy import text
+from pipeline import ArticlePipeline
+from politeness import HostRateLimiter
+from messages import NonRetryableMessageError
 import logging
 
 load_dotenv()
@@ -23,10 +26,8 @@ UPSTAGE_MODEL = 'solar-1-mini-chat'
 
 logger = logging.getLogger(__name__)
 
-
-class NonRetryableMessageError(Exception):
-    """Permanent failure for invalid or unsupported queue payloads."""
-
+# 블로그 호스트별 크롤링 간격 (new_posts 파이프라인과 platform_register 스레드가 함께 사용)
+crawl_limiter = HostRateLimiter()
 
 
 def _normalize_date(date_str: str) -> str:
@@ -207,10 +208,23 @@ def refresh_materialized_view():
     finally:
         db.close()
 
+def create_article_pipeline() -> ArticlePipeline:
+    """consume_message_queue의 단계를 단계별 동시 실행 수가 제한된 비동기 파이프라인으로 (new_posts 소비용)"""
+    return ArticlePipeline(
+        check_exists=_check_exist_post,
+        crawl=_crawl_webpage,
+        classify=_classify_topics_with_upstage,
+        save=_save_to_db,
+        permanent_errors=(NonRetryableMessageError,),
+        limiter=crawl_limiter,
+    )
+
 def consume_message_queue(link: str, user_id: str, platform_name: str, date: str):
     print("\n========================================")
     if _check_exist_post(link, user_id, platform_name):
         return
+    # 같은 호스트에 최근 요청했으면 간격만큼 기다림 (쉬고 있던 호스트는 바로)
+    time.sleep(crawl_limiter.reserve(link))
     crawled_data = _crawl_webpage(link)
     
     content = crawled_data.get("content", "")
@@ -223,8 +237,6 @@ def consume_message_queue(link: str, user_id: str, platform_name: str, date: str
     else:
         logger.info("No content found for URL: {url}")
 
-    time.sleep(2) 
-
 
 if __name__ == "__main__":
     sample_links = [
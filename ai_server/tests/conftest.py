@@ -0,0 +1,7 @@
+import os
+import sys
+
+# ai_server 모듈은 패키지가 아니라 작업 디렉토리 기준으로 import (python main.py와 같은 방식)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# post_observer가 보내는 new_posts 메시지 형식 확인용 (app.models.schemas), 같은 이름의 main.py가 가리지 않도록 뒤에 추가
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "post_observer"))
@@ -0,0 +1,62 @@
+import json
+import asyncio
+from datetime import datetime, timezone
+import pytest
+from app.models.schemas import ArticleRecord, ArticleSchema, encode_new_post_message, encode_new_posts_batch_message
+from messages import NonRetryableMessageError, new_post_articles
+from pipeline import ArticlePipeline
+
+ARTICLES = [
+    ArticleRecord("파이썬 비동기 정리", "https://velog.io/@a/async", datetime(2025, 11, 17, 3, 0), None, ["파이썬", "asyncio"]),
+    ArticleRecord("Release notes", "https://a.tistory.com/12", datetime(2025, 11, 16, 9, 30, tzinfo=timezone.utc), "https://img/1.png", []),
+    ArticleRecord("제목 \"따옴표\"", "https://blog.naver.com/a/2233", datetime(2025, 11, 15, 0, 0), None, None),
+]
+
+class Saver:
+    """DB 확인 / 크롤링 / 분류 단계 대역 (저장 인자만 기록)"""
+
+    def __init__(self):
+        self.saved = []
+
+    def check_exists(self, link, user_id, platform_name):
+        return False
+
+    def crawl(self, link):
+        return {"title": link, "content": "본문"}
+
+    def classify(self, text):
+        return ["tech"]
+
+    def save(self, url, title, date, topics, user_id, platform_name):
+        self.saved.append((url, date, user_id, platform_name))
+
+def consume(body: str):
+    """callback_new_posts처럼 메시지를 읽어 파이프라인으로 처리하고 저장 인자 반환"""
+    data = json.loads(body)
+    articles = new_post_articles(data)
+    saver = Saver()
+    pipeline = ArticlePipeline(saver.check_exists, saver.crawl, saver.classify, saver.save)
+    asyncio.run(pipeline.process_message(data, articles))
+    pipeline.close()
+    return articles, sorted(saver.saved)
+
+def expected_article(article: ArticleRecord) -> dict:
+    return ArticleSchema(
+        title=article.title, link=article.link, published_at=article.published_at, thumbnail=article.thumbnail, tags=article.tags,
+    ).model_dump(mode="json")
+
+def test_batch_message_round_trip():
+    body = encode_new_posts_batch_message("user-1", "velog", ARTICLES)
+    articles, saved = consume(body)
+    assert articles == [expected_article(article) for article in ARTICLES]
+    assert saved == sorted((article.link, expected_article(article)["published_at"], "user-1", "velog") for article in ARTICLES)
+
+def test_single_article_message_round_trip():
+    body = encode_new_post_message("user-1", "naver", ARTICLES[2])
+    articles, saved = consume(body)
+    assert articles == [expected_article(ARTICLES[2])]
+    assert saved == [(ARTICLES[2].link, "2025-11-15T00:00:00", "user-1", "naver")]
+
+def test_message_without_articles_is_not_retried():
+    with pytest.raises(NonRetryableMessageError):
+        new_post_articles({"user_id": "user-1", "platform": "velog"})
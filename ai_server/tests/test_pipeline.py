@@ -0,0 +1,109 @@
+import time
+import asyncio
+import threading
+import pytest
+from pipeline import ArticlePipeline
+from politeness import HostRateLimiter
+
+class NonRetryable(Exception):
+    pass
+
+class Recorder:
+    """크롤링 요청 시각을 기록하는 단계 대역"""
+
+    def __init__(self, slow_links=(), slow_seconds=0.0):
+        self.slow_links = set(slow_links)
+        self.slow_seconds = slow_seconds
+        self.requests = []
+        self.saved = []
+        self._lock = threading.Lock()
+
+    def check_exists(self, link, user_id, platform_name):
+        if platform_name == "unknown":
+            raise NonRetryable(platform_name)
+        return link.endswith("/dup")
+
+    def crawl(self, link):
+        with self._lock:
+            self.requests.append((link, time.monotonic()))
+        if link in self.slow_links:
+            time.sleep(self.slow_seconds)
+        if link.endswith("/broken"):
+            raise ConnectionError(link)
+        return {"title": link, "content": "본문"}
+
+    def classify(self, text):
+        return ["tech"]
+
+    def save(self, url, title, date, topics, user_id, platform_name):
+        with self._lock:
+            self.saved.append(url)
+
+def make_pipeline(recorder, limiter=None, crawl_concurrency=2):
+    return ArticlePipeline(
+        check_exists=recorder.check_exists,
+        crawl=recorder.crawl,
+        classify=recorder.classify,
+        save=recorder.save,
+        permanent_errors=(NonRetryable,),
+        limiter=limiter,
+        crawl_concurrency=crawl_concurrency,
+        llm_concurrency=2,
+        db_concurrency=2,
+    )
+
+def message(platform, *links):
+    return {"user_id": "u", "platform": platform}, [{"link": link, "published_at": "2025-11-17T03:00:00"} for link in links]
+
+def test_same_host_spacing_survives_busy_crawl_slots():
+    # 느린 크롤링 두 개가 슬롯을 모두 잡고 있는 동안 같은 호스트 글 세 개가 대기
+    interval = 0.2
+    slow = ["https://velog.io/@a/slow", "https://a.tistory.com/slow"]
+    naver = [f"https://blog.naver.com/u/{i}" for i in range(3)]
+    recorder = Recorder(slow_links=slow, slow_seconds=0.3)
+    limiter = HostRateLimiter(rate=1 / interval, burst=1, host_rates={}, shared_domains=["tistory.com", "blog.naver.com"])
+    pipeline = make_pipeline(recorder, limiter, crawl_concurrency=2)
+
+    async def run():
+        slow_task = asyncio.gather(*(pipeline.process_message(*message("velog", link)) for link in slow))
+        await asyncio.sleep(0.05)
+        await asyncio.gather(pipeline.process_message(*message("naver", *naver)), slow_task)
+
+    asyncio.run(run())
+    pipeline.close()
+
+    naver_times = sorted(at for link, at in recorder.requests if "naver" in link)
+    assert len(naver_times) == 3
+    gaps = [b - a for a, b in zip(naver_times, naver_times[1:])]
+    assert min(gaps) >= interval * 0.95
+    assert sorted(recorder.saved) == sorted(slow + naver)
+
+def test_idle_host_not_blocked_by_waiting_host():
+    # 네이버 글이 간격을 기다리는 동안 슬롯을 잡고 있지 않아 velog 글이 바로 나감
+    recorder = Recorder()
+    limiter = HostRateLimiter(rate=1, burst=1, host_rates={}, shared_domains=["blog.naver.com"])
+    pipeline = make_pipeline(recorder, limiter, crawl_concurrency=1)
+
+    async def run():
+        await asyncio.gather(
+            pipeline.process_message(*message("naver", "https://blog.naver.com/u/1", "https://blog.naver.com/u/2")),
+            pipeline.process_message(*message("velog", "https://velog.io/@a/1")),
+        )
+
+    started = time.monotonic()
+    asyncio.run(run())
+    pipeline.close()
+    velog_at = next(at for link, at in recorder.requests if "velog" in link)
+    assert velog_at - started < 0.5
+
+def test_batch_failure_prefers_permanent_error():
+    recorder = Recorder()
+    pipeline = make_pipeline(recorder)
+    with pytest.raises(NonRetryable):
+        asyncio.run(pipeline.process_message(*message("unknown", "https://velog.io/@a/1")))
+    with pytest.raises(ConnectionError):
+        asyncio.run(pipeline.process_message(*message("velog", "https://velog.io/@a/2", "https://velog.io/@a/broken")))
+    # 실패한 배치라도 성공한 글은 저장되고, 다시 받으면 _check_exist_post로 건너뜀
+    asyncio.run(pipeline.process_message(*message("velog", "https://velog.io/@a/dup")))
+    pipeline.close()
+    assert recorder.saved == ["https://velog.io/@a/2"]
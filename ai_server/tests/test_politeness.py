@@ -0,0 +1,50 @@
+import pytest
+from politeness import HostRateLimiter
+
+def limiter(rate=0.5, burst=1, host_rates=None):
+    return HostRateLimiter(rate=rate, burst=burst, host_rates=host_rates or {}, shared_domains=["tistory.com", "blog.naver.com"])
+
+def test_host_key_groups_shared_domains():
+    l = limiter()
+    assert l.host_key("https://a.tistory.com/1") == l.host_key("https://b.tistory.com/2") == "tistory.com"
+    assert l.host_key("https://m.blog.naver.com/x") == l.host_key("https://blog.naver.com/y") == "blog.naver.com"
+    assert l.host_key("https://velog.io/@a/1") == "velog.io"
+
+def test_reserve_spaces_same_host_only():
+    l = limiter(rate=0.5)
+    assert l.reserve("https://blog.naver.com/a", now=100) == 0
+    assert l.reserve("https://velog.io/@a/1", now=100) == 0
+    assert l.reserve("https://m.blog.naver.com/b", now=100) == pytest.approx(2.0)
+    assert l.reserve("https://blog.naver.com/c", now=100) == pytest.approx(4.0)
+    # 쉬고 있던 호스트는 바로
+    assert l.reserve("https://a.tistory.com/1", now=200) == 0
+
+def test_reserve_allows_burst_then_rate():
+    l = limiter(rate=1, burst=3)
+    delays = [l.reserve("https://velog.io/@a/1", now=0) for _ in range(5)]
+    assert delays == pytest.approx([0, 0, 0, 1, 2])
+    # 충분히 쉬면 다시 burst만큼
+    assert l.reserve("https://velog.io/@a/1", now=100) == 0
+
+def test_host_rate_override_and_unlimited():
+    l = limiter(rate=0.5, host_rates={"velog.io": 2})
+    l.reserve("https://velog.io/@a/1", now=0)
+    assert l.reserve("https://velog.io/@a/2", now=0) == pytest.approx(0.5)
+    unlimited = limiter(rate=0)
+    assert [unlimited.reserve("https://velog.io/@a/1", now=0) for _ in range(3)] == [0, 0, 0]
+
+def test_try_acquire_does_not_consume_when_waiting():
+    l = limiter(rate=0.5)
+    assert l.try_acquire("https://blog.naver.com/a", now=0) == 0
+    # 토큰이 없으면 남은 시간만 알려주고 예약하지 않음
+    assert l.try_acquire("https://blog.naver.com/b", now=0.5) == pytest.approx(1.5)
+    assert l.try_acquire("https://blog.naver.com/b", now=1.0) == pytest.approx(1.0)
+    assert l.try_acquire("https://blog.naver.com/b", now=2.0) == 0
+    assert l.try_acquire("https://blog.naver.com/c", now=2.0) == pytest.approx(2.0)
+
+def test_try_acquire_respects_reservations():
+    l = limiter(rate=0.5)
+    l.reserve("https://blog.naver.com/a", now=0)
+    l.reserve("https://blog.naver.com/b", now=0)
+    # reserve로 2초 뒤까지 예약돼 있으므로 4초까지 기다려야 함
+    assert l.try_acquire("https://blog.naver.com/c", now=1) == pytest.approx(3.0)
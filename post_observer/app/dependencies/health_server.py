@@ -0,0 +1,101 @@
+"""
+Health Server Module
+daemon 모드용 상태 확인 / 지표 HTTP 엔드포인트
+
+- GET /healthz: daemon 상태 JSON (정상 200, 오래 성공하지 못했으면 503) - k8s liveness/readiness probe용
+- GET /metrics: 실행 지표 (Prometheus 스크레이프용)
+- 그 외 경로 접두사별 라우트 (WebSub 콜백 등)
+수집 루프(asyncio)가 DB/브로커 작업으로 막혀 있어도 응답하도록 별도 스레드에서 돈다.
+"""
+
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from app.dependencies import metrics
+from app.dependencies.http_client import RSS_FETCH_MAX_BYTES
+
+logger = logging.getLogger(__name__)
+
+# 라우트가 받는 요청 본문 크기 상한 (피드 응답 크기 제한과 같게, 0이면 5 MiB)
+MAX_REQUEST_BYTES = RSS_FETCH_MAX_BYTES or 5 * 1024 * 1024
+
+# (method, path, query, headers, body) -> (status, content_type, body)
+Route = Callable[[str, str, Dict[str, str], object, bytes], Tuple[int, str, bytes]]
+
+def start_health_server(
+    port: int,
+    health: Callable[[], Tuple[bool, dict]],
+    host: str = "0.0.0.0",
+    routes: Optional[Dict[str, Route]] = None,
+) -> ThreadingHTTPServer:
+    """
+    상태 확인 서버를 데몬 스레드로 시작
+
+    Args:
+        port: 리슨 포트 (0이면 임의 포트, server.server_port로 확인)
+        health: (정상 여부, 상태 정보)를 반환하는 함수
+        host: 리슨 주소
+        routes: 경로 접두사별 GET/POST 처리 함수
+
+    Returns:
+        종료할 때 shutdown()을 호출할 서버
+    """
+    routes = routes or {}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path, query = self._split_path()
+            if path == "/healthz":
+                healthy, status = health()
+                self._respond(200 if healthy else 503, "application/json", json.dumps(status).encode())
+            elif path == "/metrics":
+                self._respond(200, CONTENT_TYPE_LATEST, generate_latest(metrics.REGISTRY))
+            else:
+                self._route("GET", path, query, b"")
+
+        def do_POST(self):
+            path, query = self._split_path()
+            length = self.headers.get("Content-Length")
+            if length is None or not length.isdigit():
+                self._respond(411, "text/plain", b"length required")
+                return
+            if int(length) > MAX_REQUEST_BYTES:
+                self._respond(413, "text/plain", b"too large")
+                return
+            self._route("POST", path, query, self.rfile.read(int(length)))
+
+        def _split_path(self):
+            path, _, query = self.path.partition("?")
+            return path, {name: values[0] for name, values in parse_qs(query).items()}
+
+        def _route(self, method: str, path: str, query: Dict[str, str], body: bytes):
+            for prefix, route in routes.items():
+                if path.startswith(prefix):
+                    try:
+                        self._respond(*route(method, path, query, self.headers, body))
+                    except Exception as e:
+                        logger.exception(f"Failed to handle {method} {path}: {e}")
+                        self._respond(500, "text/plain", b"error")
+                    return
+            self._respond(404, "text/plain", b"not found")
+
+        def _respond(self, status: int, content_type: str, body: bytes):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # probe가 자주 호출하므로 접근 로그는 남기지 않음
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="health-server", daemon=True).start()
+    logger.info(f"Health server listening on {host}:{server.server_port}")
+    return server
@@ -0,0 +1,322 @@
+"""
+HTTP Client Module
+RSS 수집용 공유 비동기 HTTP 클라이언트
+"""
+
+import os
+import time
+import logging
+import importlib.util
+from typing import Dict, List, Optional
+import httpx
+from app.dependencies import metrics
+
+logger = logging.getLogger(__name__)
+
+# 동시에 수행할 RSS 요청 최대 개수
+RSS_FETCH_CONCURRENCY = int(os.getenv("RSS_FETCH_CONCURRENCY", "10"))
+
+# RSS 요청 타임아웃 (초)
+RSS_FETCH_TIMEOUT = float(os.getenv("RSS_FETCH_TIMEOUT", "10.0"))
+
+# HTTP/2 사용 여부 (h2 패키지가 없으면 HTTP/1.1로 동작)
+RSS_FETCH_HTTP2 = os.getenv("RSS_FETCH_HTTP2", "false").lower() == "true"
+
+# 응답 본문 최대 크기 (압축 해제 후 바이트, 0이면 제한 없음)
+RSS_FETCH_MAX_BYTES = int(os.getenv("RSS_FETCH_MAX_BYTES", str(5 * 1024 * 1024)))
+
+# 호스트별 서킷 브레이커 (false면 비활성화)
+RSS_CIRCUIT_BREAKER_ENABLED = os.getenv("RSS_CIRCUIT_BREAKER", "true").lower() == "true"
+
+# 연속 실패가 이 횟수에 도달하면 서킷을 열고 해당 호스트 요청을 즉시 실패 처리
+RSS_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("RSS_CIRCUIT_FAILURE_THRESHOLD", "5"))
+
+# 이보다 오래 걸린 응답은 성공해도 실패로 집계 (초)
+RSS_CIRCUIT_SLOW_SECONDS = float(os.getenv("RSS_CIRCUIT_SLOW_SECONDS", "5.0"))
+
+# 서킷이 열린 뒤 half-open 프로브 요청 하나를 허용하기까지 기다리는 시간 (초)
+RSS_CIRCUIT_COOLDOWN_SECONDS = float(os.getenv("RSS_CIRCUIT_COOLDOWN_SECONDS", "30.0"))
+
+# 블로그마다 서브도메인이 다르지만 같은 인프라를 쓰는 도메인 (하나의 호스트로 집계)
+RSS_CIRCUIT_SHARED_DOMAINS = [
+    domain.strip() for domain in os.getenv("RSS_CIRCUIT_SHARED_DOMAINS", "tistory.com").split(",") if domain.strip()
+]
+
+class CircuitOpenError(httpx.TransportError):
+    """서킷이 열린 호스트로의 요청 (네트워크 요청 없이 즉시 실패)"""
+    pass
+
+class _HostState:
+    __slots__ = ("failures", "opened_at", "probing")
+
+    def __init__(self):
+        self.failures = 0
+        self.opened_at = None   # None이면 closed
+        self.probing = False    # half-open 프로브 요청 진행 중
+
+class HostCircuitBreaker:
+    """
+    호스트별 연속 실패(타임아웃, 연결 오류, 5xx/429, 느린 응답)를 추적하는 서킷 브레이커
+
+    - closed: 모든 요청 허용, 연속 실패가 failure_threshold에 도달하면 open
+    - open: cooldown 동안 요청을 즉시 실패 처리
+    - half-open: cooldown이 지나면 프로브 요청 하나만 허용, 성공하면 closed, 실패하면 다시 open
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = RSS_CIRCUIT_FAILURE_THRESHOLD,
+        slow_seconds: float = RSS_CIRCUIT_SLOW_SECONDS,
+        cooldown_seconds: float = RSS_CIRCUIT_COOLDOWN_SECONDS,
+        shared_domains: List[str] = None,
+    ):
+        self.failure_threshold = max(1, failure_threshold)
+        self.slow_seconds = slow_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self.shared_domains = RSS_CIRCUIT_SHARED_DOMAINS if shared_domains is None else shared_domains
+        self._hosts: Dict[str, _HostState] = {}
+
+    def host_key(self, host: str) -> str:
+        """집계 단위 호스트 (공유 도메인의 서브도메인은 도메인 하나로)"""
+        for domain in self.shared_domains:
+            if host == domain or host.endswith("." + domain):
+                return domain
+        return host
+
+    def allow(self, host: str) -> bool:
+        """요청을 보내도 되는지 확인 (half-open이면 이 요청이 프로브가 됨)"""
+        state = self._hosts.get(self.host_key(host))
+        if state is None or state.opened_at is None:
+            return True
+        if state.probing or time.monotonic() - state.opened_at < self.cooldown_seconds:
+            return False
+        state.probing = True
+        logger.info(f"Circuit half-open, probing {self.host_key(host)}")
+        return True
+
+    def record(self, host: str, ok: bool, probe: bool = False):
+        """
+        요청 결과 반영
+
+        Args:
+            host: 요청 호스트
+            ok: 성공 여부
+            probe: half-open 프로브 요청이었는지 (실패하면 cooldown부터 다시 시작)
+        """
+        key = self.host_key(host)
+        state = self._hosts.setdefault(key, _HostState())
+        if probe:
+            state.probing = False
+
+        if ok:
+            if state.opened_at is not None:
+                logger.info(f"Circuit closed for {key}")
+            state.failures = 0
+            state.opened_at = None
+            return
+
+        state.failures += 1
+        if probe or (state.opened_at is None and state.failures >= self.failure_threshold):
+            if state.opened_at is None:
+                logger.warning(f"Circuit opened for {key} after {state.failures} consecutive failures")
+                metrics.CIRCUIT_OPENS.labels(host=key).inc()
+            state.opened_at = time.monotonic()
+
+    def release_probe(self, host: str):
+        """결과 없이 끝난 프로브 해제"""
+        state = self._hosts.get(self.host_key(host))
+        if state is not None:
+            state.probing = False
+
+    def is_open(self, host: str) -> bool:
+        state = self._hosts.get(self.host_key(host))
+        return state is not None and state.opened_at is not None
+
+class CircuitBreakerTransport(httpx.AsyncBaseTransport):
+    """요청 전 서킷을 확인하고 응답 결과를 호스트별로 기록하는 전송 계층"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, breaker: HostCircuitBreaker):
+        self.transport = transport
+        self.breaker = breaker
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        if not self.breaker.allow(host):
+            raise CircuitOpenError(f"Circuit open for {self.breaker.host_key(host)}", request=request)
+        # 열린 서킷에서 허용된 요청은 half-open 프로브
+        probe = self.breaker.is_open(host)
+
+        started = time.perf_counter()
+        try:
+            response = await self.transport.handle_async_request(request)
+        except httpx.TransportError:
+            self.breaker.record(host, ok=False, probe=probe)
+            raise
+        except BaseException:
+            # 취소 등 호스트 상태와 무관한 중단은 집계하지 않고, 프로브였다면 다음 요청이 다시 프로브
+            if probe:
+                self.breaker.release_probe(host)
+            raise
+
+        slow = time.perf_counter() - started > self.breaker.slow_seconds
+        failed = response.status_code >= 500 or response.status_code == 429
+        self.breaker.record(host, ok=not (slow or failed), probe=probe)
+        return response
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+def _accept_encoding() -> str:
+    """설치된 디코더 기준으로 협상할 압축 방식 (brotli 패키지가 있으면 br 우선)"""
+    encodings = ["gzip", "deflate"]
+    if importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi"):
+        encodings.insert(0, "br")
+    return ", ".join(encodings)
+
+def _http2_available() -> bool:
+    if not RSS_FETCH_HTTP2:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("RSS_FETCH_HTTP2 is set but h2 is not installed, using HTTP/1.1")
+        return False
+    return True
+
+def create_async_client(breaker: HostCircuitBreaker = None) -> httpx.AsyncClient:
+    """
+    모든 파서가 공유하는 비동기 HTTP 클라이언트 생성
+
+    호스트별 keep-alive 연결을 재사용하고, RSS_FETCH_HTTP2면 HTTP/2로 한 연결에서 요청을 다중화한다.
+
+    Args:
+        breaker: 호스트별 서킷 브레이커 (없으면 RSS_CIRCUIT_BREAKER 설정에 따라 실행 단위로 새로 생성)
+
+    Returns:
+        httpx.AsyncClient: 동시 연결 수가 RSS_FETCH_CONCURRENCY로 제한된 클라이언트
+    """
+    limits = httpx.Limits(
+        max_connections=RSS_FETCH_CONCURRENCY,
+        max_keepalive_connections=RSS_FETCH_CONCURRENCY,
+    )
+    headers = {"Accept-Encoding": _accept_encoding()}
+    transport = httpx.AsyncHTTPTransport(limits=limits, http2=_http2_available())
+
+    if breaker is None and RSS_CIRCUIT_BREAKER_ENABLED:
+        breaker = HostCircuitBreaker()
+    if breaker is not None:
+        transport = CircuitBreakerTransport(transport, breaker)
+    return httpx.AsyncClient(timeout=RSS_FETCH_TIMEOUT, headers=headers, transport=transport)
+
+class ResponseTooLargeError(httpx.HTTPError):
+    """응답 본문이 RSS_FETCH_MAX_BYTES를 넘음"""
+    pass
+
+class FetchStats:
+    """실행 단위 피드 다운로드 통계"""
+    __slots__ = ("responses", "wire_bytes", "body_bytes", "connections", "tls_handshakes", "http2_responses", "too_large")
+
+    def __init__(self):
+        self.responses = 0
+        self.wire_bytes = 0         # 네트워크로 받은 본문 바이트 (압축 상태)
+        self.body_bytes = 0         # 압축 해제 후 본문 바이트
+        self.connections = 0        # 새로 연 TCP 연결 수 (keep-alive 재사용은 제외)
+        self.tls_handshakes = 0
+        self.http2_responses = 0
+        self.too_large = 0
+
+    def __repr__(self):
+        return (
+            f"FetchStats(responses={self.responses}, wire={self.wire_bytes / 1024:.0f}KiB, "
+            f"body={self.body_bytes / 1024:.0f}KiB, connections={self.connections}, "
+            f"tls_handshakes={self.tls_handshakes}, http2={self.http2_responses}, too_large={self.too_large})"
+        )
+
+class FeedClient:
+    """
+    파서가 공유하는 피드 다운로드 클라이언트
+
+    httpx.AsyncClient.get과 같은 방식으로 호출하며, 본문을 스트리밍으로 읽어 max_bytes를 넘으면
+    ResponseTooLargeError로 중단하고 전송 바이트/새 연결/TLS 핸드셰이크 수를 stats에 모은다.
+
+    Usage:
+        async with create_feed_client() as client:
+            response = await client.get(url, headers=...)
+    """
+
+    def __init__(self, client: httpx.AsyncClient, max_bytes: int = RSS_FETCH_MAX_BYTES):
+        self.client = client
+        self.max_bytes = max_bytes
+        self.stats = FetchStats()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.client.aclose()
+
+    async def get(self, url: str, headers: Optional[dict] = None) -> httpx.Response:
+        """
+        GET 요청 후 본문까지 읽은 응답 반환
+
+        Raises:
+            ResponseTooLargeError: 본문이 max_bytes를 넘음
+            httpx.HTTPError: 그 외 요청 실패
+        """
+        extensions = {"trace": self._trace}
+        async with self.client.stream("GET", url, headers=headers, extensions=extensions) as response:
+            length = response.headers.get("content-length")
+            encoded = "content-encoding" in response.headers
+            if self.max_bytes and length and length.isdigit() and not encoded and int(length) > self.max_bytes:
+                self._too_large(url, response)
+
+            chunks = []
+            size = 0
+            async for chunk in response.aiter_bytes():
+                size += len(chunk)
+                if self.max_bytes and size > self.max_bytes:
+                    self._too_large(url, response)
+                chunks.append(chunk)
+
+        self.stats.responses += 1
+        self.stats.wire_bytes += response.num_bytes_downloaded
+        self.stats.body_bytes += size
+        if response.http_version == "HTTP/2":
+            self.stats.http2_responses += 1
+        return _read_response(response, b"".join(chunks))
+
+    async def post(self, url: str, data: dict) -> httpx.Response:
+        """폼 POST 요청 (WebSub 허브 구독 요청용, 응답 본문이 작아 크기 제한 없이 읽음)"""
+        return await self.client.post(url, data=data)
+
+    def _too_large(self, url: str, response: httpx.Response):
+        self.stats.too_large += 1
+        self.stats.wire_bytes += response.num_bytes_downloaded
+        raise ResponseTooLargeError(f"Response from {url} exceeds {self.max_bytes} bytes")
+
+    async def _trace(self, event_name: str, info: dict):
+        # httpcore 연결 이벤트 (keep-alive로 재사용한 요청에는 발생하지 않음)
+        if event_name == "connection.connect_tcp.complete":
+            self.stats.connections += 1
+        elif event_name == "connection.start_tls.complete":
+            self.stats.tls_handshakes += 1
+
+def _read_response(response: httpx.Response, body: bytes) -> httpx.Response:
+    """
+    스트리밍으로 읽은 본문을 담은 새 응답 (AsyncClient.get의 응답처럼 content / text를 바로 쓸 수 있음)
+
+    본문은 이미 압축을 풀었으므로 Content-Encoding / Content-Length는 빼고 새 본문 기준으로 둔다.
+    """
+    headers = [
+        (name, value) for name, value in response.headers.multi_items()
+        if name.lower() not in ("content-encoding", "content-length")
+    ]
+    return httpx.Response(
+        response.status_code,
+        headers=headers,
+        content=body,
+        request=response.request,
+        extensions=response.extensions,
+    )
+
+def create_feed_client(breaker: HostCircuitBreaker = None) -> FeedClient:
+    """create_async_client로 만든 클라이언트를 크기 제한/통계와 함께 감싼 FeedClient 생성"""
+    return FeedClient(create_async_client(breaker))
@@ -0,0 +1,197 @@
+import threading
+from typing import Any, Callable, Hashable, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import and_, tuple_
+from sqlalchemy.orm import Session
+from app.models.db_models import UserPlatform, Platform
+from app.dependencies.database import SessionLocal
+import logging
+
+logger = logging.getLogger(__name__)
+
+class KeyedRowBatch:
+    """KeyedRowStore.take로 꺼낸 저장할 행 (write로 DB에 반영)"""
+    __slots__ = ("inserts", "updates", "deleted")
+
+    def __init__(self):
+        self.inserts: List[dict] = []
+        self.updates: List[dict] = []
+        self.deleted: List[Tuple] = []
+
+    def __bool__(self):
+        return bool(self.inserts or self.updates or self.deleted)
+
+    def rows(self) -> List[dict]:
+        return self.inserts + self.updates
+
+class KeyedRowStore:
+    """
+    키마다 행 하나인 observer 상태 테이블의 저장 상태 (FEED_CACHE / FEED_SCHEDULE / FEED_FINGERPRINT / FEED_WEBSUB / 체크포인트 피드)
+
+    값은 각 저장소가 메모리에 들고 바뀐 키만 알려 주면, 시작 시 한 번에 읽기와 바뀐 행만 골라
+    INSERT / UPDATE / DELETE로 저장하는 부분을 여기서 맡는다.
+    저장은 행을 만드는 take와 DB에 쓰는 write로 나뉘어, 행은 수집 루프에서 만들고 쓰기만 다른 스레드에 넘길 수 있다.
+    (take는 앞선 write가 끝난 뒤에 호출해야 함) 저장에 실패한 키는 다음 저장 때 그때 값으로 다시 쓴다.
+    """
+
+    def __init__(self, model, key_columns: Tuple[str, ...], label: str):
+        """
+        Args:
+            model: 저장할 테이블 모델
+            key_columns: 저장소 키를 이루는 컬럼 (행 dict에서 키를 다시 만들 때 사용)
+            label: 로그에 쓸 이름 (예: "feed validators")
+        """
+        self.model = model
+        self.key_columns = key_columns
+        self.label = label
+        self._stored: Set[Hashable] = set()   # 테이블에 행이 있는 키 (INSERT / UPDATE 구분)
+        self._changed: Set[Hashable] = set()
+        self._deleted: Set[Hashable] = set()
+        # 저장소에 따라 구독 확인처럼 수신기 스레드에서 바뀌기도 함
+        self._lock = threading.Lock()
+
+    def key_of(self, row: dict) -> Tuple:
+        return tuple(row[column] for column in self.key_columns)
+
+    def load(self, on_row: Callable[[Any], Hashable], *criteria) -> bool:
+        """
+        테이블 행을 모두 읽어 on_row에 넘기고, on_row가 반환한 키를 테이블에 있는 키로 기록
+
+        Returns:
+            읽었는지 여부 (실패하면 로그만 남기고 False - 저장소는 빈 상태로 시작)
+        """
+        db = SessionLocal()
+        try:
+            for row in db.query(self.model).filter(*criteria):
+                self._stored.add(on_row(row))
+            logger.info(f"Loaded {len(self._stored)} {self.label}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to load {self.label}: {e}")
+            return False
+        finally:
+            db.close()
+
+    def mark_stored(self, keys: Iterable[Hashable]):
+        """load 밖에서 읽은 키를 테이블에 있는 키로 기록"""
+        with self._lock:
+            self._stored.update(keys)
+
+    def retain_stored(self, keys: Iterable[Hashable]):
+        """테이블에 남은 키가 keys뿐인 것으로 기록 (저장소가 직접 행을 지운 뒤)"""
+        with self._lock:
+            self._stored.intersection_update(keys)
+
+    def changed(self, key: Hashable):
+        """다음 저장 때 INSERT / UPDATE할 키"""
+        with self._lock:
+            self._changed.add(key)
+            self._deleted.discard(key)
+
+    def deleted(self, key: Hashable):
+        """다음 저장 때 DELETE할 키 (테이블에 없으면 변경 표시만 지움)"""
+        with self._lock:
+            self._changed.discard(key)
+            if key in self._stored:
+                self._deleted.add(key)
+
+    def take(self, build_row: Callable[[Hashable], Optional[dict]]) -> KeyedRowBatch:
+        """
+        바뀐 키의 행을 만들고 변경 표시를 비움
+
+        Args:
+            build_row: 키의 현재 값으로 만든 행 (None이면 건너뜀 - 그 사이 지워진 키 등)
+        """
+        batch = KeyedRowBatch()
+        with self._lock:
+            for key in self._changed:
+                row = build_row(key)
+                if row is not None:
+                    (batch.updates if key in self._stored else batch.inserts).append(row)
+            batch.deleted = list(self._deleted)
+            self._changed.clear()
+            self._deleted.clear()
+        return batch
+
+    def write(self, batch: KeyedRowBatch, before_commit: Optional[Callable[[Session], None]] = None) -> bool:
+        """
+        take로 꺼낸 행을 한 트랜잭션으로 반영
+
+        Args:
+            before_commit: 같은 트랜잭션에서 함께 실행할 작업 (체크포인트 합계 갱신 등)
+
+        Returns:
+            반영했는지 여부 (실패하면 행의 키를 다시 변경으로 표시)
+        """
+        if not batch and before_commit is None:
+            return True
+
+        db = SessionLocal()
+        try:
+            if batch.deleted:
+                columns = [getattr(self.model, column) for column in self.key_columns]
+                db.query(self.model).filter(tuple_(*columns).in_(batch.deleted)).delete(synchronize_session=False)
+            if batch.inserts:
+                db.bulk_insert_mappings(self.model, batch.inserts)
+            if batch.updates:
+                db.bulk_update_mappings(self.model, batch.updates)
+            if before_commit is not None:
+                before_commit(db)
+            db.commit()
+            with self._lock:
+                self._stored.difference_update(batch.deleted)
+                self._stored.update(self.key_of(row) for row in batch.inserts)
+            if batch:
+                removed = f", {len(batch.deleted)} removed" if batch.deleted else ""
+                logger.info(f"Saved {self.label}: {len(batch.inserts)} new, {len(batch.updates)} updated{removed}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save {self.label}: {e}")
+            db.rollback()
+            # 다음 저장 때 다시 시도
+            with self._lock:
+                self._changed.update(self.key_of(row) for row in batch.rows())
+                self._deleted.update(key for key in batch.deleted if key not in self._changed)
+            return False
+        finally:
+            db.close()
+
+    def save(self, build_row: Callable[[Hashable], Optional[dict]]) -> bool:
+        """바뀐 행을 바로 저장 (take + write)"""
+        return self.write(self.take(build_row))
+
+def evict_unregistered(model, label: str, per_user: bool = False) -> int:
+    """
+    USER_PLATFORM에 더 이상 없는 상태 행 삭제
+
+    Args:
+        model: platform_name / account_id (per_user면 user_id도) 컬럼이 있는 상태 테이블 모델
+        label: 로그에 쓸 이름
+        per_user: 사용자-플랫폼 단위 행이면 True (연동 해제/계정 변경/탈퇴),
+                  False면 피드 단위 행 (피드를 등록한 사용자가 하나도 없을 때만 삭제)
+
+    Returns:
+        삭제한 행 수
+    """
+    db = SessionLocal()
+    try:
+        conditions = [
+            Platform.name == model.platform_name,
+            UserPlatform.account_id == model.account_id,
+        ]
+        if per_user:
+            conditions.append(UserPlatform.user_id == model.user_id)
+        registered = db.query(UserPlatform).join(
+            Platform, UserPlatform.platform_id == Platform.platform_id
+        ).filter(and_(*conditions)).exists()
+
+        deleted = db.query(model).filter(~registered).delete(synchronize_session=False)
+        db.commit()
+        if deleted:
+            logger.info(f"Evicted {deleted} {label} for {'deregistered accounts' if per_user else 'unregistered feeds'}")
+        return deleted
+    except Exception as e:
+        logger.error(f"Failed to evict {label}: {e}")
+        db.rollback()
+        return 0
+    finally:
+        db.close()
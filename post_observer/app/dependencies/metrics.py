@@ -0,0 +1,152 @@
+"""
+Prometheus Metrics Module
+observer 실행 지표 수집 및 내보내기
+
+크론잡은 스크레이프될 만큼 오래 떠 있지 않으므로 실행이 끝날 때 한 번 내보낸다.
+(daemon 모드는 health_server의 /metrics로 스크레이프할 수도 있다)
+- METRICS_PUSHGATEWAY_URL: Pushgateway(호환) 주소로 push (job=METRICS_JOB, 샤드 모드면 shard 그룹 키 추가)
+- METRICS_TEXTFILE: node_exporter textfile collector용 .prom 파일로 기록
+둘 다 없으면 수집만 하고 내보내지 않는다.
+"""
+
+import os
+import heapq
+import logging
+from typing import Dict, List, Optional, Tuple
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, push_to_gateway, write_to_textfile
+
+logger = logging.getLogger(__name__)
+
+METRICS_PUSHGATEWAY_URL = os.getenv("METRICS_PUSHGATEWAY_URL")
+METRICS_TEXTFILE = os.getenv("METRICS_TEXTFILE")
+METRICS_JOB = os.getenv("METRICS_JOB", "post_observer")
+
+# 가장 오래 걸린 피드 몇 개를 계정 단위로 내보낼지 (계정별 라벨 수 상한)
+SLOW_FEED_TOP_N = int(os.getenv("METRICS_SLOW_FEED_TOP_N", "10"))
+
+# 프로세스 기본 레지스트리 대신 실행 단위 지표만 담는 레지스트리
+REGISTRY = CollectorRegistry()
+
+FEED_FETCH_SECONDS = Histogram(
+    "observer_feed_fetch_seconds", "RSS HTTP 요청 시간", ["platform"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30), registry=REGISTRY,
+)
+FEED_RESPONSES = Counter(
+    "observer_feed_responses", "RSS 응답 수 (HTTP 상태 코드, 연결 실패는 error)", ["platform", "status"],
+    registry=REGISTRY,
+)
+FEED_PARSE_SECONDS = Histogram(
+    "observer_feed_parse_seconds", "RSS 문서 파싱 + 정규화 시간", ["platform", "backend"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1), registry=REGISTRY,
+)
+FEED_ARTICLES = Counter(
+    "observer_feed_articles", "정규화한 글 수", ["platform"], registry=REGISTRY,
+)
+FEED_UNCHANGED = Counter(
+    "observer_feed_unchanged", "200 응답이지만 본문 해시가 같아 파싱을 건너뛴 피드 수", ["platform"], registry=REGISTRY,
+)
+NEW_POSTS = Counter(
+    "observer_new_posts", "발행한 새 글 수", ["platform"], registry=REGISTRY,
+)
+SEEN_ARTICLES = Counter(
+    "observer_seen_articles",
+    "발행 링크 집합으로 판정이 달라진 글 수 (duplicate: last_upload 이후지만 이미 발행, backdated: last_upload 이전이지만 처음 봄)",
+    ["platform", "kind"], registry=REGISTRY,
+)
+SLOW_FEED_SECONDS = Gauge(
+    "observer_slow_feed_seconds", f"이번 실행에서 가장 오래 걸린 피드 {SLOW_FEED_TOP_N}개의 수집 시간",
+    ["platform", "account_id"], registry=REGISTRY,
+)
+
+FETCH_BYTES = Counter(
+    "observer_fetch_bytes", "RSS 응답 본문 바이트 (wire: 압축 상태로 받은 양, body: 압축 해제 후)", ["kind"],
+    registry=REGISTRY,
+)
+FETCH_CONNECTIONS = Counter(
+    "observer_fetch_connections", "RSS 수집 중 새로 연 연결 수 (tcp) 및 TLS 핸드셰이크 수 (tls)", ["kind"],
+    registry=REGISTRY,
+)
+WEBSUB_EVENTS = Counter(
+    "observer_websub_events",
+    "WebSub 구독/배포 이벤트 수 (subscribe_requested/subscribe_failed/verified/denied/notified/bad_signature/unknown_callback)",
+    ["event"], registry=REGISTRY,
+)
+CIRCUIT_OPENS = Counter(
+    "observer_circuit_opens", "호스트 서킷이 열린 횟수", ["host"], registry=REGISTRY,
+)
+
+PUBLISH_BATCH_SECONDS = Histogram(
+    "observer_publish_batch_seconds", "RabbitMQ 배치 발행 + 브로커 커밋 시간 (재시도 포함)",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5), registry=REGISTRY,
+)
+PUBLISHED_MESSAGES = Counter(
+    "observer_published_messages", "브로커가 수신 확인한 메시지 수", ["queue"], registry=REGISTRY,
+)
+PUBLISH_RETRIES = Counter(
+    "observer_publish_retries", "연결 오류로 배치를 다시 발행한 횟수", registry=REGISTRY,
+)
+
+DB_OPERATION_SECONDS = Histogram(
+    "observer_db_operation_seconds", "platform_service DB 작업 시간", ["operation"], registry=REGISTRY,
+)
+DB_ROWS = Counter(
+    "observer_db_rows", "platform_service가 읽거나 반영한 행 수", ["operation", "result"], registry=REGISTRY,
+)
+
+RUN_SECONDS = Gauge(
+    "observer_run_seconds", "실행 단계별 소요 시간", ["phase"], registry=REGISTRY,
+)
+RUN_USER_PLATFORMS = Gauge(
+    "observer_run_user_platforms", "check_new_posts 처리 대상 수 (rows/feeds/not_due/circuit_skipped/deferred)", ["kind"], registry=REGISTRY,
+)
+LAST_SUCCESS = Gauge(
+    "observer_last_success_timestamp_seconds", "마지막으로 성공한 실행 종료 시각", registry=REGISTRY,
+)
+
+# (seconds, platform, account_id) 최소 힙 - 가장 느린 SLOW_FEED_TOP_N 개만 유지
+_slow_feeds: List[Tuple[float, str, str]] = []
+
+def record_feed_duration(platform: str, account_id: str, seconds: float):
+    """피드 하나의 수집 시간을 느린 피드 후보로 기록"""
+    item = (seconds, platform, account_id)
+    if len(_slow_feeds) < SLOW_FEED_TOP_N:
+        heapq.heappush(_slow_feeds, item)
+    elif _slow_feeds and seconds > _slow_feeds[0][0]:
+        heapq.heapreplace(_slow_feeds, item)
+
+def reset_slow_feeds():
+    """느린 피드 후보 초기화 (daemon은 tick마다 그 tick의 느린 피드만 내보냄)"""
+    _slow_feeds.clear()
+
+def observe_fetch_stats(stats):
+    """실행 단위 다운로드 통계(http_client.FetchStats)를 카운터에 반영"""
+    FETCH_BYTES.labels(kind="wire").inc(stats.wire_bytes)
+    FETCH_BYTES.labels(kind="body").inc(stats.body_bytes)
+    FETCH_CONNECTIONS.labels(kind="tcp").inc(stats.connections)
+    FETCH_CONNECTIONS.labels(kind="tls").inc(stats.tls_handshakes)
+
+def push_metrics(grouping_key: Optional[Dict[str, str]] = None):
+    """
+    실행 지표 내보내기 (실패해도 실행 결과에는 영향 없음)
+
+    Args:
+        grouping_key: Pushgateway 그룹 키 (샤드마다 다른 그룹으로 push)
+    """
+    SLOW_FEED_SECONDS.clear()
+    # 같은 피드가 여러 번 기록됐으면 가장 느린 값이 남도록 오름차순으로 설정
+    for seconds, platform, account_id in sorted(_slow_feeds):
+        SLOW_FEED_SECONDS.labels(platform=platform, account_id=account_id).set(seconds)
+
+    if METRICS_PUSHGATEWAY_URL:
+        try:
+            push_to_gateway(METRICS_PUSHGATEWAY_URL, job=METRICS_JOB, registry=REGISTRY, grouping_key=grouping_key)
+            logger.info(f"Pushed metrics to {METRICS_PUSHGATEWAY_URL}")
+        except Exception as e:
+            logger.error(f"Failed to push metrics to {METRICS_PUSHGATEWAY_URL}: {e}")
+
+    if METRICS_TEXTFILE:
+        try:
+            write_to_textfile(METRICS_TEXTFILE, REGISTRY)
+            logger.info(f"Wrote metrics to {METRICS_TEXTFILE}")
+        except Exception as e:
+            logger.error(f"Failed to write metrics to {METRICS_TEXTFILE}: {e}")
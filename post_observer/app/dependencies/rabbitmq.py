@@ -8,7 +8,9 @@ import ssl
 import pika
 import json
 import logging
-from typing import Dict, Any
+from collections import Counter
+from typing import Dict, Any, List, Tuple
+from app.dependencies import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -58,14 +60,16 @@ def publish_message(queue_name: str, message: Dict[str, Any]):
         channel.queue_declare(queue=queue_name, durable=False)
 
         # 메시지 발행
-        channel.basic_publish(
-            exchange='',
-            routing_key=queue_name,
-            body=json.dumps(message, ensure_ascii=False),
-            properties=pika.BasicProperties(
-                delivery_mode=2,  # 메시지 영구 저장
+        with metrics.PUBLISH_BATCH_SECONDS.time():
+            channel.basic_publish(
+                exchange='',
+                routing_key=queue_name,
+                body=json.dumps(message, ensure_ascii=False),
+                properties=pika.BasicProperties(
+                    delivery_mode=2,  # 메시지 영구 저장
+                )
             )
-        )
+        metrics.PUBLISHED_MESSAGES.labels(queue=queue_name).inc()
 
         # logger.info(f"Published message to queue '{queue_name}': {message.get('article', {}).get('title', 'N/A')}")
 
@@ -74,4 +78,154 @@ def publish_message(queue_name: str, message: Dict[str, Any]):
         raise
     finally:
         if connection and not connection.is_closed:
-            connection.close()
\ No newline at end of file
+            connection.close()
+
+# 한 번에 커밋(브로커 수신 확인)할 최대 메시지 수
+RABBITMQ_CONFIRM_BATCH_SIZE = int(os.getenv("RABBITMQ_CONFIRM_BATCH_SIZE", "100"))
+
+# 연결 실패 시 재연결 후 재시도 횟수
+RABBITMQ_PUBLISH_RETRIES = int(os.getenv("RABBITMQ_PUBLISH_RETRIES", "3"))
+
+class RabbitMQPublisher:
+    """
+    실행 전체에서 하나의 연결과 채널을 재사용하는 메시지 발행기
+
+    - 연결은 첫 발행 시점에 열고, 끊기면 다시 연결
+    - 큐는 채널마다 한 번만 선언
+    - 메시지를 batch_size 개씩 모아 한 트랜잭션으로 발행하고 브로커 커밋 응답으로 수신 확인
+      (publisher confirm 대신 tx를 쓰는 이유: pika BlockingChannel은 confirm_delivery를 켜면 basic_publish가
+      메시지마다 브로커 ack를 동기로 기다려 배치당 왕복이 메시지 수만큼 생긴다. tx_commit은 배치당 한 번 기다리고,
+      커밋 응답을 받으면 배치 전체가 브로커에 들어간 것이라 확인 범위도 같다)
+    - 커밋 전에 연결이 끊기면 해당 배치 전체를 새 채널로 다시 발행 (at-least-once)
+    - close() 시 남은 메시지를 flush 후 연결 종료 (with 블록이 예외로 끝났으면 flush 실패는 로그만 남김)
+
+    Usage:
+        with RabbitMQPublisher() as publisher:
+            publisher.publish("new_posts", {...})
+    """
+
+    def __init__(self, batch_size: int = RABBITMQ_CONFIRM_BATCH_SIZE, max_retries: int = RABBITMQ_PUBLISH_RETRIES):
+        self.batch_size = max(1, batch_size)
+        self.max_retries = max(1, max_retries)
+        self.published_count = 0
+        self._connection = None
+        self._channel = None
+        self._declared = set()
+        self._pending: List[Tuple[str, str]] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+            return
+        # 이미 올라가는 예외를 flush 실패가 가리지 않도록
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Failed to flush {len(self._pending)} messages while closing after an error: {e}")
+        finally:
+            self._disconnect()
+
+    def publish(self, queue_name: str, message: Dict[str, Any]):
+        """
+        메시지를 배치에 추가 (batch_size가 차면 즉시 flush)
+
+        Args:
+            queue_name: 큐 이름
+            message: 발행할 메시지 (dict)
+        """
+        self.publish_body(queue_name, json.dumps(message, ensure_ascii=False))
+
+    def publish_body(self, queue_name: str, body: str):
+        """
+        이미 직렬화한 메시지를 배치에 추가 (batch_size가 차면 즉시 flush)
+
+        Args:
+            queue_name: 큐 이름
+            body: 발행할 메시지 JSON 문자열
+        """
+        self._pending.append((queue_name, body))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """대기 중인 메시지를 모두 발행하고 브로커 커밋까지 기다림"""
+        if not self._pending:
+            return
+
+        with metrics.PUBLISH_BATCH_SECONDS.time():
+            self._publish_pending()
+
+        for queue_name, count in Counter(queue_name for queue_name, _ in self._pending).items():
+            metrics.PUBLISHED_MESSAGES.labels(queue=queue_name).inc(count)
+        self.published_count += len(self._pending)
+        self._pending = []
+
+    def _publish_pending(self):
+        """대기 중인 메시지를 한 트랜잭션으로 발행 (연결 오류 시 재연결 후 배치 전체 재시도)"""
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                channel = self._get_channel()
+                for queue_name, body in self._pending:
+                    if queue_name not in self._declared:
+                        # 큐 선언 (존재하지 않으면 생성)
+                        channel.queue_declare(queue=queue_name, durable=False)
+                        self._declared.add(queue_name)
+                    channel.basic_publish(
+                        exchange='',
+                        routing_key=queue_name,
+                        body=body,
+                        properties=pika.BasicProperties(
+                            delivery_mode=2,  # 메시지 영구 저장
+                        )
+                    )
+                channel.tx_commit()
+                break
+            except (pika.exceptions.AMQPError, OSError) as e:
+                logger.warning(f"Failed to publish batch to RabbitMQ (attempt {attempt}/{self.max_retries}): {e}")
+                self._disconnect()
+                if attempt == self.max_retries:
+                    logger.error(f"Giving up publishing {len(self._pending)} messages to RabbitMQ")
+                    raise
+                metrics.PUBLISH_RETRIES.inc()
+
+    def process_events(self):
+        """
+        대기 중에 브로커 heartbeat 처리 (daemon이 tick 사이에 호출)
+
+        BlockingConnection은 I/O를 처리할 때만 heartbeat에 응답하므로, 오래 쉬는 연결은 브로커가 끊는다.
+        실패하면 연결을 정리해 두고 다음 발행 때 다시 연결한다.
+        """
+        if self._connection is None or self._connection.is_closed:
+            return
+        try:
+            self._connection.process_data_events(time_limit=0)
+        except (pika.exceptions.AMQPError, OSError) as e:
+            logger.warning(f"RabbitMQ connection lost while idle: {e}")
+            self._disconnect()
+
+    def close(self):
+        """남은 메시지 flush 후 연결 종료"""
+        try:
+            self.flush()
+        finally:
+            self._disconnect()
+
+    def _get_channel(self):
+        if self._channel is None or self._channel.is_closed:
+            self._disconnect()
+            self._connection = get_rabbitmq_connection()
+            self._channel = self._connection.channel()
+            self._channel.tx_select()
+            self._declared = set()
+        return self._channel
+
+    def _disconnect(self):
+        connection, self._connection, self._channel = self._connection, None, None
+        if connection and not connection.is_closed:
+            try:
+                connection.close()
+            except Exception as e:
+                logger.warning(f"Failed to close RabbitMQ connection: {e}")
@@ -1,5 +1,6 @@
 import uuid
-from sqlalchemy import Column, String, ForeignKey, DateTime
+from datetime import datetime
+from sqlalchemy import Column, String, ForeignKey, DateTime, Integer, Boolean, Float, LargeBinary
 from sqlalchemy.dialects.postgresql import UUID
 from app.dependencies.database import Base
 
@@ -23,3 +24,104 @@ class UserPlatform(Base):
 
     account_id = Column("id", String(255))
     last_upload = Column(DateTime, nullable=True)
+
+class FeedCache(Base):
+    """피드별 조건부 요청 검증자 저장소 (post_observer 전용)"""
+    __tablename__ = "FEED_CACHE"
+
+    # 탈퇴/연동 해제 시 main_server 삭제를 막지 않도록 FK 없이 보관하고 observer가 정리
+    user_id = Column(UUID(as_uuid=True), primary_key=True)
+    platform_name = Column(String(255), primary_key=True)
+
+    account_id = Column(String(255), nullable=False)
+    etag = Column(String(1024), nullable=True)
+    last_modified = Column(String(255), nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+class FeedSeen(Base):
+    """사용자-플랫폼별로 발행한 글 링크 집합 (post_observer 전용, seen_service.SeenSet 참고)"""
+    __tablename__ = "FEED_SEEN"
+
+    # FEED_CACHE와 같이 FK 없이 보관하고 observer가 정리
+    user_id = Column(UUID(as_uuid=True), primary_key=True)
+    platform_name = Column(String(255), primary_key=True)
+
+    account_id = Column(String(255), nullable=False)
+    recent_keys = Column(LargeBinary, nullable=False)  # 최근 링크 키 (8바이트씩, 최신순)
+    bloom = Column(LargeBinary, nullable=False)        # 모든 링크 키의 Bloom 필터
+    bloom_hashes = Column(Integer, nullable=False)     # Bloom 필터의 해시 함수 수
+    horizon = Column(DateTime, nullable=True)          # 이 시각 이전 발행 글은 판정하지 않음 (None이면 전체)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+class FeedFingerprint(Base):
+    """피드별로 마지막으로 처리한 응답 본문의 해시 (post_observer 전용)"""
+    __tablename__ = "FEED_FINGERPRINT"
+
+    platform_name = Column(String(255), primary_key=True)
+    account_id = Column(String(255), primary_key=True)
+
+    content_hash = Column(String(32), nullable=False)  # blake2b 128비트 hex
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+class ObserverShardRun(Base):
+    """샤드 모드 실행에서 샤드별 결과 (모든 샤드가 끝나면 refresh 메시지를 한 번만 발행)"""
+    __tablename__ = "OBSERVER_SHARD_RUN"
+
+    run_id = Column(String(255), primary_key=True)
+    shard_index = Column(Integer, primary_key=True)
+
+    shard_count = Column(Integer, nullable=False)
+    new_posts = Column(Integer, nullable=False, default=0)
+    refresh_published = Column(Boolean, nullable=False, default=False)
+    finished_at = Column(DateTime, default=datetime.utcnow)
+
+class FeedSchedule(Base):
+    """피드별 게시 주기 통계와 다음 수집 예정 시각 (post_observer 전용)"""
+    __tablename__ = "FEED_SCHEDULE"
+
+    platform_name = Column(String(255), primary_key=True)
+    account_id = Column(String(255), primary_key=True)
+
+    mean_interval_seconds = Column(Float, nullable=True)  # 피드 글 발행 간격 평균
+    last_published_at = Column(DateTime, nullable=True)   # 피드에서 본 가장 최근 글 발행 시각
+    last_checked_at = Column(DateTime, nullable=True)
+    next_due_at = Column(DateTime, nullable=True)
+
+class FeedWebSub(Base):
+    """WebSub 허브를 알리는 피드의 구독 상태 (post_observer 전용, websub_service 참고)"""
+    __tablename__ = "FEED_WEBSUB"
+
+    platform_name = Column(String(255), primary_key=True)
+    account_id = Column(String(255), primary_key=True)
+
+    hub_url = Column(String(1024), nullable=False)
+    topic_url = Column(String(1024), nullable=False)
+    callback_id = Column(String(64), nullable=False, unique=True)  # 콜백 URL 경로 (피드 계정을 드러내지 않도록 임의 값)
+    secret = Column(String(64), nullable=False)                     # 배포 요청 서명(X-Hub-Signature) 검증 키
+    lease_expires_at = Column(DateTime, nullable=True)              # 허브가 구독을 확인한 만료 시각 (None이면 미확인)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+class ObserverCheckpoint(Base):
+    """샤드별 check_new_posts 진행 상태 (중단되거나 시간 예산으로 멈춘 실행을 다음 실행이 이어받음)"""
+    __tablename__ = "OBSERVER_CHECKPOINT"
+
+    shard_index = Column(Integer, primary_key=True)
+
+    shard_count = Column(Integer, nullable=False)
+    status = Column(String(16), nullable=False)              # running / stopped (시간 예산 초과)
+    new_posts = Column(Integer, nullable=False, default=0)   # 발행했지만 아직 refresh 개수로 보고하지 않은 새 글 수
+    remaining_feeds = Column(Integer, nullable=True)         # 시간 예산으로 미룬 피드 수
+    started_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+class ObserverCheckpointFeed(Base):
+    """체크포인트 이후 처리를 마친 피드와 결과 (checkpoint_service 참고)"""
+    __tablename__ = "OBSERVER_CHECKPOINT_FEED"
+
+    shard_index = Column(Integer, primary_key=True)
+    platform_name = Column(String(255), primary_key=True)
+    account_id = Column(String(255), primary_key=True)
+
+    outcome = Column(String(16), nullable=False)             # new_posts / no_new_posts / unchanged / not_modified / failed / circuit_open
+    new_posts = Column(Integer, nullable=False, default=0)
+    checked_at = Column(DateTime, nullable=False)
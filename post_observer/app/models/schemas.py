@@ -1,8 +1,12 @@
+import json
 from pydantic import BaseModel
 from datetime import datetime
 from typing import Optional, List
 from uuid import UUID
 
+# ensure_ascii=False json.dumps와 같은 결과의 값 인코더 (메시지 JSON 조립용)
+_encode = json.JSONEncoder(ensure_ascii=False).encode
+
 class ArticleSchema(BaseModel):
     # RSS 피드에서 파싱한 글 정보
     title: str
@@ -16,3 +20,117 @@ class NewPostMessageSchema(BaseModel):
     user_id: str
     platform: str
     article: ArticleSchema
+
+class NewPostsBatchMessageSchema(BaseModel):
+    # RabbitMQ 메시지 스키마 (사용자-플랫폼 하나의 새 글 여러 개를 한 메시지로 발행)
+    user_id: str
+    platform: str
+    articles: List[ArticleSchema]
+
+class ArticleRecord:
+    """
+    observer 내부 경로용 글 레코드 (ArticleSchema와 같은 필드)
+
+    파서가 만든 값은 타입이 정해져 있으므로 pydantic 검증 없이 만들고, 피드 하나의 글은 구독자 수만큼
+    발행되므로 글 JSON을 한 번만 만들어 재사용한다. 외부에서 받은 값은 from_schema(ArticleSchema(...))로 검증한다.
+    """
+    __slots__ = ("title", "link", "published_at", "thumbnail", "tags", "_json")
+
+    def __init__(
+        self,
+        title: str,
+        link: str,
+        published_at: datetime,
+        thumbnail: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+    ):
+        self.title = title
+        self.link = link
+        self.published_at = published_at
+        self.thumbnail = thumbnail
+        self.tags = tags
+        self._json = None
+
+    @classmethod
+    def from_schema(cls, article: ArticleSchema) -> "ArticleRecord":
+        return cls(article.title, article.link, article.published_at, article.thumbnail, article.tags)
+
+    def to_schema(self) -> ArticleSchema:
+        return ArticleSchema.model_construct(
+            title=self.title, link=self.link, published_at=self.published_at, thumbnail=self.thumbnail, tags=self.tags
+        )
+
+    def to_dict(self) -> dict:
+        """ArticleSchema.model_dump()와 같은 dict"""
+        return {
+            "title": self.title,
+            "link": self.link,
+            "published_at": self.published_at,
+            "thumbnail": self.thumbnail,
+            "tags": self.tags,
+        }
+
+    def to_json(self) -> str:
+        """ArticleSchema.model_dump(mode='json')을 json.dumps(ensure_ascii=False)한 것과 같은 문자열"""
+        if self._json is None:
+            published_at = self.published_at.isoformat()
+            if published_at.endswith("+00:00"):
+                # pydantic은 UTC를 Z로 직렬화
+                published_at = published_at[:-6] + "Z"
+            self._json = (
+                f'{{"title": {_encode(self.title)}, "link": {_encode(self.link)}, '
+                f'"published_at": "{published_at}", "thumbnail": {_encode(self.thumbnail)}, "tags": {_encode(self.tags)}}}'
+            )
+        return self._json
+
+    def __eq__(self, other):
+        if not isinstance(other, ArticleRecord):
+            return NotImplemented
+        return (self.title, self.link, self.published_at, self.thumbnail, self.tags) == (
+            other.title, other.link, other.published_at, other.thumbnail, other.tags
+        )
+
+    def __repr__(self):
+        return f"ArticleRecord(title={self.title!r}, link={self.link!r}, published_at={self.published_at!r})"
+
+def encode_new_post_message(user_id: str, platform: str, article: ArticleRecord) -> str:
+    """NewPostMessageSchema 형식 메시지 JSON (dict를 거치지 않고 글 JSON을 그대로 이어 붙임)"""
+    return f'{{"user_id": {_encode(user_id)}, "platform": {_encode(platform)}, "article": {article.to_json()}}}'
+
+def encode_new_posts_batch_message(user_id: str, platform: str, articles: List[ArticleRecord]) -> str:
+    """NewPostsBatchMessageSchema 형식 메시지 JSON"""
+    body = ", ".join(article.to_json() for article in articles)
+    return f'{{"user_id": {_encode(user_id)}, "platform": {_encode(platform)}, "articles": [{body}]}}'
+
+class FeedValidatorSchema(BaseModel):
+    # 조건부 요청(ETag / Last-Modified) 검증자 (FEED_CACHE 테이블에 저장)
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    # 이번 실행 중 상태 (DB에 저장하지 않음)
+    content_hash: Optional[str] = None  # 요청 전: 마지막으로 처리한 본문 해시 (FEED_FINGERPRINT), 200 응답 후: 받은 본문 해시
+    fetched: bool = False       # 수집 성공 여부 (304 포함)
+    unchanged: bool = False     # 200이지만 본문이 content_hash와 같아 파싱을 건너뜀
+    circuit_open: bool = False  # 호스트 서킷이 열려 요청을 보내지 않음
+    not_modified: bool = False
+    changed: bool = False
+    # 200 응답에서 찾은 WebSub 허브 / 구독 토픽 (Link 헤더 또는 피드 문서의 rel="hub", rel="self")
+    hub_url: Optional[str] = None
+    topic_url: Optional[str] = None
+
+    def request_headers(self) -> dict:
+        """조건부 요청 헤더 생성"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def update_from(self, headers) -> None:
+        """200 응답 헤더로 검증자 갱신"""
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if etag != self.etag or last_modified != self.last_modified:
+            self.etag = etag
+            self.last_modified = last_modified
+            self.changed = True
@@ -1,15 +1,34 @@
 from abc import ABC, abstractmethod
-from typing import List
-import feedparser
+from typing import Iterator, List, Optional, Tuple
+import re
+import time
+import hashlib
 import httpx
 from datetime import datetime
 import logging
-from app.models.schemas import ArticleSchema
+from app.models.schemas import ArticleRecord, FeedValidatorSchema
+from app.parsers.feed_backend import FEEDPARSER, iter_entries, resolve_backend
+from app.dependencies import metrics
+from app.dependencies.http_client import CircuitOpenError, ResponseTooLargeError
+from app.parsers.parse_pool import ParsePool
 
 logger = logging.getLogger(__name__)
 
 class BaseRSSParser(ABC):
 
+    # rss_service.PARSER_MAP 키와 같은 플랫폼 이름 (지표 라벨)
+    platform_name = ""
+
+    # 플랫폼 RSS가 최신 글부터 내려오는지 (True면 watermark 이하 글에서 정규화를 멈춤)
+    ordered_feed = True
+
+    # RSS 문서 파싱 백엔드 (feed_backend.FEEDPARSER 또는 LEAN)
+    feed_backend = FEEDPARSER
+
+    def __init__(self):
+        # 실행 중 정렬되지 않은 것으로 확인된 피드 URL (이후 전체 스캔)
+        self._unordered_feeds = set()
+
     @abstractmethod
     def get_rss_url(self, account_id: str) -> str:
         """
@@ -24,59 +43,324 @@ class BaseRSSParser(ABC):
         pass
 
     @abstractmethod
-    def normalize(self, entry) -> ArticleSchema:
+    def normalize(self, entry) -> ArticleRecord:
         """
-        RSS 엔트리를 ArticleSchema로 변환
+        RSS 엔트리를 ArticleRecord로 변환
 
         Args:
             entry: feedparser entry object
 
         Returns:
-            ArticleSchema instance
+            ArticleRecord instance
         """
         pass
 
-    def parse(self, account_id: str) -> List[ArticleSchema]:
+    def parse(self, account_id: str) -> List[ArticleRecord]:
         """
-        RSS 피드를 파싱하여 ArticleSchema 리스트 반환 (공통 로직)
+        RSS 피드를 파싱하여 ArticleRecord 리스트 반환 (공통 로직)
 
         Args:
             account_id: 플랫폼별 사용자 식별자
 
         Returns:
-            List of ArticleSchema
+            List of ArticleRecord
         """
         try:
             rss_url = self.get_rss_url(account_id)
             logger.info(f"Fetching RSS from: {rss_url}")
 
             # HTTP 요청으로 RSS 가져오기
-            response = httpx.get(rss_url, timeout=10.0)
+            with metrics.FEED_FETCH_SECONDS.labels(platform=self.platform_name).time():
+                response = httpx.get(rss_url, timeout=10.0)
+            self._observe_response(response)
             response.raise_for_status()
 
-            # feedparser로 파싱
-            feed = feedparser.parse(response.content)
+            return self.parse_content(response.content, rss_url)
+
+        except httpx.HTTPError as e:
+            self._observe_fetch_error(e)
+            logger.error(f"HTTP error fetching RSS from {account_id}: {e}")
+            return []
+        except Exception as e:
+            logger.error(f"Unexpected error parsing RSS from {account_id}: {e}")
+            return []
+
+    def parse_since(self, account_id: str, watermark: Optional[datetime]) -> Iterator[ArticleRecord]:
+        """
+        RSS 피드에서 watermark 이후 발행된 글만 순서대로 정규화하며 반환
+
+        Args:
+            account_id: 플랫폼별 사용자 식별자
+            watermark: 이 시각 이후 글만 반환 (None이면 전체)
+
+        Yields:
+            ArticleRecord
+        """
+        try:
+            rss_url = self.get_rss_url(account_id)
+            logger.info(f"Fetching RSS from: {rss_url}")
+
+            with metrics.FEED_FETCH_SECONDS.labels(platform=self.platform_name).time():
+                response = httpx.get(rss_url, timeout=10.0)
+            self._observe_response(response)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            self._observe_fetch_error(e)
+            logger.error(f"HTTP error fetching RSS from {account_id}: {e}")
+            return
+
+        yield from self.iter_content_since(response.content, rss_url, watermark)
+
+    async def parse_async(
+        self,
+        account_id: str,
+        client: httpx.AsyncClient,
+        validator: Optional[FeedValidatorSchema] = None,
+        watermark: Optional[datetime] = None,
+        parse_pool: Optional[ParsePool] = None,
+    ) -> List[ArticleRecord]:
+        """
+        공유 비동기 클라이언트로 RSS 피드를 가져와 파싱
+
+        validator가 있으면 If-None-Match / If-Modified-Since 조건부 요청을 보내고,
+        304 응답이거나 200 응답 본문의 해시가 validator.content_hash와 같으면 문서 파싱과 정규화를 건너뛴다.
+        200 응답이면 WebSub 허브 광고(discover_hub)도 validator에 기록한다.
+        watermark가 있으면 그 이후 글만 정규화한다. (parse_since 참고)
+
+        Args:
+            account_id: 플랫폼별 사용자 식별자
+            client: 모든 파서가 공유하는 클라이언트 (http_client.FeedClient 또는 httpx.AsyncClient)
+            validator: 피드 조건부 요청 검증자 (200 응답 시 갱신됨, 서킷이 열려 건너뛰면 circuit_open 표시)
+            watermark: 이 시각 이후 글만 반환 (None이면 전체)
+            parse_pool: 본문 파싱을 넘길 parse_pool.ParsePool (None이면 이 태스크에서 파싱)
+
+        Returns:
+            List of ArticleRecord (304면 빈 리스트)
+        """
+        started = time.perf_counter()
+        try:
+            rss_url = self.get_rss_url(account_id)
+            logger.info(f"Fetching RSS from: {rss_url}")
+
+            headers = validator.request_headers() if validator else None
+            with metrics.FEED_FETCH_SECONDS.labels(platform=self.platform_name).time():
+                response = await client.get(rss_url, headers=headers)
+            self._observe_response(response)
+
+            if response.status_code == 304:
+                logger.info(f"RSS not modified: {rss_url}")
+                if validator:
+                    validator.not_modified = True
+                    validator.fetched = True
+                return []
+
+            response.raise_for_status()
+            if validator:
+                validator.hub_url, validator.topic_url = discover_hub(response, rss_url)
 
-            if not feed.entries:
-                logger.warning(f"No entries found in RSS feed: {rss_url}")
+            # 조건부 요청을 무시하는 호스트: 마지막으로 처리한 본문과 같으면 파싱 생략
+            content_hash = content_fingerprint(response.content)
+            if validator and validator.content_hash == content_hash:
+                logger.info(f"RSS content unchanged: {rss_url}")
+                metrics.FEED_UNCHANGED.labels(platform=self.platform_name).inc()
+                validator.unchanged = True
+                validator.update_from(response.headers)
+                validator.fetched = True
                 return []
 
-            # 각 엔트리를 ArticleSchema로 변환
-            articles = []
-            for entry in feed.entries:
-                try:
-                    article = self.normalize(entry)
-                    articles.append(article)
-                except Exception as e:
-                    logger.error(f"Failed to normalize entry: {e}")
-                    continue
-
-            logger.info(f"Parsed {len(articles)} articles from {rss_url}")
+            if parse_pool is not None:
+                articles = await self._parse_in_pool(parse_pool, response.content, rss_url, watermark)
+            else:
+                with self._parse_timer():
+                    articles = list(self.iter_content_since(response.content, rss_url, watermark))
+            metrics.FEED_ARTICLES.labels(platform=self.platform_name).inc(len(articles))
+
+            # 파싱까지 끝난 뒤에 검증자 갱신 (실패한 버전을 캐시하지 않도록)
+            if validator:
+                validator.update_from(response.headers)
+                validator.content_hash = content_hash
+                validator.fetched = True
+
             return articles
 
+        except CircuitOpenError as e:
+            self._observe_fetch_error(e)
+            logger.warning(f"Skipped RSS fetch for {account_id}: {e}")
+            if validator:
+                validator.circuit_open = True
+            return []
         except httpx.HTTPError as e:
+            self._observe_fetch_error(e)
             logger.error(f"HTTP error fetching RSS from {account_id}: {e}")
             return []
         except Exception as e:
             logger.error(f"Unexpected error parsing RSS from {account_id}: {e}")
-            return []
\ No newline at end of file
+            return []
+        finally:
+            # 타임아웃 등 실패한 수집도 느린 피드 후보에 포함
+            metrics.record_feed_duration(self.platform_name, account_id, time.perf_counter() - started)
+
+    def parse_content(self, content: bytes, rss_url: str, watermark: Optional[datetime] = None) -> List[ArticleRecord]:
+        """
+        내려받은 (또는 WebSub 허브가 보낸) RSS 본문을 ArticleRecord 리스트로 변환
+
+        Args:
+            content: RSS 응답 본문
+            rss_url: 로그용 RSS URL
+            watermark: 이 시각 이후 글만 반환 (None이면 전체)
+
+        Returns:
+            List of ArticleRecord
+        """
+        with self._parse_timer():
+            articles = list(self.iter_content_since(content, rss_url, watermark))
+        metrics.FEED_ARTICLES.labels(platform=self.platform_name).inc(len(articles))
+        return articles
+
+    def iter_content_since(
+        self,
+        content: bytes,
+        rss_url: str,
+        watermark: Optional[datetime] = None,
+    ) -> Iterator[ArticleRecord]:
+        """
+        내려받은 RSS 본문에서 watermark 이후 글만 순서대로 정규화하며 반환
+
+        정렬된 피드(ordered_feed)는 watermark 이하 글을 만나면 정규화를 멈추고,
+        남은 엔트리의 발행 시각만 확인해 더 새로운 글이 섞여 있으면 그 피드를 정렬되지 않은 것으로
+        기록한 뒤 나머지도 정규화한다. 정렬되지 않은 피드는 처음부터 모든 엔트리를 확인한다.
+
+        Args:
+            content: RSS 응답 본문
+            rss_url: 로그용 RSS URL (정렬 여부 기록 키)
+            watermark: 이 시각 이후 글만 반환 (None이면 전체)
+
+        Yields:
+            ArticleRecord
+        """
+        # 플랫폼별 백엔드로 엔트리를 문서 순서대로 파싱
+        entries = iter_entries(content, self.feed_backend, rss_url)
+
+        ordered = self.ordered_feed and not self.known_unordered(rss_url)
+        seen = 0
+        count = 0
+        cutoff = False
+
+        # 각 엔트리를 ArticleRecord로 변환
+        for entry in entries:
+            seen += 1
+            published = _entry_published(entry)
+            if watermark is not None and published is not None and published <= watermark:
+                if ordered:
+                    cutoff = True
+                    break
+                continue
+
+            article = self._normalize_entry(entry)
+            if article is not None:
+                count += 1
+                yield article
+
+        if cutoff:
+            # 조기 종료 후 남은 엔트리에 watermark 이후 글이 있으면 정렬되지 않은 피드
+            newer = [entry for entry in entries if (_entry_published(entry) or watermark) > watermark]
+            if newer:
+                logger.warning(f"RSS feed is not ordered by date, falling back to full scan: {rss_url}")
+                self.mark_unordered(rss_url)
+                for entry in newer:
+                    article = self._normalize_entry(entry)
+                    if article is not None:
+                        count += 1
+                        yield article
+
+        if not seen:
+            logger.warning(f"No entries found in RSS feed: {rss_url}")
+            return
+
+        logger.info(f"Parsed {count} articles from {rss_url}")
+
+    def known_unordered(self, rss_url: str) -> bool:
+        """실행 중 정렬되지 않은 것으로 확인된 피드인지"""
+        return rss_url in self._unordered_feeds
+
+    def mark_unordered(self, rss_url: str):
+        self._unordered_feeds.add(rss_url)
+
+    async def _parse_in_pool(self, parse_pool, content: bytes, rss_url: str, watermark: Optional[datetime]) -> List[ArticleRecord]:
+        """워커 프로세스에서 파싱 (정렬되지 않은 피드 기록은 메인 프로세스와 워커가 주고받음)"""
+        articles, unordered, parse_seconds = await parse_pool.parse(
+            self.platform_name, content, rss_url, watermark, self.known_unordered(rss_url)
+        )
+        if unordered:
+            self.mark_unordered(rss_url)
+        # 대기 시간을 빼고 워커에서 실제로 파싱한 시간만 기록
+        metrics.FEED_PARSE_SECONDS.labels(
+            platform=self.platform_name, backend=resolve_backend(self.feed_backend)
+        ).observe(parse_seconds)
+        return articles
+
+    def _parse_timer(self):
+        return metrics.FEED_PARSE_SECONDS.labels(
+            platform=self.platform_name, backend=resolve_backend(self.feed_backend)
+        ).time()
+
+    def _observe_response(self, response: httpx.Response):
+        metrics.FEED_RESPONSES.labels(platform=self.platform_name, status=str(response.status_code)).inc()
+
+    def _observe_fetch_error(self, e: httpx.HTTPError):
+        # 상태 코드 오류는 _observe_response에서 이미 집계됨
+        if isinstance(e, CircuitOpenError):
+            metrics.FEED_RESPONSES.labels(platform=self.platform_name, status="circuit_open").inc()
+        elif isinstance(e, ResponseTooLargeError):
+            metrics.FEED_RESPONSES.labels(platform=self.platform_name, status="too_large").inc()
+        elif not isinstance(e, httpx.HTTPStatusError):
+            metrics.FEED_RESPONSES.labels(platform=self.platform_name, status="error").inc()
+
+    def _normalize_entry(self, entry) -> Optional[ArticleRecord]:
+        try:
+            return self.normalize(entry)
+        except Exception as e:
+            logger.error(f"Failed to normalize entry: {e}")
+            return None
+
+# 허브 광고를 찾을 문서 앞부분 크기 (채널 수준 link는 item보다 앞에 옴)
+HUB_DISCOVERY_BYTES = 8 * 1024
+
+_LINK_TAG = re.compile(rb"<(?:[\w-]+:)?link\b([^>]*)>", re.IGNORECASE)
+_TAG_ATTR = re.compile(rb"""([\w:-]+)\s*=\s*["']([^"']*)["']""")
+
+def discover_hub(response: httpx.Response, rss_url: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    WebSub 허브 광고 찾기 (HTTP Link 헤더 우선, 없으면 문서 앞부분의 <link> / <atom:link>)
+
+    Returns:
+        (허브 URL, 구독 토픽 URL) - 허브가 없으면 (None, None), rel="self"가 없으면 토픽은 rss_url
+    """
+    links = response.links
+    hub = links.get("hub", {}).get("url")
+    topic = links.get("self", {}).get("url")
+    if hub is None:
+        for match in _LINK_TAG.finditer(response.content[:HUB_DISCOVERY_BYTES]):
+            attrs = {name.lower(): value for name, value in _TAG_ATTR.findall(match.group(1))}
+            rels = attrs.get(b"rel", b"").split()
+            href = attrs.get(b"href")
+            if not href:
+                continue
+            if b"hub" in rels and hub is None:
+                hub = href.decode("utf-8", "replace")
+            elif b"self" in rels and topic is None:
+                topic = href.decode("utf-8", "replace")
+    if hub is None:
+        return None, None
+    return hub, topic or rss_url
+
+def content_fingerprint(content: bytes) -> str:
+    """응답 본문 해시 (blake2b 128비트 hex, FEED_FINGERPRINT에 저장)"""
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+def _entry_published(entry) -> Optional[datetime]:
+    """정규화 없이 엔트리 발행 시각만 읽기 (normalize와 같은 기준)"""
+    published_parsed = entry.get("published_parsed")
+    if not published_parsed:
+        return None
+    return datetime(*published_parsed[:6])
@@ -0,0 +1,175 @@
+"""
+RSS 문서 파싱 백엔드
+
+feedparser는 본문 sanitize, 상대 URL 처리, 각종 포맷 정규화까지 수행하지만 플랫폼 파서가 읽는 값은
+제목, 링크, 발행 시각, media 썸네일, 태그뿐이다. lean 백엔드는 증분 XML 파서(XMLPullParser)로
+RSS 2.0 item에서 이 필드만 뽑아 feedparser와 같은 형태의 엔트리(FeedParserDict)로 만든다.
+플랫폼 파서의 normalize()는 두 백엔드 결과를 구분 없이 받는다.
+
+lean 백엔드가 feedparser와 다른 결과를 낼 수 있는 입력(깨진 XML, RSS 2.0이 아닌 문서,
+RFC 822가 아닌 날짜, 제목의 마크업 등)을 만나면 그 지점부터 feedparser로 넘긴다.
+"""
+import os
+import logging
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterator
+from xml.etree.ElementTree import ParseError, XMLPullParser
+
+import feedparser
+from feedparser import FeedParserDict
+
+logger = logging.getLogger(__name__)
+
+FEEDPARSER = "feedparser"
+LEAN = "lean"
+
+# false면 모든 플랫폼이 feedparser 사용 (lean 백엔드 긴급 차단용)
+LEAN_FEED_PARSER_ENABLED = os.getenv("OBSERVER_LEAN_FEED_PARSER", "true").lower() == "true"
+
+# XMLPullParser에 한 번에 넣는 바이트 수
+LEAN_CHUNK_SIZE = 16 * 1024
+
+MEDIA_NAMESPACES = ("http://search.yahoo.com/mrss/", "http://search.yahoo.com/mrss")
+DC_NAMESPACE = "http://purl.org/dc/elements/1.1/"
+
+class LeanFeedError(Exception):
+    """lean 백엔드가 feedparser와 같은 결과를 보장할 수 없는 입력"""
+    pass
+
+def iter_entries(content: bytes, backend: str, rss_url: str) -> Iterator[FeedParserDict]:
+    """
+    RSS 본문의 엔트리를 문서 순서대로 반환
+
+    lean 백엔드는 소비한 만큼만 문서를 파싱하며, 실패하면 이미 반환한 엔트리 이후부터
+    feedparser 결과로 이어서 반환한다.
+
+    Args:
+        content: RSS 응답 본문
+        backend: FEEDPARSER 또는 LEAN
+        rss_url: 로그용 RSS URL
+
+    Yields:
+        feedparser 형식 엔트리
+    """
+    if resolve_backend(backend) == FEEDPARSER:
+        yield from feedparser.parse(content).entries
+        return
+
+    yielded = 0
+    try:
+        for entry in iter_lean_entries(content):
+            yield entry
+            yielded += 1
+        return
+    except (ParseError, LeanFeedError, ValueError) as e:
+        logger.warning(f"Lean feed parser failed after {yielded} entries, falling back to feedparser: {rss_url} ({e})")
+
+    yield from feedparser.parse(content).entries[yielded:]
+
+def resolve_backend(backend: str) -> str:
+    """설정(OBSERVER_LEAN_FEED_PARSER)을 반영한 실제 사용 백엔드"""
+    return LEAN if backend == LEAN and LEAN_FEED_PARSER_ENABLED else FEEDPARSER
+
+def iter_lean_entries(content: bytes) -> Iterator[FeedParserDict]:
+    """
+    RSS 2.0 item에서 플랫폼 파서가 읽는 필드만 추출
+
+    Raises:
+        ParseError: 잘못된 XML
+        LeanFeedError: feedparser와 결과가 달라질 수 있는 입력
+    """
+    parser = XMLPullParser(events=("start", "end"))
+    state = _LeanState()
+
+    for offset in range(0, len(content), LEAN_CHUNK_SIZE):
+        parser.feed(content[offset:offset + LEAN_CHUNK_SIZE])
+        yield from state.consume(parser.read_events())
+
+    parser.close()
+    yield from state.consume(parser.read_events())
+
+    if not state.root_seen:
+        raise LeanFeedError("empty document")
+
+class _LeanState:
+    """XMLPullParser 이벤트를 item 단위 엔트리로 묶는 상태"""
+
+    __slots__ = ("root_seen", "channel", "item", "entry")
+
+    def __init__(self):
+        self.root_seen = False
+        self.channel = None
+        self.item = None
+        self.entry = None
+
+    def consume(self, events) -> Iterator[FeedParserDict]:
+        for event, elem in events:
+            if event == "start":
+                self._start(elem)
+            elif elem is self.item:
+                entry = self._finish_item()
+                # 처리한 item은 트리에서 떼어내 메모리를 일정하게 유지
+                self.channel.remove(elem)
+                yield entry
+            elif self.item is not None:
+                self._item_child(elem)
+
+    def _start(self, elem):
+        if not self.root_seen:
+            self.root_seen = True
+            if elem.tag != "rss":
+                raise LeanFeedError(f"unsupported root element: {elem.tag}")
+        elif elem.tag == "channel" and self.channel is None:
+            self.channel = elem
+        elif elem.tag == "item":
+            if self.item is not None or self.channel is None:
+                raise LeanFeedError("unexpected item element")
+            self.item = elem
+            self.entry = FeedParserDict()
+
+    def _item_child(self, elem):
+        tag = elem.tag
+        entry = self.entry
+
+        if tag == "title":
+            title = _text(elem)
+            if "<" in title:
+                # feedparser는 마크업이 든 제목을 HTML로 보고 sanitize하므로 결과를 맞출 수 없음
+                raise LeanFeedError("markup in title")
+            entry.setdefault("title", title)
+        elif tag == "link":
+            entry.setdefault("link", _text(elem))
+        elif tag == "pubDate":
+            entry["published"] = _text(elem)
+            entry["published_parsed"] = _parse_rfc822(entry["published"])
+        elif tag == "category" or tag == f"{{{DC_NAMESPACE}}}subject":
+            term = _text(elem)
+            if term:
+                entry.setdefault("tags", []).append(FeedParserDict(term=term, scheme=None, label=None))
+        elif tag.startswith("{"):
+            namespace, _, local = tag[1:].partition("}")
+            if namespace in MEDIA_NAMESPACES and local in ("content", "thumbnail"):
+                entry.setdefault(f"media_{local}", []).append(FeedParserDict(elem.attrib))
+
+    def _finish_item(self) -> FeedParserDict:
+        entry = self.entry
+        if "published_parsed" not in entry:
+            # pubDate 대신 dc:date 등을 쓰는 피드는 feedparser 규칙을 따름
+            raise LeanFeedError("item without pubDate")
+        self.item = None
+        self.entry = None
+        return entry
+
+def _text(elem) -> str:
+    return (elem.text or "").strip()
+
+def _parse_rfc822(value: str):
+    """RFC 822 날짜를 feedparser와 같은 UTC struct_time으로 변환"""
+    try:
+        published = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        raise LeanFeedError(f"unsupported date format: {value!r}")
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=timezone.utc)
+    return published.astimezone(timezone.utc).timetuple()
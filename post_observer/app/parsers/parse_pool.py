@@ -0,0 +1,138 @@
+"""
+RSS 파싱 프로세스 풀
+
+feedparser 파싱과 글 정규화는 CPU 작업이라 수집을 동시에 해도 GIL에 묶인다.
+OBSERVER_PARSE_WORKERS > 0 이면 수집 태스크가 받은 본문(bytes)을 워커 프로세스로 넘겨
+파싱/정규화하고, 워커는 feedparser 엔트리 대신 글마다 작은 튜플만 돌려준다.
+(title, link, published_at, thumbnail, tags) - 메인 프로세스는 튜플을 그대로 ArticleRecord로 만든다.
+
+워커는 spawn으로 띄우므로 진입 스크립트(main.py, daemon.py)는 `if __name__ == "__main__":`로 보호되어 있어야 한다.
+"""
+import os
+import time
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import List, Optional, Tuple
+from app.models.schemas import ArticleRecord
+
+logger = logging.getLogger(__name__)
+
+# 파싱 워커 프로세스 수 (0이면 수집 태스크에서 바로 파싱)
+PARSE_WORKERS = int(os.getenv("OBSERVER_PARSE_WORKERS", "0"))
+
+# 워커가 돌려주는 글 하나
+ArticleRow = Tuple[str, str, datetime, Optional[str], Optional[Tuple[str, ...]]]
+
+class ParsePool:
+    """
+    파서 워커 프로세스 풀
+
+    워커는 spawn으로 띄워 수집 루프의 스레드(상태 확인 서버 등)나 DB/브로커 연결을 물려받지 않는다.
+    워커가 죽으면(BrokenProcessPool) 그 피드는 수집 실패로 처리하고 다음 요청부터 새 풀을 쓴다.
+    """
+
+    def __init__(self, workers: int = PARSE_WORKERS):
+        self.workers = max(1, workers)
+        self._executor = self._create_executor()
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(logging.getLogger().getEffectiveLevel(),),
+        )
+
+    async def parse(
+        self,
+        platform_name: str,
+        content: bytes,
+        rss_url: str,
+        watermark: Optional[datetime],
+        unordered: bool,
+    ) -> Tuple[List[ArticleRecord], bool, float]:
+        """
+        워커 프로세스에서 본문 파싱
+
+        Args:
+            platform_name: rss_service.PARSER_MAP 키
+            content: RSS 응답 본문
+            rss_url: 로그용 RSS URL
+            watermark: 이 시각 이후 글만 정규화 (None이면 전체)
+            unordered: 메인 프로세스가 이미 정렬되지 않은 피드로 알고 있는지
+
+        Returns:
+            (글 목록, 정렬되지 않은 피드인지, 워커 파싱 시간(초))
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._executor
+        try:
+            rows, unordered, parse_seconds = await loop.run_in_executor(
+                executor, parse_rows, platform_name, content, rss_url, watermark, unordered
+            )
+        except BrokenProcessPool:
+            if self._executor is executor:
+                logger.error("Parse worker died, restarting pool")
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._create_executor()
+            raise
+        return [article_from_row(row) for row in rows], unordered, parse_seconds
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+def create_parse_pool(workers: int = PARSE_WORKERS) -> Optional[ParsePool]:
+    """
+    설정된 워커 수로 풀 생성 (0이면 None - 수집 태스크에서 바로 파싱)
+
+    프로세스 풀을 만들 수 없는 환경(세마포어 미지원, /dev/shm 없음 등)이면 경고만 남기고 None을 돌려
+    실행을 멈추지 않고 수집 태스크에서 파싱한다.
+    """
+    if workers <= 0:
+        return None
+    logger.info(f"Starting {workers} parse worker processes")
+    try:
+        return ParsePool(workers)
+    except (OSError, ImportError, NotImplementedError) as e:
+        logger.warning(f"Parse worker pool unavailable, parsing in the fetch loop: {e}")
+        return None
+
+def article_from_row(row: ArticleRow) -> ArticleRecord:
+    """워커가 정규화한 튜플을 ArticleRecord로"""
+    title, link, published_at, thumbnail, tags = row
+    return ArticleRecord(title, link, published_at, thumbnail, list(tags) if tags is not None else None)
+
+def article_to_row(article: ArticleRecord) -> ArticleRow:
+    tags = tuple(article.tags) if article.tags is not None else None
+    return article.title, article.link, article.published_at, article.thumbnail, tags
+
+def parse_rows(
+    platform_name: str,
+    content: bytes,
+    rss_url: str,
+    watermark: Optional[datetime],
+    unordered: bool,
+) -> Tuple[List[ArticleRow], bool, float]:
+    """워커 프로세스에서 실행: 플랫폼 파서로 정규화한 글을 튜플로 반환"""
+    # 워커에서 처음 호출할 때 import (메인 프로세스의 rss_service와 순환 import 방지)
+    from app.services.rss_service import PARSER_MAP
+
+    parser = PARSER_MAP[platform_name]
+    if unordered:
+        parser.mark_unordered(rss_url)
+    started = time.perf_counter()
+    rows = [article_to_row(article) for article in parser.iter_content_since(content, rss_url, watermark)]
+    return rows, parser.known_unordered(rss_url), time.perf_counter() - started
+
+def _init_worker(log_level: int):
+    logging.basicConfig(level=log_level, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
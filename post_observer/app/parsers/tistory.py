@@ -1,10 +1,14 @@
 from datetime import datetime
 from app.parsers.base import BaseRSSParser
-from app.models.schemas import ArticleSchema
+from app.parsers.feed_backend import LEAN
+from app.models.schemas import ArticleRecord
 
 class TistoryRSSParser(BaseRSSParser):
     """티스토리 RSS 파서"""
 
+    platform_name = "tistory"
+    feed_backend = LEAN
+
     def get_rss_url(self, account_id: str) -> str:
         """
         티스토리 RSS URL 생성
@@ -17,15 +21,15 @@ class TistoryRSSParser(BaseRSSParser):
         """
         return f"https://{account_id}.tistory.com/rss"
 
-    def normalize(self, entry) -> ArticleSchema:
+    def normalize(self, entry) -> ArticleRecord:
         """
-        티스토리 RSS 엔트리를 ArticleSchema로 변환
+        티스토리 RSS 엔트리를 ArticleRecord로 변환
 
         Args:
             entry: feedparser entry object
 
         Returns:
-            ArticleSchema
+            ArticleRecord
         """
         # 발행 시간 파싱
         published_at = datetime(*entry.published_parsed[:6])
@@ -40,7 +44,7 @@ class TistoryRSSParser(BaseRSSParser):
         if hasattr(entry, 'tags') and entry.tags:
             tags = [tag.term for tag in entry.tags]
 
-        return ArticleSchema(
+        return ArticleRecord(
             title=entry.title,
             link=entry.link,
             published_at=published_at,
@@ -0,0 +1,258 @@
+import os
+from typing import Callable, Dict, Iterable, Iterator, Optional, Set, Tuple
+from datetime import datetime
+from app.models.db_models import ObserverCheckpoint, ObserverCheckpointFeed
+from app.services.shard_service import ShardConfig
+from app.dependencies.database import SessionLocal
+from app.dependencies.keyed_store import KeyedRowStore, KeyedRowBatch
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 실행 체크포인트 사용 여부 (false면 중단된 실행도 다음 실행에서 처음부터 다시)
+CHECKPOINT_ENABLED = os.getenv("OBSERVER_CHECKPOINT", "true").lower() == "true"
+
+# check_new_posts 시간 예산 (초, 0이면 제한 없음)
+# 예산이 지나면 새 피드 수집을 멈추고 이미 띄운 수집만 마무리하므로 activeDeadlineSeconds보다 여유 있게 잡는다.
+CHECK_BUDGET_SECONDS = float(os.getenv("OBSERVER_CHECK_BUDGET_SECONDS", "0"))
+
+# 체크포인트 상태
+STATUS_RUNNING = "running"   # 실행 중 (다음 실행이 이 상태를 보면 중단된 실행)
+STATUS_STOPPED = "stopped"   # 시간 예산으로 멈춤 (남은 피드는 다음 실행에서 먼저 처리)
+
+# 피드 처리 결과
+OUTCOME_NEW_POSTS = "new_posts"
+OUTCOME_NO_NEW_POSTS = "no_new_posts"
+OUTCOME_UNCHANGED = "unchanged"        # 200이지만 본문 해시가 같아 파싱 생략
+OUTCOME_NOT_MODIFIED = "not_modified"  # 304
+OUTCOME_FAILED = "failed"
+OUTCOME_CIRCUIT_OPEN = "circuit_open"
+
+# 처리를 마치지 못한 것으로 보고 다음 실행에서 먼저 다시 시도할 결과
+RETRY_OUTCOMES = {OUTCOME_FAILED, OUTCOME_CIRCUIT_OPEN}
+
+FeedKey = Tuple[str, str]
+
+class CheckpointBatch:
+    """RunCheckpoint.take로 꺼낸 저장할 피드 결과"""
+    __slots__ = ("rows", "swept", "taken_at")
+
+    def __init__(self, rows: KeyedRowBatch, swept: bool, taken_at: datetime):
+        self.rows = rows
+        self.swept = swept        # 이전 실행들에서 처리를 마친 피드 기록도 정리
+        self.taken_at = taken_at
+
+class RunCheckpoint:
+    """
+    샤드 하나의 check_new_posts 진행 상태 (OBSERVER_CHECKPOINT / OBSERVER_CHECKPOINT_FEED)
+
+    - 결과가 브로커와 DB에 모두 반영된 피드만 청크 단위로 처리 결과를 기록
+    - 실행이 끝나기 전에 파드가 죽거나 시간 예산으로 멈추면 다음 실행이 이어받아
+      처리하지 못한 피드부터 수집하고, 처리를 마친 피드는 뒤로 미룸
+    - 중단된 실행이 발행한 새 글 수를 이어받아 refresh 개수에 합산
+
+    처리 기록은 한 바퀴(모든 피드를 한 번씩 처리)가 끝날 때까지 누적되고,
+    실행이 모든 피드를 처리하면 체크포인트를 지운다.
+    """
+
+    def __init__(self, shard: Optional[ShardConfig] = None):
+        self.shard = shard or ShardConfig()
+        self.enabled = CHECKPOINT_ENABLED
+        self.started_at: Optional[datetime] = None
+        self.resumed_from: Optional[str] = None  # 이어받은 체크포인트 상태 (None이면 새 실행)
+        self.carried_new_posts = 0               # 이전 실행이 발행했지만 refresh 개수로 보고하지 못한 새 글 수
+        self.budget_exhausted = False            # 시간 예산이 지나 남은 피드를 미룸
+        self._previous: Set[FeedKey] = set()     # 이전 실행들에서 처리를 마친 피드 (뒤로 미룸)
+        self._checked: Set[FeedKey] = set()      # 이번 실행에서 결과를 저장한 피드
+        self._pending: Dict[FeedKey, Tuple[str, int]] = {}
+        self._untaken = 0                        # take 이후 예약한 피드 결과 수 (꺼낸 결과는 저장 중이어도 세지 않음)
+        self._rows = KeyedRowStore(ObserverCheckpointFeed, ("platform_name", "account_id"), "run checkpoint")
+        self._swept = False                      # 이전 실행들에서 미룬 피드를 모두 넘김 (이전 처리 기록 정리 대상)
+
+    def __len__(self):
+        """아직 꺼내지 않은 피드 결과 수"""
+        return self._untaken
+
+    def start(self, now: Optional[datetime] = None):
+        """
+        이전 체크포인트를 읽어 이어받을지 정하고 이번 실행 시작 기록
+
+        샤드 수가 바뀌었으면 피드 배분이 달라 이어받지 않는다.
+        읽거나 기록하지 못하면 이번 실행은 체크포인트 없이 처음부터 처리한다.
+        """
+        self.started_at = now or datetime.utcnow()
+        if not self.enabled:
+            return
+
+        db = SessionLocal()
+        try:
+            row = db.get(ObserverCheckpoint, self.shard.index)
+            if row is not None and row.shard_count == self.shard.count:
+                self.resumed_from = row.status
+                self.carried_new_posts = row.new_posts
+                for platform_name, account_id, outcome in db.query(
+                    ObserverCheckpointFeed.platform_name, ObserverCheckpointFeed.account_id, ObserverCheckpointFeed.outcome
+                ).filter(ObserverCheckpointFeed.shard_index == self.shard.index):
+                    key = (platform_name, account_id)
+                    self._rows.mark_stored([key])
+                    if outcome not in RETRY_OUTCOMES:
+                        self._previous.add(key)
+            else:
+                db.query(ObserverCheckpointFeed).filter(
+                    ObserverCheckpointFeed.shard_index == self.shard.index
+                ).delete(synchronize_session=False)
+                if row is None:
+                    row = ObserverCheckpoint(shard_index=self.shard.index)
+                    db.add(row)
+                row.new_posts = 0
+
+            row.shard_count = self.shard.count
+            row.status = STATUS_RUNNING
+            row.remaining_feeds = None
+            row.started_at = self.started_at
+            row.updated_at = self.started_at
+            db.commit()
+
+            if self.resumed_from is not None:
+                logger.info(
+                    f"Resuming {self.resumed_from} run: {len(self._previous)} feeds already processed, "
+                    f"{self.carried_new_posts} new posts carried over"
+                )
+        except Exception as e:
+            logger.error(f"Failed to load run checkpoint (running without it): {e}")
+            db.rollback()
+            self.enabled = False
+            self.resumed_from = None
+            self.carried_new_posts = 0
+            self._previous.clear()
+            self._rows.retain_stored(())
+        finally:
+            db.close()
+
+    def order(self, user_platforms: Callable[[], Iterable]) -> Iterator:
+        """
+        처리하지 못한 피드가 먼저 오도록 사용자-플랫폼 순서 조정
+
+        이어받을 기록이 있으면 목록을 두 번 읽어 이전 실행들에서 처리를 마친 피드를 뒤로 보낸다.
+        두 구간은 각각 (platform_name, account_id) 순이고 서로 겹치지 않아 같은 피드의 행은 계속 연속된다.
+
+        Args:
+            user_platforms: (platform_name, account_id) 순으로 정렬된 UserPlatformInfo를 새로 읽는 함수
+        """
+        previous = self._previous
+        if not previous:
+            yield from user_platforms()
+            return
+
+        yield from (up for up in user_platforms() if (up.platform_name, up.account_id) not in previous)
+        # 미룬 피드를 예산 안에 모두 넘겼으면 한 바퀴가 끝난 것이므로 이전 실행들의 기록은 정리
+        if not self.budget_exhausted:
+            self._swept = True
+        yield from (up for up in user_platforms() if (up.platform_name, up.account_id) in previous)
+
+    def record(self, platform_name: str, account_id: str, outcome: str, new_posts: int = 0):
+        """피드 처리 결과 예약 (save 전에 발행 flush와 last_upload 반영이 끝나야 함)"""
+        if self.enabled:
+            key = (platform_name, account_id)
+            self._pending[key] = (outcome, new_posts)
+            self._rows.changed(key)
+            self._untaken += 1
+
+    def save(self):
+        """
+        예약한 피드 결과와 새 글 수 저장
+
+        저장한 피드는 결과가 모두 반영된 것으로 보고 실행이 중단돼도 다음 실행에서 뒤로 미룬다.
+        저장에 실패하면 다음 save에서 다시 시도한다. (그 사이 중단되면 해당 피드를 다시 처리할 뿐)
+        """
+        batch = self.take()
+        if batch is not None:
+            self.write(batch)
+
+    def take(self) -> Optional["CheckpointBatch"]:
+        """예약한 피드 결과 꺼내기 (write로 저장, 저장할 것이 없으면 None)"""
+        if not self.enabled or not (self._pending or self._swept):
+            return None
+
+        now = datetime.utcnow()
+        self._untaken = 0
+        rows = self._rows.take(lambda key: {
+            "shard_index": self.shard.index,
+            "platform_name": key[0],
+            "account_id": key[1],
+            "outcome": self._pending[key][0],
+            "new_posts": self._pending[key][1],
+            "checked_at": now,
+        })
+        return CheckpointBatch(rows, self._swept, now)
+
+    def write(self, batch: "CheckpointBatch"):
+        """take로 꺼낸 피드 결과 저장 (이전 실행들의 기록 정리와 새 글 수 합산도 같은 트랜잭션)"""
+        new_posts = sum(row["new_posts"] for row in batch.rows.rows())
+
+        def update_run(db):
+            if batch.swept:
+                db.query(ObserverCheckpointFeed).filter(
+                    ObserverCheckpointFeed.shard_index == self.shard.index,
+                    ObserverCheckpointFeed.checked_at < self.started_at,
+                ).delete(synchronize_session=False)
+            db.query(ObserverCheckpoint).filter(ObserverCheckpoint.shard_index == self.shard.index).update({
+                ObserverCheckpoint.new_posts: ObserverCheckpoint.new_posts + new_posts,
+                ObserverCheckpoint.updated_at: batch.taken_at,
+            }, synchronize_session=False)
+
+        if not self._rows.write(batch.rows, update_run):
+            return
+        for row in batch.rows.rows():
+            key = self._rows.key_of(row)
+            self._checked.add(key)
+            self._pending.pop(key, None)
+        if batch.swept:
+            self._rows.retain_stored(self._checked)
+            self._swept = False
+
+    def complete(self, remaining_feeds: int = 0):
+        """
+        실행 종료 기록 (refresh 발행 뒤에 호출)
+
+        모든 피드를 처리했으면 체크포인트를 지우고, 시간 예산으로 남은 피드가 있으면 처리 기록은 남긴 채
+        보고한 새 글 수만 비워 다음 실행이 남은 피드부터 처리하게 한다.
+        """
+        if not self.enabled:
+            return
+
+        self.save()
+        db = SessionLocal()
+        try:
+            if remaining_feeds:
+                db.query(ObserverCheckpoint).filter(ObserverCheckpoint.shard_index == self.shard.index).update({
+                    ObserverCheckpoint.status: STATUS_STOPPED,
+                    ObserverCheckpoint.new_posts: 0,
+                    ObserverCheckpoint.remaining_feeds: remaining_feeds,
+                    ObserverCheckpoint.updated_at: datetime.utcnow(),
+                }, synchronize_session=False)
+            else:
+                db.query(ObserverCheckpointFeed).filter(
+                    ObserverCheckpointFeed.shard_index == self.shard.index
+                ).delete(synchronize_session=False)
+                db.query(ObserverCheckpoint).filter(
+                    ObserverCheckpoint.shard_index == self.shard.index
+                ).delete(synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            logger.error(f"Failed to complete run checkpoint: {e}")
+            db.rollback()
+        finally:
+            db.close()
+
+def feed_outcome(validator, new_posts: int) -> str:
+    """수집 결과(FeedValidatorSchema)와 발행한 새 글 수로 피드 처리 결과 분류"""
+    if validator.circuit_open:
+        return OUTCOME_CIRCUIT_OPEN
+    if not validator.fetched:
+        return OUTCOME_FAILED
+    if validator.not_modified:
+        return OUTCOME_NOT_MODIFIED
+    if validator.unchanged:
+        return OUTCOME_UNCHANGED
+    return OUTCOME_NEW_POSTS if new_posts else OUTCOME_NO_NEW_POSTS
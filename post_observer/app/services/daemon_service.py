@@ -0,0 +1,327 @@
+import os
+import time
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from app.services import platform_service, schedule_service, websub_service
+from app.services.observer_service import (
+    FeedState, CheckSummary, run_check, publish_refresh, check_inactive_users, process_pushed_feed
+)
+from app.services.websub_service import WebSubReceiver, WebSubSubscription, WEBSUB_ENABLED
+from app.services.shard_service import ShardConfig
+from app.dependencies.rabbitmq import RabbitMQPublisher
+from app.dependencies.http_client import create_feed_client, FeedClient
+from app.parsers.parse_pool import create_parse_pool, ParsePool
+from app.dependencies import metrics
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 수집 tick 간격 (초) - 매 tick마다 수집 일정이 된 피드와 새로 등록된 계정을 확인
+DAEMON_TICK_SECONDS = float(os.getenv("OBSERVER_DAEMON_TICK_SECONDS", "60"))
+
+# USER_PLATFORM 전체와 피드 상태를 DB에서 다시 읽는 간격 (초) - 계정 변경/연동 해제 반영, 정리 작업 실행
+DAEMON_RESYNC_SECONDS = float(os.getenv("OBSERVER_DAEMON_RESYNC_SECONDS", "3600"))
+
+# 미업로드 독촉 확인 간격 (시간) - 크론잡의 하루 한 번과 맞춤
+DAEMON_INACTIVE_CHECK_HOURS = float(os.getenv("OBSERVER_DAEMON_INACTIVE_CHECK_HOURS", "24"))
+
+# 이 시간(초) 동안 성공한 tick이 없으면 /healthz가 실패 응답 (기본: tick 간격의 3배, 최소 15분)
+DAEMON_STALE_SECONDS = float(os.getenv("OBSERVER_DAEMON_STALE_SECONDS", str(max(DAEMON_TICK_SECONDS * 3, 900))))
+
+# tick 사이 대기 중 RabbitMQ heartbeat를 처리하는 간격 (초)
+DAEMON_IDLE_POLL_SECONDS = 10
+
+# 처리를 기다릴 수 있는 WebSub 배포 요청 수 (넘치면 버리고 다음 폴링에 맡김)
+WEBSUB_QUEUE_SIZE = int(os.getenv("OBSERVER_WEBSUB_QUEUE_SIZE", "1000"))
+
+class UserPlatformIndex:
+    """
+    daemon이 메모리에 유지하는 이 샤드 몫의 사용자-플랫폼 목록
+
+    시작할 때와 resync 때 전체를 읽고, 그 사이에는 last_upload가 없는 (새로 등록된) 행만 읽어 합친다.
+    행의 last_upload / 발행 링크 집합은 run_check가 처리하면서 메모리에서도 갱신한다.
+    """
+
+    def __init__(self, shard: ShardConfig):
+        self.shard = shard
+        self._rows: Dict[Tuple, platform_service.UserPlatformInfo] = {}
+        self._sorted: Optional[List[platform_service.UserPlatformInfo]] = None
+        self._feeds: Optional[Dict[Tuple[str, str], List[platform_service.UserPlatformInfo]]] = None
+
+    def __len__(self):
+        return len(self._rows)
+
+    def resync(self):
+        """USER_PLATFORM 전체 다시 읽기 (실패하면 기존 목록 유지)"""
+        rows = {}
+        for up in platform_service.iter_user_platforms(raise_errors=True):
+            if self.shard.owns(up.platform_name, up.account_id):
+                rows[(up.user_id, up.platform_name)] = up
+        self._rows = rows
+        self._sorted = None
+        self._feeds = None
+        logger.info(f"Indexed {len(rows)} user-platforms")
+
+    def pick_up_new(self) -> int:
+        """
+        새로 등록되었거나 계정이 바뀐 행 합치기
+
+        Returns:
+            추가/교체한 행 수
+        """
+        added = 0
+        for up in platform_service.iter_user_platforms(unprocessed_only=True, raise_errors=True):
+            if not self.shard.owns(up.platform_name, up.account_id):
+                continue
+            key = (up.user_id, up.platform_name)
+            current = self._rows.get(key)
+            # 이미 아는 행은 메모리 값이 더 최신 (이번 daemon이 처리했지만 DB 반영에 실패했을 수 있음)
+            if current is not None and current.account_id == up.account_id:
+                continue
+            self._rows[key] = up
+            added += 1
+        if added:
+            self._sorted = None
+            self._feeds = None
+            logger.info(f"Picked up {added} new user-platforms")
+        return added
+
+    def rows(self) -> List[platform_service.UserPlatformInfo]:
+        """iter_user_platforms와 같은 (platform_name, account_id) 순서의 목록"""
+        if self._sorted is None:
+            self._sorted = sorted(
+                self._rows.values(),
+                key=lambda up: (up.platform_name, up.account_id is not None, up.account_id or ""),
+            )
+        return self._sorted
+
+    def subscribers(self, platform_name: str, account_id: str) -> List[platform_service.UserPlatformInfo]:
+        """피드 하나를 등록한 행 목록"""
+        if self._feeds is None:
+            feeds = {}
+            for up in self._rows.values():
+                feeds.setdefault((up.platform_name, up.account_id), []).append(up)
+            self._feeds = feeds
+        return self._feeds.get((platform_name, account_id), [])
+
+class ObserverDaemon:
+    """
+    상주 실행 모드
+
+    크론잡처럼 실행마다 연결/상태를 새로 만들지 않고 RabbitMQ 연결, FeedClient(keep-alive 연결 풀),
+    피드 상태(검증자/일정/본문 해시), 사용자-플랫폼 목록을 메모리에 유지하면서 tick마다 수집한다.
+    - 매 tick: 새 등록 계정을 합친 뒤 run_check (수집 일정이 된 피드와 새 계정만 수집)
+    - DAEMON_RESYNC_SECONDS 마다: 정리 작업 후 목록과 상태를 DB에서 다시 읽음
+    - DAEMON_INACTIVE_CHECK_HOURS 마다: 미업로드 독촉
+    - OBSERVER_WEBSUB_CALLBACK_URL이 있으면: 허브를 알리는 피드를 구독하고, tick 사이에 배포 요청으로 받은
+      글을 폴링과 같은 경로로 발행 (구독이 확인된 피드도 MAX_STALENESS마다 폴링)
+    tick이 실패하면 메모리 상태가 DB와 어긋났을 수 있으므로 다음 tick에서 resync한다.
+    """
+
+    def __init__(
+        self,
+        publisher: RabbitMQPublisher,
+        shard: Optional[ShardConfig] = None,
+        tick_seconds: float = DAEMON_TICK_SECONDS,
+        resync_seconds: float = DAEMON_RESYNC_SECONDS,
+        inactive_check_hours: float = DAEMON_INACTIVE_CHECK_HOURS,
+        stale_seconds: float = DAEMON_STALE_SECONDS,
+    ):
+        self.publisher = publisher
+        self.shard = shard or ShardConfig()
+        self.tick_seconds = tick_seconds
+        self.resync_seconds = resync_seconds
+        self.inactive_check_seconds = inactive_check_hours * 3600
+        self.stale_seconds = stale_seconds
+        self.index = UserPlatformIndex(self.shard)
+        self.state: Optional[FeedState] = None
+        self.websub = WebSubReceiver(self._websub_store, self._on_push) if WEBSUB_ENABLED else None
+        self.parse_pool: Optional[ParsePool] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pushes: Optional[asyncio.Queue] = None
+
+        self.started_at = time.time()
+        self.ticks = 0
+        self.last_success_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.last_summary: Optional[CheckSummary] = None
+        self._needs_resync = True
+        self._next_resync = 0.0
+        self._next_inactive_check = 0.0
+
+    async def run(self, stop: asyncio.Event, client: Optional[FeedClient] = None):
+        """stop이 설정될 때까지 tick 반복 (client가 없으면 daemon 전체에서 쓸 FeedClient 생성)"""
+        if client is None:
+            async with create_feed_client() as client:
+                return await self.run(stop, client)
+
+        self._loop = asyncio.get_running_loop()
+        self._pushes = asyncio.Queue(WEBSUB_QUEUE_SIZE) if self.websub is not None else None
+        # 파싱 워커는 daemon 전체에서 재사용 (OBSERVER_PARSE_WORKERS > 0 일 때)
+        self.parse_pool = create_parse_pool()
+
+        if not schedule_service.ADAPTIVE_SCHEDULE_ENABLED:
+            logger.warning("Adaptive schedule is disabled: every feed is fetched on every tick")
+        logger.info(
+            f"Observer daemon started (tick {self.tick_seconds:.0f}s, resync {self.resync_seconds:.0f}s, "
+            f"inactive check {self.inactive_check_seconds / 3600:.0f}h)"
+        )
+        try:
+            while not stop.is_set():
+                started = time.monotonic()
+                await self.tick(client)
+                await self._idle(stop, started + self.tick_seconds)
+        finally:
+            if self.parse_pool is not None:
+                self.parse_pool.close()
+        logger.info("Observer daemon stopped")
+
+    async def tick(self, client: FeedClient):
+        """한 번의 수집 주기 (실패해도 daemon은 계속 돌고 /healthz로 드러남)"""
+        self.ticks += 1
+        metrics.reset_slow_feeds()
+        try:
+            with metrics.RUN_SECONDS.labels(phase="daemon_tick").time():
+                if self._needs_resync or time.monotonic() >= self._next_resync:
+                    self._resync()
+                else:
+                    self.index.pick_up_new()
+
+                self.state.schedule.start_run()
+                summary = await run_check(
+                    self.publisher, self.shard, self.index.rows(), self.state, client, parse_pool=self.parse_pool
+                )
+                self.last_summary = summary
+                if summary.new_posts:
+                    # 새 글이 있는 tick에만 ai_server에 처리할 글 수 추가 (앞선 tick / 배포 요청의 글과 누적됨)
+                    publish_refresh(self.publisher, summary.new_posts)
+                if self.state.websub is not None:
+                    await self._subscribe(client)
+
+                if time.monotonic() >= self._next_inactive_check:
+                    check_inactive_users(self.publisher, self.shard)
+                    self._next_inactive_check = time.monotonic() + self.inactive_check_seconds
+                    # 독촉한 행의 last_upload가 DB에서만 바뀌었으므로 다시 읽음
+                    self._needs_resync = True
+
+            self.last_success_at = time.time()
+            self.last_error = None
+            metrics.LAST_SUCCESS.set_to_current_time()
+        except Exception as e:
+            logger.exception(f"Observer daemon tick {self.ticks} failed: {e}")
+            self.last_error = str(e)
+            self._needs_resync = True
+        finally:
+            metrics.push_metrics({"shard": str(self.shard.index)} if self.shard.enabled else None)
+
+    def _resync(self):
+        """정리 작업 후 피드 상태와 사용자-플랫폼 목록을 DB에서 다시 읽음"""
+        state = FeedState(websub=WEBSUB_ENABLED)
+        if self.state is not None:
+            # tick 사이에 수신기가 받은 구독 확인은 아직 저장 전
+            if self.state.websub is not None:
+                self.state.websub.save()
+            state.evict()
+        state.load()
+        self.index.resync()
+        self.state = state
+        self._needs_resync = False
+        self._next_resync = time.monotonic() + self.resync_seconds
+
+    async def _idle(self, stop: asyncio.Event, until: float):
+        """다음 tick까지 대기 (그동안 RabbitMQ heartbeat 처리)"""
+        while not stop.is_set():
+            remaining = until - time.monotonic()
+            if remaining <= 0:
+                return
+            self.publisher.process_events()
+            push = await self._next_push(stop, min(remaining, DAEMON_IDLE_POLL_SECONDS))
+            if push is not None:
+                self._handle_push(*push)
+
+    async def _subscribe(self, client: FeedClient):
+        """구독/갱신할 차례인 WebSub 구독 요청 (허브 확인은 수신기로 들어옴)"""
+        due = self.state.websub.due_for_subscribe(datetime.utcnow())
+        if not due:
+            return
+        results = await asyncio.gather(*(websub_service.subscribe(client, subscription) for subscription in due))
+        logger.info(f"Sent {sum(results)}/{len(due)} WebSub subscribe requests")
+
+    def _websub_store(self):
+        return self.state.websub if self.state is not None else None
+
+    def _on_push(self, subscription: WebSubSubscription, body: bytes) -> bool:
+        """수신기 스레드에서 받은 배포 본문을 수집 루프로 넘김"""
+        if self._loop is None or self._pushes is None or self._pushes.full():
+            return False
+        self._loop.call_soon_threadsafe(
+            self._enqueue_push, (subscription.platform_name, subscription.account_id, subscription.topic_url, body)
+        )
+        return True
+
+    def _enqueue_push(self, push):
+        try:
+            self._pushes.put_nowait(push)
+        except asyncio.QueueFull:
+            logger.warning(f"Dropped WebSub notification (queue full): {push[0]}/{push[1]}")
+
+    async def _next_push(self, stop: asyncio.Event, timeout: float):
+        """timeout 동안 배포 요청 하나를 기다림 (stop이 설정되거나 시간이 지나면 None)"""
+        if self._pushes is None:
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+            return None
+        getter = asyncio.ensure_future(self._pushes.get())
+        stopper = asyncio.ensure_future(stop.wait())
+        done, pending = await asyncio.wait({getter, stopper}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        return getter.result() if getter in done else None
+
+    def _handle_push(self, platform_name: str, account_id: str, topic_url: str, body: bytes):
+        """배포 요청으로 받은 피드 문서를 구독자들에게 발행"""
+        subscribers = self.index.subscribers(platform_name, account_id)
+        if not subscribers:
+            return
+        try:
+            new_posts = process_pushed_feed(self.publisher, subscribers, body, topic_url)
+            if new_posts:
+                publish_refresh(self.publisher, new_posts)
+        except Exception as e:
+            logger.exception(f"Failed to process WebSub notification for {platform_name}/{account_id}: {e}")
+            # 메모리의 last_upload / 링크 집합이 DB와 어긋났을 수 있음 (놓친 글은 다음 폴링이 가져감)
+            self._needs_resync = True
+
+    def routes(self) -> dict:
+        """health_server에 붙일 라우트 (WebSub 콜백)"""
+        return {websub_service.CALLBACK_PATH: self.websub.handle} if self.websub is not None else {}
+
+    def health(self) -> Tuple[bool, dict]:
+        """
+        /healthz 응답 (시작 후 또는 마지막 성공 tick 후 stale_seconds 안이면 정상)
+
+        Returns:
+            (정상 여부, 상태 정보)
+        """
+        reference = self.last_success_at or self.started_at
+        healthy = time.time() - reference <= self.stale_seconds
+        status = {
+            "status": "ok" if healthy else "stale",
+            "ticks": self.ticks,
+            "user_platforms": len(self.index),
+            "last_success_at": (
+                datetime.utcfromtimestamp(self.last_success_at).isoformat() + "Z" if self.last_success_at else None
+            ),
+            "last_error": self.last_error,
+        }
+        if self.last_summary is not None:
+            status["last_tick"] = {
+                "feeds": self.last_summary.feeds,
+                "not_due": self.last_summary.not_due,
+                "new_posts": self.last_summary.new_posts,
+                "circuit_skipped": len(self.last_summary.circuit_skipped),
+            }
+        return healthy, status
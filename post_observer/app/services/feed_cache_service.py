@@ -0,0 +1,102 @@
+from typing import Dict, Tuple
+from datetime import datetime
+from app.models.db_models import FeedCache
+from app.models.schemas import FeedValidatorSchema
+from app.dependencies import keyed_store
+from app.dependencies.keyed_store import KeyedRowStore, KeyedRowBatch
+import logging
+
+logger = logging.getLogger(__name__)
+
+class FeedValidatorStore:
+    """
+    사용자-플랫폼별 조건부 요청 검증자 저장소
+
+    실행 시작 시 FEED_CACHE 전체를 한 번에 읽고, 실행 종료 시 바뀐 검증자만 저장한다.
+    검증자는 해당 사용자가 마지막으로 처리를 마친 피드 버전을 뜻하므로
+    (user_id, platform_name) 단위로 보관하고, account_id가 바뀌면 무효로 본다.
+    """
+
+    def __init__(self):
+        self._validators: Dict[Tuple, FeedValidatorSchema] = {}
+        self._account_ids: Dict[Tuple, str] = {}
+        self._rows = KeyedRowStore(FeedCache, ("user_id", "platform_name"), "feed validators")
+
+    def load(self):
+        """FEED_CACHE에서 모든 검증자 로드 (못 읽으면 조건부 요청 없이 전체 수집)"""
+        self._rows.load(self._load_row)
+
+    def _load_row(self, row) -> Tuple:
+        key = (row.user_id, row.platform_name)
+        self._validators[key] = FeedValidatorSchema(etag=row.etag, last_modified=row.last_modified)
+        self._account_ids[key] = row.account_id
+        return key
+
+    def get(self, user_id, platform_name: str, account_id: str) -> FeedValidatorSchema:
+        """
+        사용자-플랫폼의 검증자 반환 (없거나 계정이 바뀌었으면 빈 검증자)
+
+        Args:
+            user_id: 사용자 ID
+            platform_name: 플랫폼 이름
+            account_id: 현재 등록된 플랫폼 계정 ID
+        """
+        key = (user_id, platform_name)
+        validator = self._validators.get(key)
+        if validator is None or self._account_ids.get(key) != account_id:
+            validator = FeedValidatorSchema()
+            self._validators[key] = validator
+            self._account_ids[key] = account_id
+        return validator
+
+    def get_shared(self, subscribers) -> FeedValidatorSchema:
+        """
+        같은 피드를 구독하는 사용자-플랫폼들이 함께 쓸 검증자 반환
+
+        모든 구독자가 같은 버전까지 처리했을 때만 조건부 요청을 보내고,
+        하나라도 다르면 (신규 구독자 등) 빈 검증자로 전체 수집한다.
+        """
+        validators = [self.get(up.user_id, up.platform_name, up.account_id) for up in subscribers]
+        first = validators[0]
+        if all(v.etag == first.etag and v.last_modified == first.last_modified for v in validators):
+            return FeedValidatorSchema(etag=first.etag, last_modified=first.last_modified)
+        return FeedValidatorSchema()
+
+    def apply_shared(self, subscribers, shared: FeedValidatorSchema):
+        """피드 한 번 수집한 결과(304 여부, 갱신된 검증자)를 모든 구독자에게 반영"""
+        for up in subscribers:
+            validator = self.get(up.user_id, up.platform_name, up.account_id)
+            validator.fetched = shared.fetched
+            validator.not_modified = shared.not_modified
+            if shared.changed and (validator.etag != shared.etag or validator.last_modified != shared.last_modified):
+                validator.etag = shared.etag
+                validator.last_modified = shared.last_modified
+                self._rows.changed((up.user_id, up.platform_name))
+
+    def take(self) -> KeyedRowBatch:
+        """바뀐 검증자 행 꺼내기 (write로 저장)"""
+        now = datetime.utcnow()
+        return self._rows.take(lambda key: {
+            "user_id": key[0],
+            "platform_name": key[1],
+            "account_id": self._account_ids[key],
+            "etag": self._validators[key].etag,
+            "last_modified": self._validators[key].last_modified,
+            "updated_at": now,
+        })
+
+    def write(self, batch: KeyedRowBatch) -> bool:
+        return self._rows.write(batch)
+
+    def save(self):
+        """이번 실행에서 바뀐 검증자만 저장"""
+        self.write(self.take())
+
+def evict_deregistered() -> int:
+    """
+    더 이상 USER_PLATFORM에 없는 (연동 해제/계정 변경/탈퇴) 검증자 삭제
+
+    Returns:
+        삭제한 행 수
+    """
+    return keyed_store.evict_unregistered(FeedCache, "feed validators", per_user=True)
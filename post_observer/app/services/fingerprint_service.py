@@ -0,0 +1,80 @@
+import os
+from typing import Dict, Optional, Tuple
+from datetime import datetime
+from app.models.db_models import FeedFingerprint
+from app.dependencies import keyed_store
+from app.dependencies.keyed_store import KeyedRowStore, KeyedRowBatch
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 본문 해시 비교 사용 여부 (false면 200 응답은 항상 파싱)
+CONTENT_FINGERPRINT_ENABLED = os.getenv("OBSERVER_CONTENT_FINGERPRINT", "true").lower() == "true"
+
+class FeedFingerprintStore:
+    """
+    피드별 본문 해시 저장소 (FEED_FINGERPRINT)
+
+    조건부 요청을 무시하고 매번 같은 본문을 200으로 주는 호스트를 위해, 피드마다 마지막으로
+    처리를 마친 본문의 해시를 보관한다. 실행 시작 시 한 번에 읽고, 실행 종료 시 바뀐 해시만 저장한다.
+    """
+
+    def __init__(self):
+        self._hashes: Dict[Tuple[str, str], str] = {}
+        self._rows = KeyedRowStore(FeedFingerprint, ("platform_name", "account_id"), "feed fingerprints")
+
+    def load(self):
+        """FEED_FINGERPRINT에서 모든 해시 로드 (못 읽으면 모든 200 응답을 파싱)"""
+        if CONTENT_FINGERPRINT_ENABLED:
+            self._rows.load(self._load_row)
+
+    def _load_row(self, row) -> Tuple[str, str]:
+        key = (row.platform_name, row.account_id)
+        self._hashes[key] = row.content_hash
+        return key
+
+    def get(self, platform_name: str, account_id: str) -> Optional[str]:
+        """마지막으로 처리한 본문 해시 (없으면 None)"""
+        return self._hashes.get((platform_name, account_id))
+
+    def record(self, platform_name: str, account_id: str, content_hash: Optional[str]):
+        """
+        처리를 마친 본문 해시 기록
+
+        Args:
+            platform_name: 플랫폼 이름
+            account_id: 플랫폼 계정 ID
+            content_hash: 이번에 받은 본문 해시 (304라 본문이 없었으면 None - 기존 해시 유지)
+        """
+        if not CONTENT_FINGERPRINT_ENABLED or content_hash is None:
+            return
+        key = (platform_name, account_id)
+        if self._hashes.get(key) != content_hash:
+            self._hashes[key] = content_hash
+            self._rows.changed(key)
+
+    def take(self) -> KeyedRowBatch:
+        """바뀐 해시 행 꺼내기 (write로 저장)"""
+        now = datetime.utcnow()
+        return self._rows.take(lambda key: {
+            "platform_name": key[0],
+            "account_id": key[1],
+            "content_hash": self._hashes[key],
+            "updated_at": now,
+        })
+
+    def write(self, batch: KeyedRowBatch) -> bool:
+        return self._rows.write(batch)
+
+    def save(self):
+        """이번 실행에서 바뀐 해시만 저장"""
+        self.write(self.take())
+
+def evict_unregistered() -> int:
+    """
+    어떤 사용자도 등록하지 않은 피드의 해시 삭제
+
+    Returns:
+        삭제한 행 수
+    """
+    return keyed_store.evict_unregistered(FeedFingerprint, "feed fingerprints")
@@ -1,124 +1,710 @@
-from datetime import datetime
-from app.services import platform_service, rss_service
-from app.dependencies.rabbitmq import publish_message
+import os
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from contextlib import contextmanager
+from itertools import groupby
+from typing import Iterable, Iterator, List, Optional, Tuple
+from app.services import platform_service, rss_service, feed_cache_service, shard_service, schedule_service, fingerprint_service, seen_service, websub_service, checkpoint_service
+from app.services.shard_service import ShardConfig
+from app.services.checkpoint_service import RunCheckpoint, CHECK_BUDGET_SECONDS
+from app.services.seen_service import SeenSet, link_key, SEEN_SET_ENABLED, SEEN_LOOKBACK
+from app.services.schedule_service import MIN_POLL_INTERVAL, MAX_STALENESS
+from app.dependencies.rabbitmq import RabbitMQPublisher
+from app.models.schemas import ArticleRecord, encode_new_post_message, encode_new_posts_batch_message
+from app.dependencies.http_client import create_feed_client, FeedClient, FetchStats, RSS_FETCH_CONCURRENCY
+from app.parsers.parse_pool import create_parse_pool, ParsePool
+from app.dependencies import metrics
 import logging
 
 logger = logging.getLogger(__name__)
 
-def check_new_posts():
+# 동시에 떠 있을 수 있는 피드 수집 태스크 수 (스트리밍 중 메모리 사용량 상한)
+MAX_INFLIGHT_FEEDS = RSS_FETCH_CONCURRENCY * 2
+
+# 이 기간 이상 글이 없으면 미업로드 독촉 대상
+INACTIVE_DAYS = 30
+
+# new_posts 메시지 하나에 담을 사용자-플랫폼의 새 글 수 (기본 0 - 글마다 메시지 하나)
+# 배치 형식을 모르는 ai_server는 'article' 키가 없는 메시지를 재시도로 보고 계속 requeue하므로,
+# 배치를 받는 ai_server가 배포된 뒤 따로 켠다. 배치는 글 하나만 실패해도 통째로 재시도되므로 크게 잡지 않는다.
+NEW_POSTS_BATCH_SIZE = int(os.getenv("OBSERVER_NEW_POSTS_BATCH_SIZE", "0"))
+
+class CheckSummary:
+    """check_new_posts 실행 결과 요약"""
+    def __init__(self):
+        self.rows = 0       # 이 샤드가 맡은 사용자-플랫폼 수
+        self.feeds = 0      # 실제로 수집한 피드 수 (같은 피드를 구독하는 행은 한 번만 수집)
+        self.not_due = 0    # 수집 일정이 아직 안 돼서 건너뛴 사용자-플랫폼 수
+        self.deferred = 0   # 시간 예산이 지나 다음 실행으로 미룬 피드 수
+        self.unchanged = 0  # 200 응답이지만 본문이 지난번과 같아 파싱을 건너뛴 피드 수
+        self.new_posts = 0
+        self.serial_seconds = 0.0  # 피드별 수집 시간 합계 = 직렬 실행 시 예상 소요 시간
+        # 호스트 서킷이 열려 요청하지 않은 (platform_name, account_id) - 일정을 미루지 않아 다음 실행에서 수집
+        self.circuit_skipped: List[Tuple[str, str]] = []
+        self.fetch_stats = FetchStats()
+
+    def __repr__(self):
+        return (
+            f"CheckSummary(rows={self.rows}, feeds={self.feeds}, not_due={self.not_due}, unchanged={self.unchanged}, "
+            f"circuit_skipped={len(self.circuit_skipped)}, deferred={self.deferred}, new_posts={self.new_posts})"
+        )
+
+class FeedState:
+    """
+    실행 사이에 이어지는 피드 상태 (조건부 요청 검증자, 수집 일정, 본문 해시, WebSub 구독)
+
+    크론잡은 실행마다 DB에서 읽고 끝에 저장하며, daemon은 한 번 읽은 뒤 메모리에 유지하면서
+    매 tick 끝에 바뀐 것만 저장한다. WebSub 구독은 수신기가 있는 daemon 모드에서만 사용한다.
+    """
+    def __init__(self, websub: bool = False):
+        self.validators = feed_cache_service.FeedValidatorStore()
+        self.schedule = schedule_service.FeedScheduleStore()
+        self.fingerprints = fingerprint_service.FeedFingerprintStore()
+        self.websub = websub_service.WebSubStore() if websub else None
+
+    def load(self):
+        self.validators.load()
+        self.schedule.load()
+        self.fingerprints.load()
+        if self.websub is not None:
+            self.websub.load()
+
+    def save(self):
+        """바뀐 검증자/일정/해시/구독 저장 (처리한 피드의 발행과 last_upload 반영이 끝난 뒤에 호출)"""
+        self.write(self.take())
+
+    def take(self) -> list:
+        """저장할 행을 저장소마다 꺼냄 (수집 루프에서 꺼내고 write는 writer 스레드에서)"""
+        stores = [self.validators, self.schedule, self.fingerprints]
+        if self.websub is not None:
+            stores.append(self.websub)
+        return [(store, store.take()) for store in stores]
+
+    def write(self, batches: list):
+        for store, batch in batches:
+            store.write(batch)
+
+    def evict(self):
+        """등록 해제된 피드/계정의 상태 정리"""
+        feed_cache_service.evict_deregistered()
+        schedule_service.evict_unregistered()
+        fingerprint_service.evict_unregistered()
+        seen_service.evict_deregistered()
+        if self.websub is not None:
+            websub_service.evict_unregistered()
+
+class _Outbox:
+    """수집 루프에서 발행할 new_posts 메시지를 모아 두는 버퍼 (실제 발행은 writer 스레드에서)"""
+    def __init__(self):
+        self._messages: List[Tuple[str, str]] = []
+
+    def __len__(self):
+        return len(self._messages)
+
+    def publish_body(self, queue_name: str, body: str):
+        self._messages.append((queue_name, body))
+
+    def take(self) -> List[Tuple[str, str]]:
+        messages, self._messages = self._messages, []
+        return messages
+
+class _CheckRun:
+    """check_new_posts 한 번의 실행 동안 공유하는 상태"""
+    def __init__(
+        self,
+        publisher: RabbitMQPublisher,
+        shard: ShardConfig,
+        state: FeedState,
+        checkpoint: Optional[RunCheckpoint] = None,
+        deadline: Optional[float] = None,
+        parse_pool: Optional[ParsePool] = None,
+    ):
+        self.publisher = publisher
+        self.shard = shard
+        self.state = state
+        self.checkpoint = checkpoint
+        self.deadline = deadline  # time.monotonic() 기준 새 피드 수집을 멈출 시각 (None이면 제한 없음)
+        self.parse_pool = parse_pool
+        self.updates = platform_service.LastUploadBatch()
+        self.seen_sets = seen_service.SeenSetBatch()
+        self.outbox = _Outbox()
+        # RabbitMQ 확인과 DB 쓰기는 블로킹이라 스레드 하나에서 넘긴 순서대로 (발행기도 이 스레드에서만 사용)
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="observer-writer")
+        self._writes: List[asyncio.Future] = []
+        self._write_failed = False
+        self.validators = state.validators
+        self.schedule = state.schedule
+        self.fingerprints = state.fingerprints
+        self.websub = state.websub
+        self.summary = CheckSummary()
+        # last_upload가 이보다 오래된 사용자는 미업로드 독촉 전에 반드시 최신 상태를 확인
+        self.inactive_cutoff = self.schedule.run_started_at - timedelta(days=INACTIVE_DAYS)
+
+    def is_due(self, subscribers) -> bool:
+        """
+        이번 실행에서 수집할 피드인지 확인
+
+        새로 등록된 계정이나 미업로드 독촉 대상 후보가 구독자 중에 있으면 일정과 무관하게 수집한다.
+        (MIN_POLL_INTERVAL 안에 이미 수집한 피드는 제외 - daemon이 tick마다 다시 수집하지 않도록)
+        WebSub 구독이 확인된 피드는 배포 요청으로 새 글을 받으므로 MAX_STALENESS마다 한 번만 폴링한다.
+        """
+        first = subscribers[0]
+        for up in subscribers:
+            if up.last_upload is None or up.last_upload <= self.inactive_cutoff:
+                if not self.schedule.checked_within(first.platform_name, first.account_id, MIN_POLL_INTERVAL):
+                    return True
+                break
+        if self.websub is not None and self.websub.is_active(
+            first.platform_name, first.account_id, self.schedule.run_started_at
+        ):
+            return not self.schedule.checked_within(first.platform_name, first.account_id, MAX_STALENESS)
+        return self.schedule.is_due(first.platform_name, first.account_id)
+
+    def submit(self, fn, *args):
+        """블로킹 반영 작업을 writer 스레드에 넘김 (결과는 drain에서 확인)"""
+        self._writes.append(asyncio.get_running_loop().run_in_executor(self.writer, self._write, fn, args))
+
+    def _write(self, fn, args):
+        # 앞선 작업이 실패했으면 뒤의 작업은 하지 않음 (발행하지 못한 글의 last_upload가 올라가지 않도록)
+        if self._write_failed:
+            raise RuntimeError("Skipped write after an earlier write failed")
+        try:
+            fn(*args)
+        except BaseException:
+            self._write_failed = True
+            raise
+
+    async def drain(self):
+        """넘긴 반영 작업이 모두 끝날 때까지 대기 (하나라도 실패했으면 예외)"""
+        writes, self._writes = self._writes, []
+        if writes:
+            await asyncio.gather(*writes)
+
+@contextmanager
+def _publisher_scope(publisher: Optional[RabbitMQPublisher]):
+    """전달받은 발행기를 그대로 쓰거나, 없으면 이번 호출 동안만 쓸 발행기 생성"""
+    if publisher is not None:
+        yield publisher
+        return
+    with RabbitMQPublisher() as owned_publisher:
+        yield owned_publisher
+
+@contextmanager
+def _parse_pool_scope(parse_pool: Optional[ParsePool]):
+    """전달받은 파싱 풀을 그대로 쓰거나, OBSERVER_PARSE_WORKERS > 0 이면 이번 호출 동안만 쓸 풀 생성"""
+    if parse_pool is not None:
+        yield parse_pool
+        return
+    owned_pool = create_parse_pool()
+    if owned_pool is None:
+        yield None
+        return
+    with owned_pool:
+        yield owned_pool
+
+def check_new_posts(publisher: Optional[RabbitMQPublisher] = None, shard: Optional[ShardConfig] = None):
     """
     메인 비즈니스 로직: 모든 사용자-플랫폼에 대해 새 글 확인
 
     작업 흐름:
-    1. DB에서 모든 사용자-플랫폼 정보 조회
-    2. 각 플랫폼별 RSS 수집
-    3. 마지막 업로드 시각과 비교하여 새 글 필터링
-    4. 새 글이 있으면 로그 출력 # RabbitMQ 발행 구현 해야함
-    5. last_upload 업데이트
+    1. DB에서 사용자-플랫폼 정보를 서버 사이드 커서로 스트리밍 (첫 청크부터 바로 수집 시작)
+       - 같은 (플랫폼, 계정)을 등록한 행끼리 묶어 피드당 한 번만 수집
+       - FEED_SCHEDULE의 다음 수집 시각이 지난 피드만 수집 (적응형 수집 주기)
+    2. 공유 FeedClient로 플랫폼별 RSS를 동시에 수집 (RSS_FETCH_CONCURRENCY 개까지)
+       - 호스트별 keep-alive 연결 재사용, gzip/brotli 압축 전송, RSS_FETCH_MAX_BYTES 응답 크기 제한
+       - FEED_CACHE의 ETag / Last-Modified로 조건부 요청, 304면 파싱 생략
+       - 200이어도 본문 해시가 FEED_FINGERPRINT와 같으면 파싱 생략
+    3. 사용자-플랫폼별로 발행한 글 링크 집합(FEED_SEEN)과 마지막 업로드 시각으로 새 글 필터링
+    4. 새 글이 있으면 RabbitMQ 발행 (실행 전체에서 하나의 연결 재사용)
+    5. 브로커 확인 후 last_upload와 링크 집합 업데이트 (청크 단위 일괄 반영)
+       - 반영이 끝난 청크마다 피드 상태와 처리 결과를 체크포인트로 저장
+    6. refresh 큐에 새 글 전체 개수 발행 (샤드 모드면 마지막으로 끝난 샤드가 합산해서 한 번만)
+
+    실행이 중간에 죽으면 다음 실행이 체크포인트를 이어받아 처리하지 못한 피드부터 수집하고,
+    죽은 실행이 발행한 새 글 수도 refresh 개수에 합산한다. OBSERVER_CHECK_BUDGET_SECONDS가 지나면
+    새 피드 수집을 멈추고 남은 피드 수를 기록한 뒤 처리한 만큼만 refresh로 보고한다.
+
+    Args:
+        publisher: 재사용할 RabbitMQPublisher (없으면 이번 호출 동안만 생성)
+        shard: 샤드 설정 (없으면 전체 피드 처리)
+
+    Returns:
+        CheckSummary
     """
     logger.info("=== Starting new posts check ===")
 
-    # 모든 사용자-플랫폼 정보 조회
-    user_platforms = platform_service.get_all_user_platforms()
+    shard = shard or ShardConfig()
+    deadline = time.monotonic() + CHECK_BUDGET_SECONDS if CHECK_BUDGET_SECONDS > 0 else None
 
-    if not user_platforms:
-        logger.info("No user platforms found")
-        return
+    with _publisher_scope(publisher) as publisher:
+        state = FeedState()
+        state.load()
+        checkpoint = RunCheckpoint(shard)
+        checkpoint.start(state.schedule.run_started_at)
+        # 목록을 읽다 실패하면 일부만 처리한 실행이 끝난 것으로 보고 체크포인트를 지우지 않도록 예외를 던짐
+        # (중단된 실행처럼 체크포인트가 남아 다음 실행이 처리하지 못한 피드와 새 글 수를 이어받음)
+        summary = asyncio.run(run_check(
+            publisher, shard, checkpoint.order(lambda: platform_service.iter_user_platforms(raise_errors=True)), state,
+            checkpoint=checkpoint, deadline=deadline
+        ))
 
-    total_new_posts = 0
+        # 중단된 이전 실행이 발행한 새 글도 이번 refresh 개수에 포함
+        total_new_posts = summary.new_posts + checkpoint.carried_new_posts
 
-    # 각 사용자-플랫폼에 대해 처리
-    for up in user_platforms:
-        logger.info(f"Checking {up.platform_name} for user {up.user_id} (account: {up.account_id})")
+        if summary.rows == 0:
+            logger.info("No user platforms found")
+            if shard.enabled:
+                # 다른 샤드가 기다리지 않도록 기록
+                shard_service.finish_shard(shard, total_new_posts, lambda count: publish_refresh(publisher, count))
+            checkpoint.complete()
+            return summary
 
-        # RSS 수집
-        articles = rss_service.fetch_rss(up.platform_name, up.account_id)
+        state.evict()
 
-        if not articles:
-            logger.info(f"No articles found for {up.platform_name}/{up.account_id}")
-            continue
+        logger.info(f"=== Finished check: {total_new_posts} new posts found ===")
 
-        # 새 글 필터링
-        new_articles = []
-        latest_published_at = None
+        if shard.enabled:
+            shard_service.finish_shard(shard, total_new_posts, lambda count: publish_refresh(publisher, count))
+        else:
+            publish_refresh(publisher, total_new_posts)
 
-        for article in articles:
-            # last_upload가 None이면 모든 글이 새 글
-            if up.last_upload is None or article.published_at > up.last_upload:
-                new_articles.append(article)
+        # refresh로 보고한 뒤에 체크포인트 정리 (그 전에 죽으면 다음 실행이 새 글 수를 다시 합산)
+        checkpoint.complete(summary.deferred)
 
-                # 가장 최신 발행 시각 추적
-                if latest_published_at is None or article.published_at > latest_published_at:
-                    latest_published_at = article.published_at
+    return summary
 
-        if not new_articles:
-            logger.info(f"No new posts for {up.platform_name}/{up.account_id}")
-            continue
+async def run_check(
+    publisher: RabbitMQPublisher,
+    shard: ShardConfig,
+    user_platforms: Iterable,
+    state: FeedState,
+    client: Optional[FeedClient] = None,
+    checkpoint: Optional[RunCheckpoint] = None,
+    deadline: Optional[float] = None,
+    parse_pool: Optional[ParsePool] = None,
+) -> CheckSummary:
+    """
+    사용자-플랫폼 목록 한 번 처리 (수집 → 새 글 발행 → last_upload 반영 → 피드 상태 저장)
 
-        logger.info(f"Found {len(new_articles)} new posts for {up.platform_name}/{up.account_id}")
+    Args:
+        publisher: RabbitMQ 발행기
+        shard: 샤드 설정 (이 샤드 몫의 피드만 처리)
+        user_platforms: 같은 (platform_name, account_id)의 행이 연속된 UserPlatformInfo
+        state: 피드 상태 (state.schedule.run_started_at 기준으로 수집 일정 판단)
+        client: 재사용할 FeedClient (없으면 이번 호출 동안만 생성)
+        checkpoint: 청크마다 피드 상태와 처리 결과를 저장할 체크포인트 (없으면 끝에 한 번만 저장)
+        deadline: time.monotonic() 기준 새 피드 수집을 멈출 시각 (남은 피드는 summary.deferred로 집계)
+        parse_pool: 본문 파싱을 넘길 워커 프로세스 풀 (없으면 OBSERVER_PARSE_WORKERS 설정에 따라 이번 호출 동안만 생성)
 
-        # 새 글 발견 시 로그 출력 및 RabbitMQ 발행
-        for article in new_articles:
-            logger.info(f"  - New post: {article.title} ({article.published_at})")
+    Returns:
+        CheckSummary
+    """
+    started = time.perf_counter()
+    with _parse_pool_scope(parse_pool) as parse_pool:
+        run = _CheckRun(publisher, shard, state, checkpoint, deadline, parse_pool)
+        try:
+            await _check_feeds(_select_feeds(run, user_platforms), run, client)
+            # 피드 처리가 끝난 뒤에 검증자/일정 저장 (체크포인트가 없으면 중간에 실패했을 때 다음 실행에서 다시 전체 수집)
+            await _flush_run(run, save_state=run.summary.rows > 0)
+            await run.drain()
+        finally:
+            # 실패했어도 writer 스레드가 발행기를 다 쓴 뒤에 돌려줌
+            run.writer.shutdown(wait=True)
+    elapsed = time.perf_counter() - started
 
-            # RabbitMQ 메시지 발행
-            publish_message(
-                queue_name="new_posts",
-                message={
-                    "user_id": str(up.user_id),
-                    "platform": up.platform_name,
-                    "article": article.model_dump(mode='json')
-                }
-            )
+    summary = run.summary
+    metrics.RUN_USER_PLATFORMS.labels(kind="rows").set(summary.rows)
+    metrics.RUN_USER_PLATFORMS.labels(kind="feeds").set(summary.feeds)
+    metrics.RUN_USER_PLATFORMS.labels(kind="not_due").set(summary.not_due)
+    metrics.RUN_USER_PLATFORMS.labels(kind="circuit_skipped").set(len(summary.circuit_skipped))
+    metrics.RUN_USER_PLATFORMS.labels(kind="deferred").set(summary.deferred)
+    if summary.rows == 0:
+        return summary
 
-            total_new_posts += 1
+    logger.info(
+        f"Checked {summary.feeds} feeds for {summary.rows} user-platforms in {elapsed:.2f}s "
+        f"(serial baseline {summary.serial_seconds:.2f}s, concurrency={RSS_FETCH_CONCURRENCY}, "
+        f"not due {summary.not_due}, unchanged {summary.unchanged})"
+    )
+    if summary.circuit_skipped:
+        skipped = ", ".join(f"{platform}/{account}" for platform, account in summary.circuit_skipped[:20])
+        more = len(summary.circuit_skipped) - 20
+        logger.warning(
+            f"Skipped {len(summary.circuit_skipped)} feeds with open circuits (retried next run): "
+            f"{skipped}{f' and {more} more' if more > 0 else ''}"
+        )
+    if summary.deferred:
+        logger.warning(f"Check budget exhausted: {summary.deferred} feeds deferred to the next run")
+    logger.info(f"Fetch transfer: {summary.fetch_stats}")
+    return summary
 
-        # last_upload 업데이트 (가장 최신 글의 발행 시각으로)
-        if latest_published_at:
-            platform_service.update_last_upload(
-                user_id=up.user_id,
-                platform_name=up.platform_name,
-                last_upload_time=latest_published_at
-            )
+def publish_new_posts(publisher, user_id: str, platform_name: str, articles: List[ArticleRecord], batch_size: int = NEW_POSTS_BATCH_SIZE):
+    """
+    사용자-플랫폼 하나의 새 글을 new_posts 큐에 발행
+
+    batch_size > 0 이면 NewPostsBatchMessageSchema 형식으로 batch_size개씩 묶어서,
+    0이면 NewPostMessageSchema 형식으로 글마다 하나씩 발행한다.
+    """
+    if batch_size <= 0:
+        for article in articles:
+            publisher.publish_body("new_posts", encode_new_post_message(user_id, platform_name, article))
+        return
 
-    logger.info(f"=== Finished check: {total_new_posts} new posts found ===")
+    for start in range(0, len(articles), batch_size):
+        publisher.publish_body(
+            "new_posts", encode_new_posts_batch_message(user_id, platform_name, articles[start:start + batch_size])
+        )
 
-    # refresh 큐에 새 글 전체 개수 발행
-    publish_message(
+def publish_refresh(publisher, total_new_posts: int):
+    """refresh 큐에 새 글 전체 개수 발행 (ai_server가 처리할 글 수에 더함)"""
+    publisher.publish(
         queue_name="refresh",
         message={
             "type": "init",
             "count": total_new_posts
         }
     )
+    publisher.flush()
     logger.info(f"Published refresh message: count={total_new_posts}")
 
-def check_inactive_users():
+def _select_feeds(run: _CheckRun, user_platforms: Iterable) -> Iterator[List]:
+    """
+    이 샤드 몫 중 이번 실행에서 수집할 피드를 구독자 목록 단위로 스트리밍
+
+    user_platforms가 (platform_name, account_id) 순으로 정렬되어 있어
+    연속된 행만 묶으면 된다.
+    """
+    rows = (
+        up for up in user_platforms
+        if run.shard.owns(up.platform_name, up.account_id)
+    )
+    for _, group in groupby(rows, key=lambda up: (up.platform_name, up.account_id)):
+        subscribers = list(group)
+        run.summary.rows += len(subscribers)
+        if not run.is_due(subscribers):
+            run.summary.not_due += len(subscribers)
+            continue
+        yield subscribers
+
+async def _check_feeds(feeds: Iterable[List], run: _CheckRun, client: Optional[FeedClient] = None):
+    """
+    피드를 받는 대로 수집 태스크를 띄우고, 수집이 끝나는 순서대로 구독자별 후처리 수행
+
+    떠 있는 태스크는 MAX_INFLIGHT_FEEDS 개로 제한해 전체 행을 메모리에 올리지 않는다.
+    """
+    if client is None:
+        async with create_feed_client() as client:
+            return await _check_feeds(feeds, run, client)
+
+    semaphore = asyncio.Semaphore(RSS_FETCH_CONCURRENCY)
+    summary = run.summary
+    inflight = set()
+
+    async def handle(done):
+        for task in done:
+            subscribers, articles, fetch_seconds, validator, since = task.result()
+            summary.serial_seconds += fetch_seconds
+            first = subscribers[0]
+            # 수집에 실패했거나 서킷이 열려 건너뛴 피드는 일정을 미루지 않고 다음 실행에서 다시 수집
+            if validator.fetched:
+                run.schedule.record(first.platform_name, first.account_id, articles)
+                run.fingerprints.record(first.platform_name, first.account_id, validator.content_hash)
+                if validator.unchanged:
+                    summary.unchanged += 1
+                if run.websub is not None and not validator.not_modified:
+                    run.websub.advertised(first.platform_name, first.account_id, validator.hub_url, validator.topic_url)
+            elif validator.circuit_open:
+                summary.circuit_skipped.append((first.platform_name, first.account_id))
+            # 파싱한 글은 구독자마다 각자의 last_upload 기준으로 필터링 후 발행
+            new_posts = 0
+            for up in subscribers:
+                new_posts += _process_feed(up, articles, run.outbox, run.updates, run.seen_sets, since)
+            summary.new_posts += new_posts
+            if len(run.outbox) >= run.publisher.batch_size:
+                run.submit(_publish_messages, run.publisher, run.outbox.take())
+            if run.checkpoint is not None:
+                run.checkpoint.record(
+                    first.platform_name, first.account_id, checkpoint_service.feed_outcome(validator, new_posts), new_posts
+                )
+            pending = max(len(run.updates), len(run.seen_sets), len(run.checkpoint) if run.checkpoint is not None else 0)
+            if pending >= run.updates.chunk_size:
+                await _flush_run(run, save_state=run.checkpoint is not None)
+
+    # 재사용하는 클라이언트는 이번 실행분 통계만 남도록 초기화
+    client.stats = FetchStats()
+    for subscribers in feeds:
+        if run.deadline is not None and time.monotonic() >= run.deadline:
+            # 남은 피드는 수집하지 않고 개수만 센다 (체크포인트가 있으면 다음 실행이 이 피드들부터 처리)
+            if not summary.deferred:
+                logger.warning("Check budget exhausted: finishing in-flight feeds and deferring the rest")
+                if run.checkpoint is not None:
+                    run.checkpoint.budget_exhausted = True
+            summary.deferred += 1
+            continue
+        if len(inflight) >= MAX_INFLIGHT_FEEDS:
+            done, inflight = await asyncio.wait(inflight, return_when=asyncio.FIRST_COMPLETED)
+            await handle(done)
+        inflight.add(asyncio.create_task(_fetch_feed(subscribers, client, semaphore, run)))
+        summary.feeds += 1
+
+    while inflight:
+        done, inflight = await asyncio.wait(inflight, return_when=asyncio.FIRST_COMPLETED)
+        await handle(done)
+
+    summary.fetch_stats = client.stats
+    metrics.observe_fetch_stats(client.stats)
+
+async def _fetch_feed(subscribers, client, semaphore, run: _CheckRun):
+    """세마포어로 동시 요청 수를 제한하며 피드 하나를 구독자 수와 무관하게 한 번 수집"""
+    first = subscribers[0]
+    validator = run.validators.get_shared(subscribers)
+    # 본문이 같아도 신규 구독자는 아직 처리한 적 없으므로 해시 비교 없이 파싱
+    if None not in (up.last_upload for up in subscribers):
+        validator.content_hash = run.fingerprints.get(first.platform_name, first.account_id)
+    since = _parse_since(subscribers)
+    async with semaphore:
+        logger.info(f"Checking {first.platform_name} (account: {first.account_id}) for {len(subscribers)} user(s)")
+        started = time.perf_counter()
+        articles = await rss_service.fetch_rss_async(
+            first.platform_name, first.account_id, client, validator, since, run.parse_pool
+        )
+        fetch_seconds = time.perf_counter() - started
+    run.validators.apply_shared(subscribers, validator)
+    return subscribers, articles, fetch_seconds, validator, since
+
+def _parse_since(subscribers) -> Optional[datetime]:
+    """
+    피드에서 정규화할 범위 (이 시각 이후 발행 글, None이면 전체)
+
+    구독자 중 가장 오래된 last_upload 이후 글만 정규화하되 (신규 구독자가 있으면 전체),
+    발행 시각이 last_upload 이전으로 찍힌 글도 링크 집합으로 판정하도록 SEEN_LOOKBACK만큼 더 파싱한다.
+    """
+    last_uploads = [up.last_upload for up in subscribers]
+    watermark = None if None in last_uploads else min(last_uploads)
+    return watermark - SEEN_LOOKBACK if SEEN_SET_ENABLED and watermark is not None else watermark
+
+def process_pushed_feed(publisher: RabbitMQPublisher, subscribers: List, content: bytes, topic_url: str) -> int:
+    """
+    WebSub 허브가 보낸 피드 문서를 폴링과 같은 경로로 처리 (정규화 → 새 글 판정/발행 → last_upload 반영)
+
+    검증자/본문 해시/수집 일정은 폴링 결과만 기록하므로 건드리지 않는다.
+
+    Args:
+        publisher: RabbitMQ 발행기
+        subscribers: 같은 피드를 구독하는 UserPlatformInfo 목록
+        content: 배포 요청 본문 (새로 바뀐 엔트리만 담은 피드 문서)
+        topic_url: 구독 토픽 URL
+
+    Returns:
+        발행한 새 글 수
+    """
+    first = subscribers[0]
+    since = _parse_since(subscribers)
+    articles = rss_service.parse_feed_content(first.platform_name, content, topic_url, since)
+    logger.info(f"Received {len(articles)} pushed articles for {first.platform_name}/{first.account_id}")
+
+    updates = platform_service.LastUploadBatch()
+    seen_sets = seen_service.SeenSetBatch()
+    new_posts = 0
+    for up in subscribers:
+        new_posts += _process_feed(up, articles, publisher, updates, seen_sets, since)
+    _flush_last_uploads(publisher, updates, seen_sets)
+    return new_posts
+
+async def _flush_run(run: _CheckRun, save_state: bool):
+    """
+    청크 반영을 writer 스레드에 넘김 (발행 flush → last_upload / 링크 집합 → save_state면 피드 상태와 처리 결과)
+
+    브로커 확인과 DB 쓰기를 수집 루프에서 하면 그동안 떠 있는 수집이 모두 멈추므로, 반영할 값만 루프에서 꺼내고
+    쓰기는 writer 스레드가 순서대로 한다. 앞선 반영이 끝난 뒤에(실패하면 예외) 다음 청크를 꺼낸다.
+    처리 결과는 발행과 last_upload가 반영된 뒤에 저장해야 중단된 실행을 이어받을 때 글이 유실되지 않는다.
+    """
+    await run.drain()
+    messages = run.outbox.take()
+    updates, run.updates = run.updates, platform_service.LastUploadBatch()
+    seen_sets, run.seen_sets = run.seen_sets, seen_service.SeenSetBatch()
+    state = run.state.take() if save_state else None
+    checkpoint = run.checkpoint.take() if save_state and run.checkpoint is not None else None
+    run.submit(_write_chunk, run, messages, updates, seen_sets, state, checkpoint)
+
+def _write_chunk(run: _CheckRun, messages, updates, seen_sets, state: Optional[list], checkpoint):
+    """writer 스레드에서 청크 하나 반영"""
+    _publish_messages(run.publisher, messages)
+    _flush_last_uploads(run.publisher, updates, seen_sets)
+    if state is not None:
+        run.state.write(state)
+    if checkpoint is not None:
+        run.checkpoint.write(checkpoint)
+
+def _publish_messages(publisher: RabbitMQPublisher, messages: List[Tuple[str, str]]):
+    for queue_name, body in messages:
+        publisher.publish_body(queue_name, body)
+
+def _flush_last_uploads(publisher, updates, seen_sets):
+    """
+    발행 대기 메시지를 먼저 flush한 뒤 last_upload와 발행 링크 집합 일괄 반영
+    (브로커 확인 전에 last_upload가 올라가거나 링크가 기록되면 글이 유실될 수 있음)
+
+    링크 집합 저장에 실패하면 last_upload도 올리지 않아 두 값이 같은 실행 시점을 가리키게 한다.
+    (last_upload만 올라가면 그 이전 발행 글을 이번 발행분이 빠진 집합으로 판정하게 됨.
+    둘 다 그대로면 이번 글이 다음 실행에서 다시 발행되고 ai_server가 링크로 거른다)
+    """
+    publisher.flush()
+    if len(seen_sets) and not seen_sets.flush():
+        result = updates.discard()
+    else:
+        result = updates.flush()
+    if result.missing:
+        logger.warning(f"last_upload target not found: {result.missing}")
+    if result.failed:
+        # 반영 실패한 사용자-플랫폼은 다음 실행에서 같은 글이 다시 발행될 수 있음
+        logger.error(f"Failed to update last_upload: {result.failed}")
+    return result
+
+def _process_feed(up, articles, publisher, updates, seen_sets, since: Optional[datetime] = None) -> int:
+    """
+    피드 하나의 새 글 필터링, RabbitMQ 발행, last_upload / 발행 링크 집합 업데이트 예약
+
+    Args:
+        since: 이번에 파싱한 범위 (이 시각 이후 발행 글, None이면 피드 전체)
+
+    Returns:
+        발행한 새 글 수
+    """
+    if not articles:
+        logger.info(f"No articles found for {up.platform_name}/{up.account_id}")
+        return 0
+
+    # 링크 집합이 없으면 이번에는 발행 시각으로만 판정하고, 파싱한 범위의 글을 모두 발행한 것으로 기록
+    # (horizon 이후 글은 이 집합으로 판정하므로 기존 규칙으로 이미 처리한 글도 넣어 둬야 함)
+    seen = up.seen
+    bootstrap = SEEN_SET_ENABLED and seen is None
+    if bootstrap:
+        seen = SeenSet(horizon=since)
+
+    # 새 글 필터링
+    new_articles = []
+    latest_published_at = None
+    keys = []
+
+    for article in articles:
+        key = link_key(article.link) if seen is not None else None
+        new = _is_new_article(up, article, key)
+        # 집합에는 이번에 발행하는 글만 넣음 (발행하지 않은 글이 Bloom 필터를 채우지 않도록)
+        if bootstrap or new:
+            keys.append(key)
+        if new:
+            new_articles.append(article)
+
+            # 가장 최신 발행 시각 추적
+            if latest_published_at is None or article.published_at > latest_published_at:
+                latest_published_at = article.published_at
+
+    if seen is not None and keys:
+        seen.add(keys)
+        up.seen = seen
+        seen_sets.add(up.user_id, up.platform_name, up.account_id, seen)
+
+    if not new_articles:
+        logger.info(f"No new posts for {up.platform_name}/{up.account_id}")
+        return 0
+
+    logger.info(f"Found {len(new_articles)} new posts for {up.platform_name}/{up.account_id}")
+    metrics.NEW_POSTS.labels(platform=up.platform_name).inc(len(new_articles))
+
+    # 새 글 발견 시 로그 출력
+    for article in new_articles:
+        logger.info(f"  - New post: {article.title} ({article.published_at})")
+
+    # RabbitMQ 메시지 발행 (글 JSON은 구독자끼리 재사용)
+    publish_new_posts(publisher, str(up.user_id), up.platform_name, new_articles)
+
+    # last_upload 업데이트 예약 (가장 최신 글의 발행 시각으로, 소급 발행 글로 되돌아가지 않도록)
+    if latest_published_at and (up.last_upload is None or latest_published_at > up.last_upload):
+        updates.add(
+            user_id=up.user_id,
+            platform_name=up.platform_name,
+            last_upload_time=latest_published_at
+        )
+        # daemon은 같은 행을 다음 tick에도 쓰므로 메모리 값도 갱신
+        up.last_upload = latest_published_at
+
+    return len(new_articles)
+
+def _is_new_article(up, article, key: Optional[bytes]) -> bool:
+    """
+    사용자-플랫폼에 아직 발행하지 않은 글인지 판정
+
+    - 링크 집합이 없으면 last_upload 이후 발행 글 (last_upload가 None이면 모든 글)
+    - 최근 발행 링크에 있으면 발행 시각과 무관하게 이미 발행한 글 (수정/재발행, 같은 초 발행)
+    - last_upload 이전 발행 시각이면 링크 집합을 만든 뒤 처음 본 글만 (Bloom 필터에 없는 글)
+    """
+    newer = up.last_upload is None or article.published_at > up.last_upload
+    seen = up.seen
+    if seen is None:
+        return newer
+    if key in seen:
+        if newer:
+            metrics.SEEN_ARTICLES.labels(platform=up.platform_name, kind="duplicate").inc()
+        return False
+    if newer:
+        return True
+    # Bloom 거짓 양성이면 기존 규칙처럼 놓칠 뿐 새 발행 시각의 글에는 영향 없음
+    if (seen.horizon is None or article.published_at > seen.horizon) and not seen.might_contain(key):
+        metrics.SEEN_ARTICLES.labels(platform=up.platform_name, kind="backdated").inc()
+        return True
+    return False
+
+def check_inactive_users(publisher: Optional[RabbitMQPublisher] = None, shard: Optional[ShardConfig] = None):
     """
     1달 이상 글을 올리지 않은 사용자 조회 및 독촉 메일 발행
 
     작업 흐름:
-    1. DB에서 1달 이상 미업로드 사용자 조회
-    2. 각 사용자에 대해 Mail 서버로 RabbitMQ 메시지 발행
-    3. last_upload를 오늘 날짜로 업데이트 (스팸 방지)
+    1. DB에서 1달 이상 미업로드 사용자를 키셋 페이지 단위로 조회 (미업로드 일수는 SQL에서 계산)
+    2. 페이지의 각 사용자에 대해 Mail 서버로 RabbitMQ 메시지 발행 (실행 전체에서 하나의 채널)
+    3. 브로커 수신 확인 후 페이지의 last_upload를 UPDATE 한 번으로 현재 시각으로 갱신 (스팸 방지)
+
+    Args:
+        publisher: 재사용할 RabbitMQPublisher (없으면 이번 호출 동안만 생성)
+        shard: 샤드 설정 (샤드마다 user_id 구간으로 나눈 자기 몫만 처리)
+
+    Returns:
+        발행한 독촉 메일 수
     """
     logger.info("=== Starting inactive users check ===")
 
-    # 1달 이상 안 쓴 사용자 조회
-    inactive_users = platform_service.get_inactive_users(days=30)
+    shard = shard or ShardConfig()
+    reminded_at = datetime.now()
+    total_reminders = 0
+
+    with _publisher_scope(publisher) as publisher:
+        for inactive_users in platform_service.iter_inactive_user_pages(days=INACTIVE_DAYS, now=reminded_at, shard=shard):
+            total_reminders += _send_reminders(inactive_users, publisher)
+
+            # 브로커 확인 전에 last_upload가 올라가면 독촉 메일이 유실될 수 있음
+            publisher.flush()
+            updated = platform_service.mark_reminded(inactive_users, reminded_at, days=INACTIVE_DAYS)
+            if updated < len(inactive_users):
+                # 조회 이후 새 글이 반영된 행이거나 갱신 실패 (실패한 행은 다음 실행에서 다시 발송될 수 있음)
+                logger.warning(f"last_upload bumped for {updated}/{len(inactive_users)} reminded users")
 
-    if not inactive_users:
+    if not total_reminders:
         logger.info("No inactive users found")
-        return
+        return 0
 
-    total_reminders = 0
+    logger.info(f"=== Finished inactive check: {total_reminders} reminders sent ===")
+    return total_reminders
 
+def _send_reminders(inactive_users, publisher) -> int:
+    """미업로드 사용자별 독촉 메일 발행"""
     # 각 미업로드 사용자에 대해 처리
     for user in inactive_users:
         logger.info(f"Inactive user: {user.name} ({user.email}) - {user.days_inactive} days since last upload")
 
         # Mail 서버로 RabbitMQ 메시지 발행
-        publish_message(
+        publisher.publish(
             queue_name="mail_reminders",
             message={
                 "user_id": str(user.user_id),
@@ -130,13 +716,4 @@ def check_inactive_users():
             }
         )
 
-        # last_upload를 오늘 날짜로 업데이트 (스팸 방지)
-        platform_service.update_last_upload(
-            user_id=user.user_id,
-            platform_name=user.platform_name,
-            last_upload_time=datetime.now()
-        )
-
-        total_reminders += 1
-
-    logger.info(f"=== Finished inactive check: {total_reminders} reminders sent ===")
+    return len(inactive_users)
@@ -1,36 +1,49 @@
-from typing import List
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import update, values, column, select, bindparam, tuple_, and_, func, cast, literal, String, DateTime, Integer
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
-from app.models.db_models import UserPlatform, Platform, User
+from app.models.db_models import UserPlatform, Platform, User, FeedSeen
+from app.services.seen_service import SeenSet, SEEN_SET_ENABLED
+from app.services.shard_service import ShardConfig
 from app.dependencies.database import SessionLocal
+from app.dependencies import metrics
 import logging
 
 logger = logging.getLogger(__name__)
 
 class UserPlatformInfo:
-    """사용자-플랫폼 정보 DTO"""
-    def __init__(self, user_id, platform_name, account_id, last_upload):
+    """사용자-플랫폼 정보 DTO (행 수만큼 만들어지므로 __slots__로 인스턴스 dict 제거)"""
+    __slots__ = ("user_id", "platform_name", "account_id", "last_upload", "seen")
+
+    def __init__(self, user_id, platform_name, account_id, last_upload, seen: Optional[SeenSet] = None):
         self.user_id = user_id
         self.platform_name = platform_name
         self.account_id = account_id
         self.last_upload = last_upload
+        self.seen = seen  # 발행한 글 링크 집합 (FEED_SEEN, 아직 없으면 None)
 
     def __repr__(self):
         return f"UserPlatformInfo(user_id={self.user_id}, platform={self.platform_name}, account_id={self.account_id})"
 
 class InactiveUserInfo:
     """미업로드 사용자 정보 DTO"""
-    def __init__(self, user_id, email, name, platform_name, last_upload, days_inactive):
+    __slots__ = ("user_id", "email", "name", "platform_name", "account_id", "last_upload", "days_inactive", "platform_id")
+
+    def __init__(self, user_id, email, name, platform_name, last_upload, days_inactive, account_id=None, platform_id=None):
         self.user_id = user_id
+        self.platform_id = platform_id
         self.email = email
         self.name = name
         self.platform_name = platform_name
+        self.account_id = account_id
         self.last_upload = last_upload
         self.days_inactive = days_inactive
 
     def __repr__(self):
         return f"InactiveUserInfo(user_id={self.user_id}, email={self.email}, days_inactive={self.days_inactive})"
 
+@metrics.DB_OPERATION_SECONDS.labels(operation="get_all_user_platforms").time()
 def get_all_user_platforms() -> List[UserPlatformInfo]:
     """
     DB에서 모든 사용자-플랫폼 정보 조회
@@ -60,6 +73,7 @@ def get_all_user_platforms() -> List[UserPlatformInfo]:
             for row in results
         ]
 
+        metrics.DB_ROWS.labels(operation="get_all_user_platforms", result="read").inc(len(user_platforms))
         logger.info(f"Found {len(user_platforms)} user-platform mappings")
         return user_platforms
 
@@ -69,56 +83,253 @@ def get_all_user_platforms() -> List[UserPlatformInfo]:
     finally:
         db.close()
 
-def get_inactive_users(days: int = 30) -> List[InactiveUserInfo]:
+# 서버 사이드 커서로 한 번에 가져올 USER_PLATFORM 행 수
+USER_PLATFORM_STREAM_CHUNK = int(os.getenv("USER_PLATFORM_STREAM_CHUNK", "1000"))
+
+def iter_user_platforms(
+    chunk_size: int = USER_PLATFORM_STREAM_CHUNK,
+    unprocessed_only: bool = False,
+    raise_errors: bool = False,
+) -> Iterator[UserPlatformInfo]:
     """
-    1달 이상 글을 올리지 않은 사용자 조회
+    모든 사용자-플랫폼 정보를 서버 사이드 커서로 chunk_size 개씩 스트리밍
+
+    get_all_user_platforms와 달리 전체 결과를 리스트로 만들지 않으므로
+    메모리 사용량이 사용자 수와 무관하고, 첫 청크를 받는 즉시 수집을 시작할 수 있다.
+    (platform_name, account_id) 순으로 정렬되어 같은 피드의 구독자는 연속으로 나온다.
+    FEED_SEEN을 함께 LEFT JOIN해서 행마다 발행한 글 링크 집합을 싣는다. (계정이 바뀌었으면 None)
 
     Args:
-        days: 기준 일수 (기본값: 30일)
+        chunk_size: 한 번에 가져올 행 수 (yield_per)
+        unprocessed_only: last_upload가 없는 (새로 등록되어 아직 처리하지 않은) 행만 조회
+        raise_errors: 조회 실패를 로그만 남기지 않고 다시 던짐 (check_new_posts와 daemon이 일부만 읽은 목록을 다 읽은 것으로 쓰지 않도록)
 
-    Returns:
-        List[InactiveUserInfo]: 미업로드 사용자 정보 리스트
+    Yields:
+        UserPlatformInfo
     """
     db = SessionLocal()
+    count = 0
     try:
-        cutoff_date = datetime.now() - timedelta(days=days)
-
-        # USER_PLATFORM, PLATFORM, USER 3-way JOIN
-        results = db.query(
+        # USER_PLATFORM과 PLATFORM JOIN
+        columns = [
             UserPlatform.user_id,
-            User.email,
-            User.name,
             Platform.name.label('platform_name'),
+            UserPlatform.account_id,
             UserPlatform.last_upload
-        ).join(
+        ]
+        if SEEN_SET_ENABLED:
+            columns += [FeedSeen.recent_keys, FeedSeen.bloom, FeedSeen.bloom_hashes, FeedSeen.horizon]
+        query = db.query(*columns).join(
             Platform, UserPlatform.platform_id == Platform.platform_id
-        ).join(
-            User, UserPlatform.user_id == User.user_id
-        ).filter(
-            UserPlatform.last_upload < cutoff_date
-        ).all()
+        )
+        if SEEN_SET_ENABLED:
+            query = query.outerjoin(FeedSeen, and_(
+                FeedSeen.user_id == UserPlatform.user_id,
+                FeedSeen.platform_name == Platform.name,
+                FeedSeen.account_id == UserPlatform.account_id,
+            ))
+        if unprocessed_only:
+            query = query.filter(UserPlatform.last_upload.is_(None))
+        query = query.order_by(
+            # 같은 피드(플랫폼, 계정)를 등록한 행이 연속으로 나오도록 정렬
+            Platform.name, UserPlatform.account_id
+        ).execution_options(
+            stream_results=True,
+            yield_per=chunk_size
+        )
+
+        for row in query:
+            count += 1
+            seen = None
+            if SEEN_SET_ENABLED and row.recent_keys is not None:
+                seen = SeenSet.from_row(row.recent_keys, row.bloom, row.bloom_hashes, row.horizon)
+            yield UserPlatformInfo(
+                user_id=row.user_id,
+                platform_name=row.platform_name,
+                account_id=row.account_id,
+                last_upload=row.last_upload,
+                seen=seen
+            )
+
+        logger.info(f"Streamed {count} user-platform mappings")
+
+    except Exception as e:
+        logger.error(f"Failed to stream user platforms (after {count} rows): {e}")
+        if raise_errors:
+            raise
+    finally:
+        # 스트리밍은 소비 속도에 묶여 있어 시간 대신 읽은 행 수만 기록
+        metrics.DB_ROWS.labels(operation="iter_user_platforms", result="read").inc(count)
+        db.close()
 
-        inactive_users = [
+# 미업로드 사용자 조회 시 한 페이지에 담을 행 수
+INACTIVE_SWEEP_PAGE_SIZE = int(os.getenv("INACTIVE_SWEEP_PAGE_SIZE", "1000"))
+
+@metrics.DB_OPERATION_SECONDS.labels(operation="get_inactive_users").time()
+def get_inactive_users(days: int = 30) -> List[InactiveUserInfo]:
+    """
+    1달 이상 글을 올리지 않은 사용자 조회
+
+    Args:
+        days: 기준 일수 (기본값: 30일)
+
+    Returns:
+        List[InactiveUserInfo]: 미업로드 사용자 정보 리스트
+    """
+    return [user for page in iter_inactive_user_pages(days) for user in page]
+
+def iter_inactive_user_pages(
+    days: int = 30,
+    page_size: int = INACTIVE_SWEEP_PAGE_SIZE,
+    now: Optional[datetime] = None,
+    shard: Optional[ShardConfig] = None,
+) -> Iterator[List[InactiveUserInfo]]:
+    """
+    미업로드 사용자를 (user_id, platform_id) 키셋 페이지 단위로 조회
+
+    페이지마다 직전 페이지의 마지막 키 이후 행만 읽는 짧은 쿼리를 새로 실행하므로
+    페이지 사이에 last_upload를 갱신해도 건너뛰거나 중복되는 행이 없다.
+    미업로드 일수와 샤드 구간은 SQL에서 계산한다.
+
+    Args:
+        days: 기준 일수 (기본값: 30일)
+        page_size: 페이지당 행 수
+        now: 기준 시각 (기본값: 현재 시각)
+        shard: 샤드 설정 (이 샤드의 user_id 구간만 조회, 없으면 전체)
+
+    Yields:
+        List[InactiveUserInfo]: 한 페이지의 미업로드 사용자
+
+    Raises:
+        조회 실패 시 예외를 그대로 던진다 (남은 사용자를 독촉하지 못한 실행이 성공으로 끝나지 않도록)
+    """
+    now = now or datetime.now()
+    cutoff_date = now - timedelta(days=days)
+    lower, upper = (shard or ShardConfig()).user_id_range()
+    last_key = None
+    total = 0
+
+    while True:
+        db = SessionLocal()
+        try:
+            days_inactive = _days_since(db, UserPlatform.last_upload, now)
+
+            # USER_PLATFORM, PLATFORM, USER 3-way JOIN
+            query = db.query(
+                UserPlatform.user_id,
+                UserPlatform.platform_id,
+                User.email,
+                User.name,
+                Platform.name.label('platform_name'),
+                UserPlatform.account_id,
+                UserPlatform.last_upload,
+                days_inactive.label('days_inactive')
+            ).join(
+                Platform, UserPlatform.platform_id == Platform.platform_id
+            ).join(
+                User, UserPlatform.user_id == User.user_id
+            ).filter(
+                UserPlatform.last_upload < cutoff_date
+            )
+            if lower is not None or upper is not None:
+                query = query.filter(*_user_id_range(db, lower, upper))
+            if last_key is not None:
+                query = query.filter(tuple_(UserPlatform.user_id, UserPlatform.platform_id) > tuple_(*last_key))
+            results = query.order_by(UserPlatform.user_id, UserPlatform.platform_id).limit(page_size).all()
+        except Exception as e:
+            logger.error(f"Failed to fetch inactive users (after {total} rows): {e}")
+            raise
+        finally:
+            db.close()
+
+        if not results:
+            break
+
+        page = [
             InactiveUserInfo(
                 user_id=row.user_id,
                 email=row.email,
                 name=row.name,
                 platform_name=row.platform_name,
                 last_upload=row.last_upload,
-                days_inactive=(datetime.now() - row.last_upload).days if row.last_upload else None
+                days_inactive=row.days_inactive,
+                account_id=row.account_id,
+                platform_id=row.platform_id
             )
             for row in results
         ]
+        total += len(page)
+        metrics.DB_ROWS.labels(operation="get_inactive_users", result="read").inc(len(page))
+        yield page
+
+        if len(results) < page_size:
+            break
+        last_key = (results[-1].user_id, results[-1].platform_id)
+
+    logger.info(f"Found {total} inactive users (>{days} days)")
+
+def _days_since(db: Session, column_expr, now: datetime):
+    """now - column_expr 의 일수 (timedelta.days와 같이 내림)"""
+    if db.get_bind().dialect.name == "postgresql":
+        return cast(func.date_part("day", literal(now, DateTime) - column_expr), Integer)
+    # SQLite 등: 율리우스일 차이를 정수로 변환 (양수는 내림)
+    return cast(func.julianday(literal(now, DateTime)) - func.julianday(column_expr), Integer)
 
-        logger.info(f"Found {len(inactive_users)} inactive users (>{days} days)")
-        return inactive_users
+def _user_id_range(db: Session, lower, upper) -> list:
+    """user_id가 [lower, upper) 구간인 조건 (None인 경계는 제한 없음)"""
+    column, bound = UserPlatform.user_id, lambda value: value
+    if db.get_bind().dialect.name != "postgresql":
+        # SQLite 등: UUID를 hex 문자열로 저장하는데 컬럼이 NUMERIC affinity라 '8000...' 같은 경계값이
+        # 숫자로 바뀌어 비교되므로 문자열로 비교
+        column, bound = cast(UserPlatform.user_id, String), lambda value: value.hex
+    conditions = []
+    if lower is not None:
+        conditions.append(column >= bound(lower))
+    if upper is not None:
+        conditions.append(column < bound(upper))
+    return conditions
 
+@metrics.DB_OPERATION_SECONDS.labels(operation="mark_reminded").time()
+def mark_reminded(users: List[InactiveUserInfo], reminded_at: datetime, days: int = 30) -> int:
+    """
+    독촉 메일을 보낸 사용자-플랫폼의 last_upload를 한 번의 UPDATE로 갱신 (스팸 방지)
+
+    조회 이후 새 글이 반영되어 기준일보다 최근이 된 행은 덮어쓰지 않는다.
+
+    Args:
+        users: iter_inactive_user_pages가 반환한 한 페이지
+        reminded_at: 갱신할 시각
+        days: 조회 시 사용한 기준 일수
+
+    Returns:
+        갱신된 행 수
+    """
+    if not users:
+        return 0
+
+    keys = [(user.user_id, user.platform_id) for user in users]
+    db = SessionLocal()
+    try:
+        stmt = (
+            update(UserPlatform)
+            .where(tuple_(UserPlatform.user_id, UserPlatform.platform_id).in_(keys))
+            .where(UserPlatform.last_upload < reminded_at - timedelta(days=days))
+            .values(last_upload=reminded_at)
+            .execution_options(synchronize_session=False)
+        )
+        updated = db.execute(stmt).rowcount
+        db.commit()
+        metrics.DB_ROWS.labels(operation="mark_reminded", result="updated").inc(updated)
+        return updated
     except Exception as e:
-        logger.error(f"Failed to fetch inactive users: {e}")
-        return []
+        logger.error(f"Failed to update last_upload for {len(keys)} reminded users: {e}")
+        db.rollback()
+        metrics.DB_ROWS.labels(operation="mark_reminded", result="failed").inc(len(keys))
+        return 0
     finally:
         db.close()
 
+@metrics.DB_OPERATION_SECONDS.labels(operation="update_last_upload").time()
 def update_last_upload(user_id, platform_name: str, last_upload_time):
     """
     사용자-플랫폼의 last_upload 시각 업데이트
@@ -154,3 +365,129 @@ def update_last_upload(user_id, platform_name: str, last_upload_time):
         db.rollback()
     finally:
         db.close()
+
+# last_upload 일괄 업데이트 시 UPDATE 한 번에 담을 최대 행 수
+LAST_UPLOAD_BATCH_SIZE = int(os.getenv("LAST_UPLOAD_BATCH_SIZE", "500"))
+
+class LastUploadUpdateResult:
+    """last_upload 일괄 업데이트 결과"""
+    def __init__(self):
+        self.updated = 0
+        self.missing: List[Tuple] = []  # 매칭되는 USER_PLATFORM이 없는 (user_id, platform_name)
+        self.failed: List[Tuple] = []   # 청크 실행 자체가 실패한 (user_id, platform_name)
+
+    def merge(self, other: "LastUploadUpdateResult"):
+        self.updated += other.updated
+        self.missing.extend(other.missing)
+        self.failed.extend(other.failed)
+
+    def __repr__(self):
+        return f"LastUploadUpdateResult(updated={self.updated}, missing={len(self.missing)}, failed={len(self.failed)})"
+
+class LastUploadBatch:
+    """
+    실행 중 (user_id, platform, timestamp) 업데이트를 모았다가
+    청크마다 UPDATE ... FROM (VALUES ...) 한 번으로 반영
+
+    같은 사용자-플랫폼이 여러 번 추가되면 마지막 값만 반영한다.
+    청크 단위로 커밋하므로 한 청크가 실패해도 나머지 청크는 반영되고, 실패한 키는 결과에 담긴다.
+    """
+
+    def __init__(self, chunk_size: int = LAST_UPLOAD_BATCH_SIZE):
+        self.chunk_size = max(1, chunk_size)
+        self._pending: Dict[Tuple, datetime] = {}
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(self, user_id, platform_name: str, last_upload_time: datetime):
+        """
+        업데이트 예약
+
+        Args:
+            user_id: 사용자 ID
+            platform_name: 플랫폼 이름
+            last_upload_time: 마지막 업로드 시각
+        """
+        self._pending[(user_id, platform_name)] = last_upload_time
+
+    def discard(self) -> LastUploadUpdateResult:
+        """예약된 업데이트를 반영하지 않고 버림 (버린 키는 failed에 담긴다)"""
+        result = LastUploadUpdateResult()
+        result.failed = list(self._pending)
+        self._pending = {}
+        metrics.DB_ROWS.labels(operation="last_upload_batch_flush", result="failed").inc(len(result.failed))
+        return result
+
+    @metrics.DB_OPERATION_SECONDS.labels(operation="last_upload_batch_flush").time()
+    def flush(self) -> LastUploadUpdateResult:
+        """예약된 업데이트를 청크 단위로 반영"""
+        result = LastUploadUpdateResult()
+        if not self._pending:
+            return result
+
+        rows = [(user_id, platform_name, ts) for (user_id, platform_name), ts in self._pending.items()]
+        self._pending = {}
+
+        db = SessionLocal()
+        try:
+            for start in range(0, len(rows), self.chunk_size):
+                chunk = rows[start:start + self.chunk_size]
+                try:
+                    result.merge(_apply_last_upload_chunk(db, chunk))
+                    db.commit()
+                except Exception as e:
+                    logger.error(f"Failed to bulk update last_upload ({len(chunk)} rows): {e}")
+                    db.rollback()
+                    result.failed.extend((user_id, platform_name) for user_id, platform_name, _ in chunk)
+        finally:
+            db.close()
+
+        for name, rows in (("updated", result.updated), ("missing", len(result.missing)), ("failed", len(result.failed))):
+            metrics.DB_ROWS.labels(operation="last_upload_batch_flush", result=name).inc(rows)
+        logger.info(f"Bulk updated last_upload: {result}")
+        return result
+
+def _apply_last_upload_chunk(db: Session, chunk: List[Tuple]) -> LastUploadUpdateResult:
+    """청크 하나를 UPDATE로 반영하고 매칭되지 않은 키를 수집"""
+    result = LastUploadUpdateResult()
+    requested = {(user_id, platform_name) for user_id, platform_name, _ in chunk}
+
+    if db.get_bind().dialect.name == "postgresql":
+        # UPDATE "USER_PLATFORM" SET last_upload = v.last_upload
+        # FROM (VALUES ...) AS v(user_id, platform_name, last_upload), "PLATFORM"
+        # WHERE ... RETURNING user_id, name
+        v = values(
+            column("user_id", UserPlatform.user_id.type),
+            column("platform_name", String),
+            column("last_upload", DateTime),
+            name="v",
+        ).data(chunk)
+        stmt = (
+            update(UserPlatform)
+            .where(UserPlatform.user_id == v.c.user_id)
+            .where(UserPlatform.platform_id == Platform.platform_id)
+            .where(Platform.name == v.c.platform_name)
+            .values(last_upload=v.c.last_upload)
+            .returning(UserPlatform.user_id, Platform.name)
+        )
+        matched = {(row[0], row[1]) for row in db.execute(stmt)}
+    else:
+        # VALUES 별칭을 지원하지 않는 DB(SQLite 등)는 같은 트랜잭션 안에서 행별 UPDATE
+        stmt = (
+            update(UserPlatform)
+            .where(UserPlatform.user_id == bindparam("b_user_id"))
+            .where(UserPlatform.platform_id == select(Platform.platform_id).where(
+                Platform.name == bindparam("b_platform_name")
+            ).scalar_subquery())
+            .values(last_upload=bindparam("b_last_upload"))
+        )
+        matched = set()
+        for user_id, platform_name, ts in chunk:
+            res = db.execute(stmt, {"b_user_id": user_id, "b_platform_name": platform_name, "b_last_upload": ts})
+            if res.rowcount:
+                matched.add((user_id, platform_name))
+
+    result.updated = len(matched)
+    result.missing = list(requested - matched)
+    return result
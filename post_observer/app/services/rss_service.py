@@ -1,8 +1,11 @@
-from typing import List
-from app.models.schemas import ArticleSchema
+from typing import List, Optional
+from datetime import datetime
+import httpx
+from app.models.schemas import ArticleRecord, FeedValidatorSchema
 from app.parsers.naver import NaverRSSParser
 from app.parsers.tistory import TistoryRSSParser
 from app.parsers.velog import VelogRSSParser
+from app.parsers.parse_pool import ParsePool
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,7 +17,7 @@ PARSER_MAP = {
     "velog": VelogRSSParser(),
 }
 
-def fetch_rss(platform_name: str, account_id: str) -> List[ArticleSchema]:
+def fetch_rss(platform_name: str, account_id: str) -> List[ArticleRecord]:
     """
     플랫폼별 RSS 수집 및 파싱
 
@@ -23,7 +26,7 @@ def fetch_rss(platform_name: str, account_id: str) -> List[ArticleSchema]:
         account_id: 플랫폼별 사용자 식별자
 
     Returns:
-        List[ArticleSchema]: 파싱된 글 목록
+        List[ArticleRecord]: 파싱된 글 목록
     """
     parser = PARSER_MAP.get(platform_name)
 
@@ -37,3 +40,67 @@ def fetch_rss(platform_name: str, account_id: str) -> List[ArticleSchema]:
     except Exception as e:
         logger.error(f"Failed to fetch RSS for {platform_name}/{account_id}: {e}")
         return []
+
+async def fetch_rss_async(
+    platform_name: str,
+    account_id: str,
+    client: httpx.AsyncClient,
+    validator: Optional[FeedValidatorSchema] = None,
+    watermark: Optional[datetime] = None,
+    parse_pool: Optional[ParsePool] = None,
+) -> List[ArticleRecord]:
+    """
+    공유 비동기 클라이언트로 플랫폼별 RSS 수집 및 파싱
+
+    Args:
+        platform_name: 플랫폼 이름 (Naver, Tistory, Velog)
+        account_id: 플랫폼별 사용자 식별자
+        client: 모든 파서가 공유하는 클라이언트 (http_client.FeedClient 또는 httpx.AsyncClient)
+        validator: 조건부 요청 검증자 (304면 빈 리스트 반환)
+        watermark: 이 시각 이후 발행된 글만 정규화 (None이면 전체)
+        parse_pool: 본문 파싱을 넘길 워커 프로세스 풀 (None이면 수집 태스크에서 파싱)
+
+    Returns:
+        List[ArticleRecord]: 파싱된 글 목록
+    """
+    parser = PARSER_MAP.get(platform_name)
+
+    if not parser:
+        logger.error(f"Unknown platform: {platform_name}")
+        return []
+
+    try:
+        return await parser.parse_async(account_id, client, validator, watermark, parse_pool)
+    except Exception as e:
+        logger.error(f"Failed to fetch RSS for {platform_name}/{account_id}: {e}")
+        return []
+
+def parse_feed_content(
+    platform_name: str,
+    content: bytes,
+    feed_url: str,
+    watermark: Optional[datetime] = None,
+) -> List[ArticleRecord]:
+    """
+    이미 받은 피드 문서(WebSub 배포 본문)를 플랫폼 파서로 정규화
+
+    Args:
+        platform_name: 플랫폼 이름 (Naver, Tistory, Velog)
+        content: 피드 문서
+        feed_url: 로그용 피드(토픽) URL
+        watermark: 이 시각 이후 발행된 글만 정규화 (None이면 전체)
+
+    Returns:
+        List[ArticleRecord]: 파싱된 글 목록
+    """
+    parser = PARSER_MAP.get(platform_name)
+
+    if not parser:
+        logger.error(f"Unknown platform: {platform_name}")
+        return []
+
+    try:
+        return parser.parse_content(content, feed_url, watermark)
+    except Exception as e:
+        logger.error(f"Failed to parse pushed feed for {platform_name} ({feed_url}): {e}")
+        return []
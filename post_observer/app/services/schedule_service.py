@@ -0,0 +1,185 @@
+import os
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+from app.models.db_models import FeedSchedule
+from app.models.schemas import ArticleRecord
+from app.dependencies import keyed_store
+from app.dependencies.keyed_store import KeyedRowStore, KeyedRowBatch
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 적응형 수집 주기 사용 여부 (false면 매 실행마다 모든 피드 수집)
+ADAPTIVE_SCHEDULE_ENABLED = os.getenv("OBSERVER_ADAPTIVE_SCHEDULE", "true").lower() == "true"
+
+# 수집 간격 하한 / 상한(최대 지연 보장) (시간)
+# 실행 주기가 MAX_STALENESS보다 짧아야 피드를 건너뛴다 (하루 한 번 돌면 매 실행마다 모든 피드가 수집 대상)
+MIN_POLL_INTERVAL = timedelta(hours=float(os.getenv("OBSERVER_MIN_POLL_INTERVAL_HOURS", "1")))
+MAX_STALENESS = timedelta(hours=float(os.getenv("OBSERVER_MAX_STALENESS_HOURS", "24")))
+
+# 다음 수집 시각이 기준 시각보다 이만큼 늦어도 이번 실행에서 수집 (분)
+# 크론잡 시작 시각이 조금만 당겨져도 다음 수집 시각이 된 피드가 실행 주기 하나를 더 건너뛰지 않도록
+DUE_TOLERANCE = timedelta(minutes=float(os.getenv("OBSERVER_DUE_TOLERANCE_MINUTES", "30")))
+
+# 예상 게시 간격 대비 수집 간격 비율 (0.5면 평균 게시 간격의 절반마다 확인)
+POLL_INTERVAL_RATIO = float(os.getenv("OBSERVER_POLL_INTERVAL_RATIO", "0.5"))
+
+# 게시 간격 지수 이동 평균의 새 간격 가중치
+INTERVAL_EWMA_ALPHA = 0.3
+
+class FeedStats:
+    """피드 하나의 게시 주기 통계"""
+    __slots__ = ("mean_interval_seconds", "last_published_at", "last_checked_at", "next_due_at")
+
+    def __init__(self, mean_interval_seconds=None, last_published_at=None, last_checked_at=None, next_due_at=None):
+        self.mean_interval_seconds = mean_interval_seconds
+        self.last_published_at = last_published_at
+        self.last_checked_at = last_checked_at
+        self.next_due_at = next_due_at
+
+def estimate_interval(published: List[datetime]) -> Optional[float]:
+    """발행 시각 목록으로 평균 게시 간격(초) 추정"""
+    if len(published) < 2:
+        return None
+    published = sorted(published)
+    return (published[-1] - published[0]).total_seconds() / (len(published) - 1)
+
+def update_stats(stats: "FeedStats", published: List[datetime]):
+    """
+    새로 본 글의 발행 시각으로 게시 간격 통계 갱신
+
+    처음 보는 피드는 받은 글들의 평균 간격으로 시작하고, 이후에는 마지막으로 본 글부터
+    새 글까지의 간격들을 지수 이동 평균으로 반영한다. (파서가 watermark 이후 글만 주므로
+    피드 전체가 아니라 새 글만으로 계산할 수 있어야 함)
+    """
+    if stats.last_published_at is not None:
+        published = [ts for ts in published if ts > stats.last_published_at]
+    if not published:
+        return
+
+    published = sorted(published)
+    if stats.last_published_at is None:
+        stats.mean_interval_seconds = estimate_interval(published)
+    else:
+        previous = stats.last_published_at
+        for ts in published:
+            interval = (ts - previous).total_seconds()
+            if stats.mean_interval_seconds is None:
+                stats.mean_interval_seconds = interval
+            else:
+                stats.mean_interval_seconds = (
+                    INTERVAL_EWMA_ALPHA * interval + (1 - INTERVAL_EWMA_ALPHA) * stats.mean_interval_seconds
+                )
+            previous = ts
+    stats.last_published_at = published[-1]
+
+def poll_interval(stats: FeedStats, now: datetime) -> timedelta:
+    """
+    다음 수집까지 간격 계산
+
+    평균 게시 간격과 마지막 글 이후 조용했던 기간 중 큰 값에 POLL_INTERVAL_RATIO를 곱하고
+    [MIN_POLL_INTERVAL, MAX_STALENESS]로 제한한다. 자주 쓰는 블로그는 자주, 오래 쉬는 블로그는 드물게
+    확인하되 MAX_STALENESS보다 오래 확인하지 않는 피드는 없다.
+    """
+    expected = stats.mean_interval_seconds or 0.0
+    if stats.last_published_at:
+        expected = max(expected, (now - stats.last_published_at).total_seconds())
+    interval = timedelta(seconds=expected * POLL_INTERVAL_RATIO)
+    return min(max(interval, MIN_POLL_INTERVAL), MAX_STALENESS)
+
+class FeedScheduleStore:
+    """
+    피드별 수집 일정 저장소 (FEED_SCHEDULE)
+
+    실행 시작 시각(run_started_at)을 기준으로 판단/계산해서, 같은 시각에 도는 크론잡이
+    경계에서 한 번씩 건너뛰지 않도록 한다. daemon은 tick마다 start_run으로 기준 시각을 옮긴다.
+    """
+
+    def __init__(self, run_started_at: Optional[datetime] = None):
+        self.run_started_at = run_started_at or datetime.utcnow()
+        self._stats: Dict[Tuple[str, str], FeedStats] = {}
+        self._rows = KeyedRowStore(FeedSchedule, ("platform_name", "account_id"), "feed schedules")
+
+    def load(self):
+        """FEED_SCHEDULE에서 모든 일정 로드 (못 읽으면 모든 피드를 수집)"""
+        self._rows.load(self._load_row)
+
+    def _load_row(self, row) -> Tuple[str, str]:
+        key = (row.platform_name, row.account_id)
+        self._stats[key] = FeedStats(
+            mean_interval_seconds=row.mean_interval_seconds,
+            last_published_at=row.last_published_at,
+            last_checked_at=row.last_checked_at,
+            next_due_at=row.next_due_at,
+        )
+        return key
+
+    def start_run(self, now: Optional[datetime] = None):
+        """새 실행(tick)의 기준 시각 설정"""
+        self.run_started_at = now or datetime.utcnow()
+
+    def checked_within(self, platform_name: str, account_id: str, interval: timedelta) -> bool:
+        """기준 시각 이전 interval 안에 수집한 피드인지 확인"""
+        stats = self._stats.get((platform_name, account_id))
+        return (
+            stats is not None and stats.last_checked_at is not None
+            and stats.last_checked_at > self.run_started_at - interval
+        )
+
+    def is_due(self, platform_name: str, account_id: str) -> bool:
+        """이번 실행에서 수집할 피드인지 확인 (일정이 없으면 수집, 다음 수집 시각이 DUE_TOLERANCE 안이면 수집)"""
+        if not ADAPTIVE_SCHEDULE_ENABLED:
+            return True
+        stats = self._stats.get((platform_name, account_id))
+        return (
+            stats is None or stats.next_due_at is None
+            or stats.next_due_at <= self.run_started_at + DUE_TOLERANCE
+        )
+
+    def record(self, platform_name: str, account_id: str, articles: List[ArticleRecord]):
+        """
+        수집 결과로 통계 갱신 후 다음 수집 시각 계산
+
+        Args:
+            platform_name: 플랫폼 이름
+            account_id: 플랫폼 계정 ID
+            articles: 이번에 파싱한 글 목록 (304로 파싱을 건너뛰었으면 빈 리스트)
+        """
+        key = (platform_name, account_id)
+        stats = self._stats.setdefault(key, FeedStats())
+        update_stats(stats, [article.published_at for article in articles])
+
+        stats.last_checked_at = self.run_started_at
+        stats.next_due_at = self.run_started_at + poll_interval(stats, self.run_started_at)
+        self._rows.changed(key)
+
+    def take(self) -> KeyedRowBatch:
+        """갱신된 일정 행 꺼내기 (write로 저장)"""
+        return self._rows.take(self._row)
+
+    def write(self, batch: KeyedRowBatch) -> bool:
+        return self._rows.write(batch)
+
+    def save(self):
+        """이번 실행에서 갱신된 일정만 저장"""
+        self.write(self.take())
+
+    def _row(self, key: Tuple[str, str]) -> dict:
+        stats = self._stats[key]
+        return {
+            "platform_name": key[0],
+            "account_id": key[1],
+            "mean_interval_seconds": stats.mean_interval_seconds,
+            "last_published_at": stats.last_published_at,
+            "last_checked_at": stats.last_checked_at,
+            "next_due_at": stats.next_due_at,
+        }
+
+def evict_unregistered() -> int:
+    """
+    어떤 사용자도 등록하지 않은 피드의 일정 삭제
+
+    Returns:
+        삭제한 행 수
+    """
+    return keyed_store.evict_unregistered(FeedSchedule, "feed schedules")
@@ -0,0 +1,186 @@
+import os
+import math
+import hashlib
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import datetime, timedelta
+from sqlalchemy import tuple_
+from app.models.db_models import FeedSeen
+from app.dependencies.database import SessionLocal
+from app.dependencies import keyed_store, metrics
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 발행한 글 링크 기준 새 글 판정 사용 여부 (false면 published_at > last_upload만 사용)
+SEEN_SET_ENABLED = os.getenv("OBSERVER_SEEN_SET", "true").lower() == "true"
+
+# 정확히 보관할 최근 링크 수 (피드 한 번에 나오는 글 수보다 넉넉하게)
+SEEN_RECENT_SIZE = int(os.getenv("OBSERVER_SEEN_RECENT_SIZE", "100"))
+
+# Bloom 필터에 담을 것으로 예상하는 링크 수 (사용자-플랫폼 하나에 발행할 글 수) / 그때의 목표 거짓 양성률
+# 새 집합의 필터 크기와 해시 함수 수를 여기서 계산한다. (이미 저장된 집합은 저장된 크기 그대로 사용)
+SEEN_BLOOM_CAPACITY = int(os.getenv("OBSERVER_SEEN_BLOOM_CAPACITY", "1000"))
+SEEN_BLOOM_FP_RATE = float(os.getenv("OBSERVER_SEEN_BLOOM_FP_RATE", "0.01"))
+
+# last_upload 이전에 발행 시각이 찍힌 글(예약/소급 발행, 같은 초 발행)을 찾기 위해 더 거슬러 파싱할 기간
+SEEN_LOOKBACK = timedelta(days=float(os.getenv("OBSERVER_SEEN_LOOKBACK_DAYS", "14")))
+
+# 링크 키 크기 (blake2b 64비트)
+KEY_SIZE = 8
+
+def bloom_size(capacity: int, fp_rate: float) -> Tuple[int, int]:
+    """
+    capacity 개를 넣었을 때 거짓 양성률이 fp_rate가 되는 Bloom 필터 크기 (바이트, 해시 함수 수)
+
+    최적 비트 수 m = -n ln p / (ln 2)^2, 해시 함수 수 k = m / n ln 2
+    """
+    capacity = max(1, capacity)
+    bits = -capacity * math.log(fp_rate) / (math.log(2) ** 2)
+    size = max(1, math.ceil(bits / 8))
+    hashes = max(1, round(size * 8 / capacity * math.log(2)))
+    return size, hashes
+
+SEEN_BLOOM_BYTES, SEEN_BLOOM_HASHES = bloom_size(SEEN_BLOOM_CAPACITY, SEEN_BLOOM_FP_RATE)
+
+def link_key(link: str) -> bytes:
+    """글 링크의 고정 길이 키 (ai_server도 링크로 중복 글을 판단하므로 GUID 대신 링크 사용)"""
+    return hashlib.blake2b(link.strip().encode(), digest_size=KEY_SIZE).digest()
+
+class SeenSet:
+    """
+    사용자-플랫폼 하나에 발행한 글 링크 집합
+
+    최근 SEEN_RECENT_SIZE 개는 키를 그대로 보관하고, 모든 키를 Bloom 필터에도 넣는다.
+    필터 크기와 해시 함수 수는 집합을 만들 때 정해 함께 저장한다. (설정이 바뀌어도 저장된 필터를 그대로 읽을 수 있도록)
+    Bloom 필터는 거짓 양성이 있으므로 last_upload 이전 발행 시각의 글을 거를 때만 쓴다.
+    (새 발행 시각의 글이 거짓 양성으로 누락되는 일은 없음)
+    horizon 이전 발행 글은 이 집합을 만들기 전에 처리된 것이므로 판정하지 않는다.
+    """
+    __slots__ = ("recent", "bloom", "hashes", "horizon", "stored", "changed")
+
+    def __init__(self, recent: Optional[List[bytes]] = None, bloom: Optional[bytearray] = None,
+                 hashes: int = SEEN_BLOOM_HASHES, horizon: Optional[datetime] = None, stored: bool = False):
+        self.recent = recent if recent is not None else []
+        self.bloom = bloom if bloom is not None else bytearray(SEEN_BLOOM_BYTES)
+        self.hashes = hashes
+        self.horizon = horizon
+        self.stored = stored      # FEED_SEEN에 행이 있는지 (INSERT / UPDATE 구분)
+        self.changed = False
+
+    @classmethod
+    def from_row(cls, recent: bytes, bloom: bytes, hashes: int, horizon: Optional[datetime]) -> "SeenSet":
+        keys = [recent[i:i + KEY_SIZE] for i in range(0, len(recent), KEY_SIZE)]
+        return cls(keys, bytearray(bloom), hashes, horizon, stored=True)
+
+    def __contains__(self, key: bytes) -> bool:
+        """최근 목록에 있는지 (정확)"""
+        return key in self.recent
+
+    def might_contain(self, key: bytes) -> bool:
+        """Bloom 필터에 있는지 (거짓 양성 가능)"""
+        return all(self.bloom[bit >> 3] & (1 << (bit & 7)) for bit in self._bits(key))
+
+    def add(self, keys: Iterable[bytes]):
+        """키 추가 (최근 목록 앞쪽에 넣고 SEEN_RECENT_SIZE 개로 자름)"""
+        added = [key for key in dict.fromkeys(keys) if key not in self.recent]
+        if not added:
+            return
+        for key in added:
+            for bit in self._bits(key):
+                self.bloom[bit >> 3] |= 1 << (bit & 7)
+        self.recent = (added + self.recent)[:SEEN_RECENT_SIZE]
+        self.changed = True
+
+    def _bits(self, key: bytes):
+        # 64비트 키를 둘로 나눈 이중 해싱
+        size = len(self.bloom) * 8
+        h1 = int.from_bytes(key[:4], "little")
+        h2 = int.from_bytes(key[4:], "little") | 1
+        return [(h1 + i * h2) % size for i in range(self.hashes)]
+
+    def to_row(self) -> dict:
+        return {
+            "recent_keys": b"".join(self.recent),
+            "bloom": bytes(self.bloom),
+            "bloom_hashes": self.hashes,
+            "horizon": self.horizon,
+        }
+
+class SeenSetBatch:
+    """
+    실행 중 바뀐 SeenSet을 모았다가 한 번에 저장
+
+    last_upload와 마찬가지로 브로커가 메시지를 확인한 뒤에만 flush해야 한다.
+    (먼저 저장하면 발행에 실패한 글이 다음 실행에서 이미 본 글로 처리됨)
+    """
+
+    def __init__(self):
+        self._pending: Dict[Tuple, Tuple[str, SeenSet]] = {}
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(self, user_id, platform_name: str, account_id: str, seen: SeenSet):
+        """저장 예약 (바뀌지 않은 집합은 무시)"""
+        if SEEN_SET_ENABLED and seen.changed:
+            self._pending[(user_id, platform_name)] = (account_id, seen)
+
+    @metrics.DB_OPERATION_SECONDS.labels(operation="seen_set_flush").time()
+    def flush(self) -> int:
+        """
+        예약된 집합 저장
+
+        Returns:
+            저장한 행 수 (실패하면 0)
+        """
+        if not self._pending:
+            return 0
+
+        pending, self._pending = self._pending, {}
+        now = datetime.utcnow()
+        inserts, updates = [], []
+        for (user_id, platform_name), (account_id, seen) in pending.items():
+            row = {
+                "user_id": user_id,
+                "platform_name": platform_name,
+                "account_id": account_id,
+                "updated_at": now,
+                **seen.to_row(),
+            }
+            (updates if seen.stored else inserts).append(row)
+
+        db = SessionLocal()
+        try:
+            if inserts:
+                # 계정이 바뀌어 JOIN에서 빠진 이전 계정의 행이 남아 있을 수 있음
+                keys = [(row["user_id"], row["platform_name"]) for row in inserts]
+                db.query(FeedSeen).filter(
+                    tuple_(FeedSeen.user_id, FeedSeen.platform_name).in_(keys)
+                ).delete(synchronize_session=False)
+                db.bulk_insert_mappings(FeedSeen, inserts)
+            if updates:
+                db.bulk_update_mappings(FeedSeen, updates)
+            db.commit()
+            for _, seen in pending.values():
+                seen.stored = True
+                seen.changed = False
+            metrics.DB_ROWS.labels(operation="seen_set_flush", result="updated").inc(len(pending))
+            logger.info(f"Saved seen sets: {len(inserts)} new, {len(updates)} updated")
+            return len(pending)
+        except Exception as e:
+            # 저장하지 못한 사용자-플랫폼은 다음 실행에서 같은 글이 다시 발행될 수 있음 (ai_server가 링크로 거름)
+            logger.error(f"Failed to save seen sets ({len(pending)} rows): {e}")
+            db.rollback()
+            metrics.DB_ROWS.labels(operation="seen_set_flush", result="failed").inc(len(pending))
+            return 0
+        finally:
+            db.close()
+
+def evict_deregistered() -> int:
+    """
+    더 이상 USER_PLATFORM에 없는 (연동 해제/계정 변경/탈퇴) 집합 삭제
+
+    Returns:
+        삭제한 행 수
+    """
+    return keyed_store.evict_unregistered(FeedSeen, "seen sets", per_user=True)
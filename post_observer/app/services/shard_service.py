@@ -0,0 +1,128 @@
+import os
+import uuid
+import zlib
+from datetime import datetime, timedelta
+from typing import Callable, Optional, Tuple
+from app.models.db_models import ObserverShardRun
+from app.dependencies.database import SessionLocal
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 오래된 샤드 실행 기록 보관 기간 (일)
+SHARD_RUN_RETENTION_DAYS = 7
+
+class ShardConfig:
+    """
+    observer 샤드 설정
+
+    (platform_name, account_id)의 안정 해시(crc32) % count == index 인 행만 처리한다.
+    같은 피드를 등록한 사용자들은 항상 같은 샤드에 모인다.
+    미업로드 사용자 조회는 SQL에서 거르도록 user_id 구간(user_id_range)으로 나눈다.
+    """
+    def __init__(self, index: int = 0, count: int = 1, run_id: str = None):
+        if count < 1 or not 0 <= index < count:
+            raise ValueError(f"Invalid shard: index={index}, count={count}")
+        self.index = index
+        self.count = count
+        self.run_id = run_id or datetime.utcnow().strftime("%Y-%m-%d")
+
+    @classmethod
+    def from_env(cls) -> "ShardConfig":
+        """
+        환경변수에서 샤드 설정 로드
+
+        - OBSERVER_SHARD_COUNT: 전체 샤드 수 (기본 1 = 샤드 모드 아님)
+        - OBSERVER_SHARD_INDEX: 샤드 번호, 없으면 Indexed Job의 JOB_COMPLETION_INDEX 사용
+        - OBSERVER_RUN_ID: 같은 실행의 샤드들이 공유하는 ID (기본값: UTC 날짜)
+        """
+        count = int(os.getenv("OBSERVER_SHARD_COUNT", "1"))
+        index = int(os.getenv("OBSERVER_SHARD_INDEX") or os.getenv("JOB_COMPLETION_INDEX") or "0")
+        return cls(index=index, count=count, run_id=os.getenv("OBSERVER_RUN_ID"))
+
+    @property
+    def enabled(self) -> bool:
+        return self.count > 1
+
+    def owns(self, platform_name: str, account_id: str) -> bool:
+        """이 샤드가 처리할 피드인지 확인"""
+        if not self.enabled:
+            return True
+        return shard_of(platform_name, account_id, self.count) == self.index
+
+    def user_id_range(self) -> Tuple[Optional[uuid.UUID], Optional[uuid.UUID]]:
+        """
+        이 샤드가 맡는 user_id 구간 [하한, 상한) (None이면 제한 없음)
+
+        UUID 공간을 count개로 똑같이 나눈다. user_id는 uuid4라 구간마다 사용자 수가 고르고,
+        (user_id, platform_id) 기본 키 인덱스의 범위 조건이 된다.
+        """
+        if not self.enabled:
+            return None, None
+        lower = uuid.UUID(int=(self.index << 128) // self.count) if self.index else None
+        upper = uuid.UUID(int=((self.index + 1) << 128) // self.count) if self.index + 1 < self.count else None
+        return lower, upper
+
+    def __repr__(self):
+        return f"ShardConfig(index={self.index}, count={self.count}, run_id={self.run_id})"
+
+def shard_of(platform_name: str, account_id: str, count: int) -> int:
+    """프로세스/파드와 무관하게 항상 같은 값을 주는 샤드 번호 계산"""
+    return zlib.crc32(f"{platform_name}:{account_id}".encode("utf-8")) % count
+
+def finish_shard(shard: ShardConfig, new_posts: int, publish_refresh: Callable[[int], None]) -> bool:
+    """
+    샤드 결과를 OBSERVER_SHARD_RUN에 기록하고, 모든 샤드가 끝났으면 합산 개수로 refresh 발행
+
+    각 샤드는 자기 행을 먼저 커밋한 뒤 실행 전체 행을 잠그고 확인하므로
+    마지막으로 끝난 샤드가 정확히 한 번 refresh를 발행한다. (재시도된 샤드는 개수를 덮어씀)
+
+    Args:
+        shard: 샤드 설정
+        new_posts: 이 샤드에서 발행한 새 글 수
+        publish_refresh: 합산 개수를 받아 refresh 메시지를 발행하는 함수
+
+    Returns:
+        이 샤드가 refresh를 발행했는지
+    """
+    db = SessionLocal()
+    try:
+        row = db.get(ObserverShardRun, (shard.run_id, shard.index))
+        if row is None:
+            row = ObserverShardRun(run_id=shard.run_id, shard_index=shard.index)
+            db.add(row)
+        row.shard_count = shard.count
+        row.new_posts = new_posts
+        row.finished_at = datetime.utcnow()
+        db.commit()
+
+        rows = db.query(ObserverShardRun).filter(
+            ObserverShardRun.run_id == shard.run_id
+        ).with_for_update().all()
+
+        finished = len(rows)
+        if finished < shard.count or any(r.refresh_published for r in rows):
+            db.commit()
+            logger.info(f"Shard {shard.index} finished ({finished}/{shard.count} shards done for run {shard.run_id})")
+            return False
+
+        total_new_posts = sum(r.new_posts for r in rows)
+        publish_refresh(total_new_posts)
+        for r in rows:
+            r.refresh_published = True
+
+        # 오래된 실행 기록 정리
+        db.query(ObserverShardRun).filter(
+            ObserverShardRun.finished_at < datetime.utcnow() - timedelta(days=SHARD_RUN_RETENTION_DAYS)
+        ).delete(synchronize_session=False)
+        db.commit()
+
+        logger.info(f"All {shard.count} shards finished for run {shard.run_id}: {total_new_posts} new posts")
+        return True
+
+    except Exception as e:
+        logger.error(f"Failed to record shard result: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
@@ -0,0 +1,303 @@
+import os
+import hmac
+import secrets
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+import httpx
+from app.models.db_models import FeedWebSub
+from app.dependencies import keyed_store, metrics
+from app.dependencies.keyed_store import KeyedRowStore, KeyedRowBatch
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 허브가 배포 요청을 보낼 수신기의 외부 주소 (예: https://observer.example.com) - 없으면 WebSub 사용 안 함
+# 수신기는 daemon 모드에서만 뜨므로 크론잡에는 설정하지 않는다.
+WEBSUB_CALLBACK_URL = os.getenv("OBSERVER_WEBSUB_CALLBACK_URL", "").rstrip("/")
+WEBSUB_ENABLED = bool(WEBSUB_CALLBACK_URL)
+
+# 요청할 구독 기간 (초, 허브가 줄일 수 있음) / 만료 전 갱신 시점 / 구독 요청 실패 후 재시도 간격
+WEBSUB_LEASE_SECONDS = int(os.getenv("OBSERVER_WEBSUB_LEASE_SECONDS", str(10 * 24 * 3600)))
+WEBSUB_RENEW_BEFORE = timedelta(hours=float(os.getenv("OBSERVER_WEBSUB_RENEW_BEFORE_HOURS", "24")))
+WEBSUB_RETRY_INTERVAL = timedelta(hours=float(os.getenv("OBSERVER_WEBSUB_RETRY_HOURS", "6")))
+
+# tick 한 번에 보낼 구독 요청 수 상한
+WEBSUB_SUBSCRIBE_BATCH = int(os.getenv("OBSERVER_WEBSUB_SUBSCRIBE_BATCH", "50"))
+
+# 콜백 URL 경로 접두사 (health_server 라우트)
+CALLBACK_PATH = "/websub/"
+
+# 허브가 서명에 쓸 수 있는 해시 (WebSub 명세)
+SIGNATURE_METHODS = ("sha1", "sha256", "sha384", "sha512")
+
+class WebSubSubscription:
+    """피드 하나의 WebSub 구독"""
+    __slots__ = (
+        "platform_name", "account_id", "hub_url", "topic_url", "callback_id", "secret",
+        "lease_expires_at", "requested_at",
+    )
+
+    def __init__(self, platform_name, account_id, hub_url, topic_url, callback_id=None, secret=None,
+                 lease_expires_at=None):
+        self.platform_name = platform_name
+        self.account_id = account_id
+        self.hub_url = hub_url
+        self.topic_url = topic_url
+        self.callback_id = callback_id or secrets.token_hex(16)
+        self.secret = secret or secrets.token_hex(32)
+        self.lease_expires_at = lease_expires_at
+        self.requested_at: Optional[datetime] = None  # 마지막 구독 요청 시각 (메모리에만 보관)
+
+    @property
+    def callback_url(self) -> str:
+        return f"{WEBSUB_CALLBACK_URL}{CALLBACK_PATH}{self.callback_id}"
+
+    def is_active(self, now: datetime) -> bool:
+        return self.lease_expires_at is not None and self.lease_expires_at > now
+
+    def __repr__(self):
+        return f"WebSubSubscription({self.platform_name}/{self.account_id}, hub={self.hub_url}, lease={self.lease_expires_at})"
+
+class WebSubStore:
+    """
+    피드별 WebSub 구독 저장소 (FEED_WEBSUB)
+
+    폴링 결과에서 허브 광고를 기록하고(advertised), daemon이 tick마다 구독/갱신 요청을 보낸다.
+    허브의 구독 확인(verify)은 수신기 스레드에서 들어오므로 변경은 잠금 안에서 한다.
+    다른 저장소와 같이 시작 시 한 번에 읽고, 바뀐 구독만 저장한다.
+    """
+
+    def __init__(self):
+        self._subscriptions: Dict[Tuple[str, str], WebSubSubscription] = {}
+        self._by_callback: Dict[str, WebSubSubscription] = {}
+        self._rows = KeyedRowStore(FeedWebSub, ("platform_name", "account_id"), "WebSub subscriptions")
+        self._lock = threading.Lock()
+
+    def load(self):
+        """FEED_WEBSUB에서 모든 구독 로드 (못 읽으면 모든 피드를 폴링)"""
+        self._rows.load(self._load_row)
+
+    def _load_row(self, row) -> Tuple[str, str]:
+        subscription = WebSubSubscription(
+            row.platform_name, row.account_id, row.hub_url, row.topic_url,
+            callback_id=row.callback_id, secret=row.secret, lease_expires_at=row.lease_expires_at,
+        )
+        self._add(subscription)
+        return (row.platform_name, row.account_id)
+
+    def __len__(self):
+        return len(self._subscriptions)
+
+    def is_active(self, platform_name: str, account_id: str, now: Optional[datetime] = None) -> bool:
+        """허브가 확인한 구독 기간 안인지 (이 피드는 배포 요청으로 새 글을 받음)"""
+        subscription = self._subscriptions.get((platform_name, account_id))
+        return subscription is not None and subscription.is_active(now or datetime.utcnow())
+
+    def by_callback(self, callback_id: str) -> Optional[WebSubSubscription]:
+        return self._by_callback.get(callback_id)
+
+    def advertised(self, platform_name: str, account_id: str, hub_url: Optional[str], topic_url: Optional[str]):
+        """
+        200 응답에서 본 허브 광고 기록
+
+        허브나 토픽이 바뀌면 새 콜백/비밀 키로 다시 구독하고, 광고가 사라지면 구독을 지운다.
+        (지운 구독의 남은 배포 요청은 410으로 거절해 허브가 정리하도록 함)
+        """
+        key = (platform_name, account_id)
+        with self._lock:
+            current = self._subscriptions.get(key)
+            if current is not None and current.hub_url == hub_url and current.topic_url == topic_url:
+                return
+            if current is not None:
+                self._remove(current)
+            if hub_url is None:
+                self._rows.deleted(key)
+                return
+            self._add(WebSubSubscription(platform_name, account_id, hub_url, topic_url))
+            self._rows.changed(key)
+            logger.info(f"Discovered WebSub hub for {platform_name}/{account_id}: {hub_url}")
+
+    def due_for_subscribe(self, now: datetime, limit: int = WEBSUB_SUBSCRIBE_BATCH) -> List[WebSubSubscription]:
+        """구독 요청을 보낼 차례인 구독 (미확인이거나 곧 만료, 최근에 요청한 것은 제외)"""
+        due = []
+        for subscription in list(self._subscriptions.values()):
+            if subscription.requested_at is not None and subscription.requested_at > now - WEBSUB_RETRY_INTERVAL:
+                continue
+            if subscription.lease_expires_at is None or subscription.lease_expires_at - now <= WEBSUB_RENEW_BEFORE:
+                due.append(subscription)
+                if len(due) >= limit:
+                    break
+        return due
+
+    def verify(self, callback_id: str, mode: str, topic: Optional[str], lease_seconds: Optional[str]) -> bool:
+        """
+        허브의 구독 의사 확인(GET) 처리
+
+        Returns:
+            확인해 줄지 여부 (True면 hub.challenge를 그대로 응답)
+        """
+        with self._lock:
+            subscription = self._by_callback.get(callback_id)
+            if mode == "unsubscribe":
+                # 모르는 콜백(광고가 사라졌거나 정리된 구독)의 구독 해제만 확인
+                return subscription is None
+            if subscription is None or topic != subscription.topic_url:
+                return False
+            key = (subscription.platform_name, subscription.account_id)
+            if mode == "denied":
+                subscription.lease_expires_at = None
+                self._rows.changed(key)
+                metrics.WEBSUB_EVENTS.labels(event="denied").inc()
+                logger.warning(f"WebSub subscription denied: {subscription}")
+                return True
+            if mode != "subscribe":
+                return False
+            try:
+                lease = int(lease_seconds) if lease_seconds else WEBSUB_LEASE_SECONDS
+            except ValueError:
+                lease = WEBSUB_LEASE_SECONDS
+            subscription.lease_expires_at = datetime.utcnow() + timedelta(seconds=lease)
+            self._rows.changed(key)
+        metrics.WEBSUB_EVENTS.labels(event="verified").inc()
+        logger.info(f"WebSub subscription verified: {subscription}")
+        return True
+
+    def take(self) -> KeyedRowBatch:
+        """바뀐 구독 행과 광고가 사라진 구독 꺼내기 (write로 저장)"""
+        now = datetime.utcnow()
+        with self._lock:
+            return self._rows.take(lambda key: self._row(key, now))
+
+    def write(self, batch: KeyedRowBatch) -> bool:
+        return self._rows.write(batch)
+
+    def save(self):
+        """바뀐 구독 저장, 광고가 사라진 구독 삭제"""
+        self.write(self.take())
+
+    def _row(self, key: Tuple[str, str], now: datetime) -> Optional[dict]:
+        subscription = self._subscriptions.get(key)
+        if subscription is None:
+            return None
+        return {
+            "platform_name": key[0],
+            "account_id": key[1],
+            "hub_url": subscription.hub_url,
+            "topic_url": subscription.topic_url,
+            "callback_id": subscription.callback_id,
+            "secret": subscription.secret,
+            "lease_expires_at": subscription.lease_expires_at,
+            "updated_at": now,
+        }
+
+    def _add(self, subscription: WebSubSubscription):
+        self._subscriptions[(subscription.platform_name, subscription.account_id)] = subscription
+        self._by_callback[subscription.callback_id] = subscription
+
+    def _remove(self, subscription: WebSubSubscription):
+        self._subscriptions.pop((subscription.platform_name, subscription.account_id), None)
+        self._by_callback.pop(subscription.callback_id, None)
+
+async def subscribe(client, subscription: WebSubSubscription) -> bool:
+    """
+    허브에 구독(갱신) 요청 (허브는 202 응답 후 콜백으로 구독 의사를 확인함)
+
+    Args:
+        client: http_client.FeedClient
+
+    Returns:
+        허브가 요청을 받았는지
+    """
+    subscription.requested_at = datetime.utcnow()
+    data = {
+        "hub.mode": "subscribe",
+        "hub.topic": subscription.topic_url,
+        "hub.callback": subscription.callback_url,
+        "hub.secret": subscription.secret,
+        "hub.lease_seconds": str(WEBSUB_LEASE_SECONDS),
+    }
+    try:
+        response = await client.post(subscription.hub_url, data)
+    except httpx.HTTPError as e:
+        metrics.WEBSUB_EVENTS.labels(event="subscribe_failed").inc()
+        logger.warning(f"WebSub subscribe request failed for {subscription}: {e}")
+        return False
+    if not response.is_success:
+        metrics.WEBSUB_EVENTS.labels(event="subscribe_failed").inc()
+        logger.warning(f"WebSub hub rejected subscription {subscription}: HTTP {response.status_code}")
+        return False
+    metrics.WEBSUB_EVENTS.labels(event="subscribe_requested").inc()
+    return True
+
+def verify_signature(secret: str, header: Optional[str], body: bytes) -> bool:
+    """배포 요청의 X-Hub-Signature(method=hex HMAC) 검증"""
+    if not header or "=" not in header:
+        return False
+    method, signature = header.split("=", 1)
+    method = method.strip().lower()
+    if method not in SIGNATURE_METHODS:
+        return False
+    expected = hmac.new(secret.encode(), body, method).hexdigest()
+    return hmac.compare_digest(expected, signature.strip().lower())
+
+class WebSubReceiver:
+    """
+    콜백 요청 처리 (health_server 라우트, 수신기 스레드에서 호출)
+
+    - GET  {CALLBACK_PATH}{callback_id}: 구독 의사 확인 → hub.challenge 응답
+    - POST {CALLBACK_PATH}{callback_id}: 배포 요청 → 서명 검증 후 on_content로 넘기고 202 응답
+    서명이 틀린 배포 요청도 명세대로 2xx로 응답하되 버린다.
+    """
+
+    def __init__(self, store: Callable[[], Optional[WebSubStore]], on_content: Callable[[WebSubSubscription, bytes], bool]):
+        """
+        Args:
+            store: 현재 구독 저장소를 반환하는 함수 (daemon이 resync하면 저장소가 바뀜)
+            on_content: 검증한 배포 본문을 수집 루프로 넘기는 함수 (넘기지 못하면 False)
+        """
+        self._store = store
+        self._on_content = on_content
+
+    def handle(self, method: str, path: str, query: Dict[str, str], headers, body: bytes) -> Tuple[int, str, bytes]:
+        store = self._store()
+        if store is None:
+            return 503, "text/plain", b"not ready"
+        callback_id = path[len(CALLBACK_PATH):]
+
+        if method == "GET":
+            mode = query.get("hub.mode", "")
+            challenge = query.get("hub.challenge")
+            if mode == "denied":
+                # 거절 통지에는 challenge가 없음 (폴링으로 계속 수집)
+                store.verify(callback_id, mode, query.get("hub.topic"), None)
+                return 200, "text/plain", b""
+            if challenge is not None and store.verify(
+                callback_id, mode, query.get("hub.topic"), query.get("hub.lease_seconds")
+            ):
+                return 200, "text/plain", challenge.encode()
+            return 404, "text/plain", b"unknown subscription"
+
+        subscription = store.by_callback(callback_id)
+        if subscription is None:
+            metrics.WEBSUB_EVENTS.labels(event="unknown_callback").inc()
+            # 410이면 허브가 구독을 정리함
+            return 410, "text/plain", b"gone"
+        if not verify_signature(subscription.secret, headers.get("X-Hub-Signature"), body):
+            metrics.WEBSUB_EVENTS.labels(event="bad_signature").inc()
+            logger.warning(f"Ignored WebSub notification with invalid signature: {subscription}")
+            return 202, "text/plain", b""
+        metrics.WEBSUB_EVENTS.labels(event="notified").inc()
+        if not self._on_content(subscription, body):
+            # 처리하지 못한 배포는 다음 폴링이 가져감
+            logger.warning(f"Dropped WebSub notification (queue full): {subscription}")
+        return 202, "text/plain", b""
+
+def evict_unregistered() -> int:
+    """
+    어떤 사용자도 등록하지 않은 피드의 구독 삭제 (허브의 남은 배포 요청은 410으로 거절)
+
+    Returns:
+        삭제한 행 수
+    """
+    return keyed_store.evict_unregistered(FeedWebSub, "WebSub subscriptions")
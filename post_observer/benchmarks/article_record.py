@@ -0,0 +1,137 @@
+"""
+글 레코드 마이크로벤치마크
+ArticleSchema(pydantic) + model_dump + json.dumps vs ArticleRecord + encode_new_post_message
+
+파서가 만든 글 하나가 new_posts 메시지가 되기까지 메인 프로세스가 쓰는 CPU와 메모리를 비교한다.
+- construct: 정규화한 필드로 글 객체 생성 (파서 normalize / parse_pool.article_from_row)
+- publish: 구독자 수만큼 메시지 JSON 생성 (_process_feed)
+- memory: 글 객체 N개를 들고 있을 때의 메모리 (tracemalloc)
+- parity: 두 경로의 메시지 JSON이 바이트 단위로 같은지 (기록 피드 + 경계 사례)
+
+사용법 (post_observer 디렉토리에서):
+    python benchmarks/article_record.py
+    python benchmarks/article_record.py --articles 20000 --subscribers 1 3
+"""
+import gc
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.models.schemas import ArticleSchema, ArticleRecord, encode_new_post_message
+from app.services.rss_service import PARSER_MAP
+from feed_fixtures import DEFAULT_ITEMS, load_fixture
+
+# 경계 사례 (title, link, published_at, thumbnail, tags)
+EDGE_CASES = [
+    ('따옴표 "인용" \\ 백슬래시', "https://example.com/a?b=1&c=2", datetime(2025, 11, 17, 3, 0), None, None),
+    ("제어\t문자\n줄바꿈\x01", "https://example.com/b", datetime(2025, 11, 17, 3, 0, 0, 5), "https://img/x.jpg", []),
+    ("이모지 😀 </script>", "https://example.com/c", datetime(2025, 11, 17, 3, 0, tzinfo=timezone.utc), None, ["태그", "a\"b"]),
+    ("KST", "https://example.com/d", datetime(2025, 11, 17, 12, 0, tzinfo=timezone(timedelta(hours=9))), None, ["x"]),
+    ("   separators", "https://example.com/e", datetime(2025, 1, 1, 0, 0, 0, 123456, tzinfo=timezone.utc), "", None),
+]
+
+def fixture_rows():
+    """기록 피드를 파싱한 글 필드 튜플"""
+    rows = []
+    for platform in DEFAULT_ITEMS:
+        for article in PARSER_MAP[platform].parse_content(load_fixture(platform), f"bench://{platform}"):
+            rows.append((article.title, article.link, article.published_at, article.thumbnail, article.tags))
+    return rows
+
+def schema_message(user_id: str, platform: str, article: ArticleSchema) -> str:
+    """기존 발행 경로 (RabbitMQPublisher.publish의 json.dumps까지)"""
+    return json.dumps(
+        {"user_id": user_id, "platform": platform, "article": article.model_dump(mode='json')},
+        ensure_ascii=False,
+    )
+
+def check_parity(rows) -> bool:
+    ok = True
+    for title, link, published_at, thumbnail, tags in rows:
+        schema = ArticleSchema(title=title, link=link, published_at=published_at, thumbnail=thumbnail, tags=tags)
+        record = ArticleRecord(title, link, published_at, thumbnail, tags)
+        expected = schema_message("7f1c0e9a-0000-4000-8000-000000000001", "velog", schema)
+        actual = encode_new_post_message("7f1c0e9a-0000-4000-8000-000000000001", "velog", record)
+        if actual != expected or record.to_dict() != schema.model_dump() or ArticleRecord.from_schema(schema) != record:
+            ok = False
+            print(f"  MISMATCH {title!r}\n    expected {expected}\n    actual   {actual}")
+    return ok
+
+def per_article_us(fn, rows, articles: int) -> float:
+    """rows를 반복해 articles개를 처리했을 때 글당 마이크로초"""
+    batch = (rows * (articles // len(rows) + 1))[:articles]
+    gc.collect()
+    started = time.process_time()
+    fn(batch)
+    return (time.process_time() - started) / articles * 1_000_000
+
+def bytes_per_article(build, rows, articles: int) -> float:
+    batch = (rows * (articles // len(rows) + 1))[:articles]
+    gc.collect()
+    tracemalloc.start()
+    objects = build(batch)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size / articles
+
+def build_schemas(batch):
+    return [ArticleSchema(title=t, link=l, published_at=p, thumbnail=th, tags=tg) for t, l, p, th, tg in batch]
+
+def build_records(batch):
+    return [ArticleRecord(t, l, p, th, tg) for t, l, p, th, tg in batch]
+
+def main(args) -> bool:
+    # 글 객체가 필드 튜플을 그대로 참조하지 않도록 tags 리스트는 글마다 새로 만든다
+    rows = [(t, l, p, th, list(tg) if tg is not None else None) for t, l, p, th, tg in fixture_rows()]
+    print(f"{len(rows)} fixture articles ({', '.join(DEFAULT_ITEMS)}) + {len(EDGE_CASES)} edge cases, {args.articles} articles per run\n")
+
+    ok = check_parity(rows + EDGE_CASES)
+    print(f"parity: {'ok' if ok else 'MISMATCH'}\n")
+
+    schema_construct = per_article_us(build_schemas, rows, args.articles)
+    record_construct = per_article_us(build_records, rows, args.articles)
+    print(f"{'step':<24}{'ArticleSchema us':>18}{'ArticleRecord us':>18}{'speedup':>9}")
+    print(f"{'construct':<24}{schema_construct:>18.2f}{record_construct:>18.2f}{schema_construct / record_construct:>8.1f}x")
+
+    for subscribers in args.subscribers:
+        user_ids = [f"7f1c0e9a-0000-4000-8000-{i:012d}" for i in range(subscribers)]
+
+        def publish_schemas(batch):
+            for article in build_schemas(batch):
+                for user_id in user_ids:
+                    schema_message(user_id, "velog", article)
+
+        def publish_records(batch):
+            for article in build_records(batch):
+                for user_id in user_ids:
+                    encode_new_post_message(user_id, "velog", article)
+
+        schema_total = per_article_us(publish_schemas, rows, args.articles)
+        record_total = per_article_us(publish_records, rows, args.articles)
+        label = f"construct+publish x{subscribers}"
+        print(f"{label:<24}{schema_total:>18.2f}{record_total:>18.2f}{schema_total / record_total:>8.1f}x")
+
+    schema_bytes = bytes_per_article(build_schemas, rows, args.articles)
+    record_bytes = bytes_per_article(build_records, rows, args.articles)
+    print(f"\n{'memory B/article':<24}{schema_bytes:>18.0f}{record_bytes:>18.0f}{schema_bytes / record_bytes:>8.1f}x")
+    print("(memory는 글 객체와 그 dict/리스트만 - 필드 문자열과 datetime은 두 경로가 공유)")
+    return ok
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=50000, help="측정마다 처리할 글 수")
+    parser.add_argument("--subscribers", type=int, nargs="+", default=[1, 3], help="글 하나를 발행할 구독자 수")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    logging.disable(logging.WARNING)
+    sys.exit(0 if main(parse_args()) else 1)
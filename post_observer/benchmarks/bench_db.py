@@ -0,0 +1,16 @@
+"""
+벤치마크 공용 DB 헬퍼
+"""
+import uuid
+
+def sqlite_safe_uuid() -> uuid.UUID:
+    """
+    SQLite에서 UUID 컬럼은 NUMERIC affinity라 '1234e567...'처럼 숫자로 읽히는 hex는 float로 바뀜
+    숫자로 해석되지 않는 값만 사용
+    """
+    while True:
+        value = uuid.uuid4()
+        try:
+            float(value.hex)
+        except ValueError:
+            return value
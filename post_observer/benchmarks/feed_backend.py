@@ -0,0 +1,105 @@
+"""
+RSS 파싱 백엔드 벤치마크
+feedparser vs lean (XMLPullParser) 백엔드
+
+1. parity: benchmarks/fixtures/*.xml 과 경계 사례 피드를 두 백엔드로 파싱해 ArticleRecord가 같은지 확인
+   (깨진 XML, Atom, EUC-KR, 비 RFC 822 날짜 등은 lean 백엔드가 feedparser로 넘겨야 함)
+2. throughput: 플랫폼별 기록 피드의 피드당 parse_content 시간과 초당 글 수
+
+사용법 (post_observer 디렉토리에서):
+    python benchmarks/feed_backend.py          # 피드당 200회
+    python benchmarks/feed_backend.py 1000
+"""
+import os
+import sys
+import time
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.parsers.feed_backend import FEEDPARSER, LEAN
+from app.services.rss_service import PARSER_MAP
+from feed_fixtures import DEFAULT_ITEMS, load_fixture, render_feed
+
+def _item(title="제목", link="https://example.com/1", pub="Mon, 17 Nov 2025 12:00:00 +0900", extra=""):
+    return f"<item><title>{title}</title><link>{link}</link><pubDate>{pub}</pubDate>{extra}</item>"
+
+def _rss(*items, encoding="UTF-8"):
+    return (
+        f'<?xml version="1.0" encoding="{encoding}"?>'
+        '<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/" xmlns:dc="http://purl.org/dc/elements/1.1/">'
+        f'<channel><title>edge</title>{"".join(items)}</channel></rss>'
+    )
+
+# (이름, 피드 bytes)
+EDGE_CASES = [
+    ("entities", _rss(_item("A &amp; B &lt;3", "https://example.com/1?a=1&amp;b=2"))),
+    ("cdata", _rss(_item("<![CDATA[ 잔디 & 회고 ]]>", extra="<category><![CDATA[ 여행 ]]></category>"))),
+    ("markup-title", _rss(_item("&lt;b&gt;굵게&lt;/b&gt;"), _item("<![CDATA[<script>x</script>hi]]>"))),
+    ("dc-subject-media-group", _rss(_item(extra='<dc:subject>dc</dc:subject><media:group><media:content url="g.jpg"/></media:group>'))),
+    ("gmt-and-short-time", _rss(_item(pub="Mon, 17 Nov 2025 03:00:00 GMT"), _item(pub="Mon, 17 Nov 2025 12:00 +0900"))),
+    ("iso-date", _rss(_item(pub="2025-11-17 12:00:00"), _item(pub="Sun, 16 Nov 2025 12:00:00 +0900"))),
+    ("missing-pubdate", _rss(_item(), "<item><title>x</title><link>https://example.com/2</link></item>")),
+    ("html-entity", _rss(_item(), _item("a&nbsp;b"))),
+    ("truncated", _rss(_item(), _item())[:-40]),
+    ("atom", '<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom"><entry><title>a</title>'
+             '<link href="https://example.com/a"/><updated>2025-11-17T03:00:00Z</updated></entry></feed>'),
+]
+
+def parse_with(platform: str, backend: str, content: bytes):
+    parser = type(PARSER_MAP[platform])()
+    parser.feed_backend = backend
+    return parser.parse_content(content, f"bench://{platform}")
+
+def dump(articles):
+    return [article.to_dict() for article in articles]
+
+def check_parity() -> bool:
+    cases = [(f"fixture/{platform}", platform, load_fixture(platform)) for platform in DEFAULT_ITEMS]
+    cases += [(f"shuffled/{platform}", platform, render_feed(platform, seed=7, shuffle=True)) for platform in DEFAULT_ITEMS]
+    cases += [
+        (f"edge/{name}", "velog", content.encode("euc-kr" if "EUC-KR" in content else "utf-8"))
+        for name, content in EDGE_CASES
+    ]
+    cases.append(("edge/euc-kr", "naver", _rss(_item("한글 제목"), encoding="EUC-KR").encode("euc-kr")))
+
+    ok = True
+    print(f"{'case':<34}{'articles':>9}  parity")
+    for name, platform, content in cases:
+        expected = dump(parse_with(platform, FEEDPARSER, content))
+        got = dump(parse_with(platform, LEAN, content))
+        same = got == expected
+        ok = ok and same
+        print(f"{name:<34}{len(expected):>9}  {'ok' if same else 'MISMATCH'}")
+        if not same:
+            for e, g in zip(expected, got):
+                if e != g:
+                    print(f"    feedparser: {e}\n    lean:       {g}")
+                    break
+    return ok
+
+def timed(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat
+
+def throughput(repeat: int):
+    print(f"\n{'platform':<10}{'KiB':>6}{'items':>7}{'feedparser ms':>15}{'lean ms':>9}{'lean items/s':>14}{'speedup':>9}")
+    for platform in DEFAULT_ITEMS:
+        content = load_fixture(platform)
+        items = len(parse_with(platform, LEAN, content))
+        slow = timed(lambda: parse_with(platform, FEEDPARSER, content), repeat)
+        fast = timed(lambda: parse_with(platform, LEAN, content), repeat)
+        print(
+            f"{platform:<10}{len(content) / 1024:>6.0f}{items:>7}{slow * 1000:>15.2f}{fast * 1000:>9.2f}"
+            f"{items / fast:>14.0f}{slow / fast:>8.1f}x"
+        )
+
+if __name__ == "__main__":
+    # fallback 경고와 정규화 실패 로그는 의도된 결과이므로 숨김
+    logging.disable(logging.CRITICAL)
+    parity = check_parity()
+    throughput(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
+    sys.exit(0 if parity else 1)
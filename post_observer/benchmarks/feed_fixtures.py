@@ -0,0 +1,160 @@
+"""
+벤치마크용 플랫폼별 RSS 피드 생성기
+
+네이버 / 티스토리 / Velog RSS의 실제 구조(채널 메타데이터, CDATA 제목, HTML 본문 요약, 태그/카테고리,
+썸네일 요소)를 따라 합성 피드를 만든다. benchmarks/fixtures/*.xml 은 이 모듈로 기록한 피드이다.
+
+    python benchmarks/feed_fixtures.py   # fixtures/*.xml 다시 생성
+"""
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# 플랫폼별 기본 글 개수 (각 플랫폼 RSS가 내려주는 최근 글 수)
+DEFAULT_ITEMS = {"naver": 50, "tistory": 30, "velog": 20}
+
+KST = timezone(timedelta(hours=9))
+
+_WORDS = (
+    "잔디 개발 회고 파이썬 비동기 데이터베이스 성능 측정 캐시 블로그 여행 맛집 리뷰 일상 "
+    "쿠버네티스 배포 프론트엔드 백엔드 알고리즘 공부 정리 프로젝트 테스트 리팩토링 설계"
+).split()
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+def _body(rng: random.Random, paragraphs: int) -> str:
+    return "".join(f"<p>{_sentence(rng, 30)}</p>" for _ in range(paragraphs))
+
+def _naver_item(rng, account_id, post_id, published):
+    tags = ",".join(rng.sample(_WORDS, 3))
+    return f"""<item>
+<author>{account_id}</author>
+<category><![CDATA[{rng.choice(_WORDS)}]]></category>
+<title><![CDATA[{_sentence(rng, 6)}]]></title>
+<link>https://blog.naver.com/{account_id}/{post_id}?fromRss=true&amp;trackingCode=rss</link>
+<guid>https://blog.naver.com/{account_id}/{post_id}</guid>
+<description><![CDATA[<img src="https://blogthumb.pstatic.net/{post_id}.jpg?type=w2" /> {_sentence(rng, 60)}]]></description>
+<pubDate>{format_datetime(published.astimezone(KST))}</pubDate>
+<tag><![CDATA[{tags}]]></tag>
+<media:content url="https://blogthumb.pstatic.net/{post_id}.jpg?type=w2" medium="image" />
+</item>
+"""
+
+def _tistory_item(rng, account_id, post_id, published):
+    categories = "".join(f"<category>{word}</category>\n" for word in rng.sample(_WORDS, 3))
+    return f"""<item>
+<title>{_sentence(rng, 6)}</title>
+<link>https://{account_id}.tistory.com/{post_id}</link>
+<description>{_escape(_body(rng, 6))}</description>
+{categories}<author>{account_id}</author>
+<guid isPermaLink="true">https://{account_id}.tistory.com/{post_id}</guid>
+<comments>https://{account_id}.tistory.com/{post_id}#entry{post_id}comment</comments>
+<pubDate>{format_datetime(published.astimezone(KST))}</pubDate>
+<media:thumbnail url="https://blog.kakaocdn.net/dn/{post_id}/img.png" />
+</item>
+"""
+
+def _velog_item(rng, account_id, post_id, published):
+    # 같은 글은 피드를 다시 만들어도 링크가 같도록 글 번호로 slug 생성
+    slug = "-".join(random.Random(post_id).sample(_WORDS, 3))
+    return f"""<item>
+<title><![CDATA[{_sentence(rng, 6)}]]></title>
+<link>https://velog.io/@{account_id}/{slug}-{post_id}</link>
+<guid>https://velog.io/@{account_id}/{slug}-{post_id}</guid>
+<pubDate>{format_datetime(published.astimezone(timezone.utc), usegmt=True)}</pubDate>
+<description><![CDATA[{_body(rng, 4)}]]></description>
+<media:content url="https://velog.velcdn.com/images/{account_id}/post/{post_id}/image.png" medium="image" />
+</item>
+"""
+
+def _escape(html: str) -> str:
+    return html.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+_CHANNELS = {
+    "naver": ("https://blog.naver.com/{account_id}", "Naver Blog", _naver_item),
+    "tistory": ("https://{account_id}.tistory.com/", "TISTORY", _tistory_item),
+    "velog": ("https://velog.io/@{account_id}/posts", "Velog", _velog_item),
+}
+
+def render_feed(
+    platform: str,
+    account_id: str = "jandi",
+    items: int = None,
+    newest: datetime = None,
+    interval: timedelta = timedelta(days=1),
+    seed: int = 0,
+    shuffle: bool = False,
+    new_posts: int = 0,
+    hub: tuple = None,
+) -> bytes:
+    """
+    플랫폼 형식의 RSS 피드 생성
+
+    Args:
+        platform: naver / tistory / velog
+        account_id: 블로그 ID
+        items: 글 개수 (기본값은 플랫폼별 DEFAULT_ITEMS)
+        newest: 가장 최근 글 발행 시각 (UTC, 기본값 2025-11-17 03:00)
+        interval: 글 사이 발행 간격
+        seed: 제목/본문 생성 시드
+        shuffle: True면 글 순서를 섞음 (정렬되지 않은 피드)
+        new_posts: newest가 이만큼 뒤로 밀린 같은 피드에 새로 올라온 글 수
+            (이전 글은 글 번호/링크/발행 시각이 그대로 유지됨)
+        hub: (허브 URL, 토픽 URL)이면 채널에 WebSub 광고(atom:link rel="hub" / rel="self") 추가
+
+    Returns:
+        RSS XML bytes
+    """
+    rng = random.Random(seed)
+    items = DEFAULT_ITEMS[platform] if items is None else items
+    newest = newest or datetime(2025, 11, 17, 3, 0, tzinfo=timezone.utc)
+    if newest.tzinfo is None:
+        newest = newest.replace(tzinfo=timezone.utc)
+
+    link, generator, render_item = _CHANNELS[platform]
+    link = link.format(account_id=account_id)
+
+    entries = [
+        render_item(rng, account_id, 224000000000 + items - i + new_posts, newest - interval * i)
+        for i in range(items)
+    ]
+    if shuffle:
+        rng.shuffle(entries)
+
+    atom_ns, hub_links = "", ""
+    if hub:
+        atom_ns = ' xmlns:atom="http://www.w3.org/2005/Atom"'
+        hub_links = (
+            f'<atom:link rel="hub" href="{hub[0]}"/>\n'
+            f'<atom:link rel="self" href="{hub[1]}" type="application/rss+xml"/>\n'
+        )
+
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/"{atom_ns}>
+<channel>
+{hub_links}<title><![CDATA[{account_id}의 블로그]]></title>
+<link>{link}</link>
+<description><![CDATA[{_sentence(rng, 10)}]]></description>
+<language>ko</language>
+<generator>{generator}</generator>
+<pubDate>{format_datetime(newest.astimezone(KST))}</pubDate>
+{"".join(entries)}</channel>
+</rss>
+""".encode("utf-8")
+
+def load_fixture(platform: str) -> bytes:
+    """benchmarks/fixtures/{platform}.xml 읽기"""
+    with open(os.path.join(FIXTURE_DIR, f"{platform}.xml"), "rb") as f:
+        return f.read()
+
+if __name__ == "__main__":
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for platform in DEFAULT_ITEMS:
+        path = os.path.join(FIXTURE_DIR, f"{platform}.xml")
+        with open(path, "wb") as f:
+            f.write(render_feed(platform, seed=len(platform)))
+        print(f"wrote {path}")
@@ -0,0 +1,111 @@
+"""
+미업로드 사용자 독촉 sweep 벤치마크
+check_inactive_users (키셋 페이지 + 페이지당 UPDATE 한 번) vs 사용자별 update_last_upload
+
+합성 USER_PLATFORM 행(모두 30일 이상 미업로드)을 로컬 SQLite에 만들고 가짜 브로커로 독촉 메시지를 받는다.
+SQL로 계산한 days_inactive가 Python 계산과 같은지, 두 번째 실행에서 다시 발송하지 않는지도 확인한다.
+
+사용법 (post_observer 디렉토리에서):
+    python benchmarks/inactive_sweep.py            # 1k, 10k
+    python benchmarks/inactive_sweep.py 5000
+"""
+import os
+import sys
+import json
+import time
+import logging
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "jandi_bench_inactive.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+import app.dependencies.rabbitmq as rabbitmq
+from app.dependencies.database import Base, engine, SessionLocal
+from app.models.db_models import User, Platform, UserPlatform
+from app.services import observer_service, platform_service
+from bench_db import sqlite_safe_uuid
+from observer_harness import CapturingBroker
+
+PLATFORMS = ["naver", "tistory", "velog"]
+
+def seed(rows: int) -> datetime:
+    """모든 행이 31~400일 미업로드 상태인 데이터 생성, 기준 시각 반환"""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    now = datetime.now()
+    db = SessionLocal()
+    try:
+        platform_ids = {}
+        for name in PLATFORMS:
+            platform_ids[name] = sqlite_safe_uuid()
+            db.add(Platform(platform_id=platform_ids[name], name=name))
+
+        users, user_platforms = [], []
+        for i in range(rows):
+            user_id = sqlite_safe_uuid()
+            users.append({"user_id": user_id, "email": f"user{i}@example.com", "name": f"user{i}"})
+            user_platforms.append({
+                "user_id": user_id,
+                "platform_id": platform_ids[PLATFORMS[i % len(PLATFORMS)]],
+                "account_id": f"account{i}",
+                "last_upload": now - timedelta(days=31 + i % 370, hours=i % 24, minutes=i % 60),
+            })
+        db.bulk_insert_mappings(User, users)
+        db.bulk_insert_mappings(UserPlatform, user_platforms)
+        db.commit()
+    finally:
+        db.close()
+    return now
+
+def count_days_mismatch(broker_messages) -> int:
+    """메시지의 last_upload로 Python에서 다시 계산한 일수와 다른 메시지 수"""
+    mismatched = 0
+    for _, body in broker_messages:
+        message = json.loads(body)
+        last_upload = datetime.fromisoformat(message["last_upload"])
+        if (datetime.now() - last_upload).days != message["days_inactive"]:
+            mismatched += 1
+    return mismatched
+
+def sweep(rows: int):
+    seed(rows)
+    broker = CapturingBroker()
+    rabbitmq.get_rabbitmq_connection = broker.connect
+
+    started = time.perf_counter()
+    sent = observer_service.check_inactive_users()
+    elapsed = time.perf_counter() - started
+    mismatched = count_days_mismatch(broker.messages)
+
+    again = observer_service.check_inactive_users()
+    print(
+        f"  {'check_inactive_users':<24} sent={sent:<7} {elapsed:6.2f} s  "
+        f"({elapsed / rows * 1000 * 1000:6.1f} ms / 1k users)  days mismatch={mismatched}  resent={again}"
+    )
+
+def legacy(rows: int):
+    """이전 방식: 전체 조회 후 사용자마다 update_last_upload 트랜잭션"""
+    seed(rows)
+    started = time.perf_counter()
+    users = platform_service.get_inactive_users(days=observer_service.INACTIVE_DAYS)
+    for user in users:
+        platform_service.update_last_upload(user.user_id, user.platform_name, datetime.now())
+    elapsed = time.perf_counter() - started
+    print(f"  {'per-user update (legacy)':<24} sent={len(users):<7} {elapsed:6.2f} s  "
+          f"({elapsed / rows * 1000 * 1000:6.1f} ms / 1k users)")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000]
+
+    for rows in sizes:
+        print(f"\n[{rows} inactive users]")
+        legacy(rows)
+        sweep(rows)
+
+    os.remove(DB_PATH)
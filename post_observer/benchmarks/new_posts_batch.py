@@ -0,0 +1,97 @@
+"""
+new_posts 배치 메시지 벤치마크
+글마다 메시지 하나 (OBSERVER_NEW_POSTS_BATCH_SIZE=0) vs 사용자-플랫폼의 새 글을 묶은 배치 메시지
+
+기록 피드(benchmarks/fixtures)의 글로 사용자-플랫폼마다 새 글이 생기는 상황을 만들어
+observer_service.publish_new_posts가 발행하는 new_posts 메시지 수와 크기를 비교한다.
+- steady: 피드마다 새 글 1개 (평소 실행)
+- burst: 피드마다 새 글 5개 (한 번에 여러 글을 올린 블로거)
+- first-sync: 피드의 글 전체 (신규 등록 / last_upload 없음)
+
+ai_server는 메시지마다 DB 확인, 크롤링, progress 발행을 하므로 메시지 수가 곧 왕복 수다.
+parity: 배치 메시지를 펼친 (user_id, platform, article)이 글마다 보낸 메시지와 같은지 확인한다.
+
+사용법 (post_observer 디렉토리에서):
+    python benchmarks/new_posts_batch.py
+    python benchmarks/new_posts_batch.py --feeds 1000 --batch-size 5 10 20
+"""
+import os
+import sys
+import json
+import logging
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.gettempdir(), 'jandi_bench_new_posts_batch.db')}"
+
+from app.services import observer_service
+from app.services.rss_service import PARSER_MAP
+from feed_fixtures import DEFAULT_ITEMS, load_fixture
+
+SCENARIOS = [("steady", 1), ("burst", 5), ("first-sync", None)]
+
+class CollectingPublisher:
+    """RabbitMQPublisher.publish_body 대신 발행한 본문을 모음"""
+    def __init__(self):
+        self.bodies = []
+
+    def publish_body(self, queue_name: str, body: str):
+        self.bodies.append(body)
+
+def fixture_articles():
+    return {platform: PARSER_MAP[platform].parse_content(load_fixture(platform), f"bench://{platform}") for platform in DEFAULT_ITEMS}
+
+def publish(feeds, batch_size: int) -> CollectingPublisher:
+    publisher = CollectingPublisher()
+    for user_id, platform, articles in feeds:
+        observer_service.publish_new_posts(publisher, user_id, platform, articles, batch_size=batch_size)
+    return publisher
+
+def flatten(bodies):
+    """메시지 본문을 (user_id, platform, article) 목록으로 (배치 / 글 하나 형식 모두)"""
+    result = []
+    for body in bodies:
+        message = json.loads(body)
+        for article in message["articles"] if "articles" in message else [message["article"]]:
+            result.append((message["user_id"], message["platform"], article))
+    return result
+
+def main(args) -> bool:
+    corpus = fixture_articles()
+    platforms = list(corpus)
+    print(f"{args.feeds} user-platforms, fixture articles per feed: {', '.join(f'{p} {len(a)}' for p, a in corpus.items())}\n")
+    print(f"{'scenario':<12}{'batch':>7}{'articles':>10}{'messages':>10}{'KiB':>9}{'msgs/feed':>11}{'reduction':>11}  parity")
+
+    ok = True
+    for scenario, per_feed in SCENARIOS:
+        feeds = []
+        for i in range(args.feeds):
+            platform = platforms[i % len(platforms)]
+            articles = corpus[platform] if per_feed is None else corpus[platform][:per_feed]
+            feeds.append((f"7f1c0e9a-0000-4000-8000-{i:012d}", platform, articles))
+
+        baseline = publish(feeds, 0)
+        expected = flatten(baseline.bodies)
+        for batch_size in [0] + args.batch_size:
+            result = baseline if batch_size == 0 else publish(feeds, batch_size)
+            same = flatten(result.bodies) == expected
+            ok = ok and same
+            size = sum(len(body.encode()) for body in result.bodies)
+            print(
+                f"{scenario:<12}{batch_size or 'off':>7}{len(expected):>10}{len(result.bodies):>10}{size / 1024:>9.1f}"
+                f"{len(result.bodies) / args.feeds:>11.2f}{len(baseline.bodies) / len(result.bodies):>10.1f}x  {'ok' if same else 'MISMATCH'}"
+            )
+    return ok
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--feeds", type=int, default=300, help="새 글이 생긴 사용자-플랫폼 수")
+    parser.add_argument("--batch-size", type=int, nargs="+", default=[observer_service.NEW_POSTS_BATCH_SIZE or 10], help="비교할 OBSERVER_NEW_POSTS_BATCH_SIZE")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    logging.disable(logging.WARNING)
+    sys.exit(0 if main(parse_args()) else 1)
@@ -0,0 +1,120 @@
+"""
+파싱 프로세스 풀 벤치마크
+수집 태스크에서 바로 파싱 vs OBSERVER_PARSE_WORKERS 워커 프로세스로 넘겨 파싱
+
+플랫폼별 합성 피드(feed_fixtures.render_feed)를 수집 루프처럼 동시에 파싱하고 비교한다.
+- full: watermark 없이 피드 전체 정규화 (첫 수집 / 신규 등록)
+- warm: 최근 글 2개만 정규화 (평소 실행, 정렬된 피드는 watermark에서 멈춤)
+
+측정 항목:
+- feeds/s, articles/s: 벽시계 기준 처리량
+- main CPU ms/feed: 메인 프로세스(이벤트 루프)가 피드당 쓴 CPU 시간 - 풀을 쓰면 GIL을 잡는 시간이
+  본문 전달과 튜플 복원만 남아 그만큼 수집/발행에 돌아간다
+- parity: 두 경로의 ArticleRecord가 같은지
+
+코어 수보다 워커가 많으면 이득이 없고, 코어가 하나뿐이면 프로세스 간 전달 비용만큼 느려진다.
+
+사용법 (post_observer 디렉토리에서):
+    python benchmarks/parse_pool.py
+    python benchmarks/parse_pool.py --feeds 600 --workers 1 2 4
+"""
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.parsers.parse_pool import ParsePool
+from app.services.rss_service import PARSER_MAP
+from feed_fixtures import DEFAULT_ITEMS, render_feed
+
+PLATFORMS = list(DEFAULT_ITEMS)
+
+# warm: render_feed 기본 최신 글(2025-11-17 03:00 UTC)부터 2개만 watermark 이후
+WARM_WATERMARK = datetime(2025, 11, 15, 3, 0)
+
+def build_corpus(feeds: int):
+    """(platform, rss_url, content) 목록 - 플랫폼을 번갈아 가며 계정마다 다른 본문"""
+    corpus = []
+    for i in range(feeds):
+        platform = PLATFORMS[i % len(PLATFORMS)]
+        account_id = f"bench{i}"
+        corpus.append((platform, f"bench://{platform}/{account_id}", render_feed(platform, account_id, seed=i)))
+    return corpus
+
+async def parse_inline(corpus, watermark):
+    """수집 태스크에서 바로 파싱 (기존 경로)"""
+    results = []
+    for platform, rss_url, content in corpus:
+        results.append(PARSER_MAP[platform].parse_content(content, rss_url, watermark))
+        # 수집 태스크처럼 피드마다 이벤트 루프에 양보
+        await asyncio.sleep(0)
+    return results
+
+async def parse_pooled(pool: ParsePool, corpus, watermark, inflight: int):
+    """수집 태스크가 동시에 본문을 워커로 넘기는 경로 (MAX_INFLIGHT_FEEDS처럼 동시 요청 수 제한)"""
+    semaphore = asyncio.Semaphore(inflight)
+
+    async def one(platform, rss_url, content):
+        async with semaphore:
+            return await PARSER_MAP[platform]._parse_in_pool(pool, content, rss_url, watermark)
+
+    return await asyncio.gather(*(one(*feed) for feed in corpus))
+
+def measure(label: str, run):
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    results = run()
+    return label, time.perf_counter() - wall, time.process_time() - cpu, results
+
+def dump(results):
+    return [[article.to_dict() for article in articles] for articles in results]
+
+def main(args) -> bool:
+    corpus = build_corpus(args.feeds)
+    size = sum(len(content) for _, _, content in corpus)
+    print(
+        f"{args.feeds} feeds ({size / 1024 / 1024:.1f} MiB, {', '.join(PLATFORMS)}), "
+        f"{os.cpu_count()} CPUs, in-flight {args.inflight}\n"
+    )
+
+    ok = True
+    print(f"{'mode':<6}{'path':<12}{'sec':>8}{'feeds/s':>10}{'articles/s':>12}{'main CPU ms/feed':>18}{'speedup':>9}  parity")
+    for mode, watermark in (("full", None), ("warm", WARM_WATERMARK)):
+        measurements = [measure("inline", lambda: asyncio.run(parse_inline(corpus, watermark)))]
+        for workers in args.workers:
+            with ParsePool(workers) as pool:
+                # 워커 프로세스 기동(import)은 실행당 한 번이므로 측정에서 제외
+                asyncio.run(parse_pooled(pool, corpus[:workers * 2], watermark, args.inflight))
+                measurements.append(measure(
+                    f"pool x{workers}", lambda: asyncio.run(parse_pooled(pool, corpus, watermark, args.inflight))
+                ))
+
+        baseline_wall = measurements[0][1]
+        expected = dump(measurements[0][3])
+        for label, wall, cpu, results in measurements:
+            articles = sum(len(r) for r in results)
+            same = dump(results) == expected
+            ok = ok and same
+            print(
+                f"{mode:<6}{label:<12}{wall:>8.2f}{args.feeds / wall:>10.0f}{articles / wall:>12.0f}"
+                f"{cpu / args.feeds * 1000:>18.2f}{baseline_wall / wall:>8.2f}x  {'ok' if same else 'MISMATCH'}"
+            )
+    return ok
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--feeds", type=int, default=300, help="파싱할 피드 수 (플랫폼 번갈아)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="비교할 워커 수")
+    parser.add_argument("--inflight", type=int, default=20, help="동시에 워커로 넘기는 피드 수 (MAX_INFLIGHT_FEEDS)")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    # 피드마다 남는 파싱 로그는 숨김
+    logging.disable(logging.WARNING)
+    sys.exit(0 if main(parse_args()) else 1)
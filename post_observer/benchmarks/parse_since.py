@@ -0,0 +1,81 @@
+"""
+RSS 정규화 벤치마크
+parse_content (전체 정규화) vs iter_content_since (watermark 이후 글만 정규화)
+
+benchmarks/fixtures/*.xml (플랫폼별 기록 피드)에 대해 새 글이 1개뿐인 일반적인 실행을 가정하고
+피드 한 개당 처리 시간을 비교한다. xml ms는 플랫폼 파서 백엔드(feed_backend)의 문서 파싱만의 시간으로,
+두 방식 모두 이 비용은 그대로 내고 그 뒤의 정규화 비용만 줄어든다. 글 순서를 섞은 피드로 정렬되지 않은 피드 fallback 결과도 확인한다.
+
+사용법 (post_observer 디렉토리에서):
+    python benchmarks/parse_since.py          # 피드당 200회
+    python benchmarks/parse_since.py 1000
+"""
+import os
+import sys
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.parsers import base
+from app.parsers.feed_backend import iter_entries
+from app.services.rss_service import PARSER_MAP
+from feed_fixtures import DEFAULT_ITEMS, load_fixture, render_feed
+
+def newest_watermark(articles):
+    """가장 최근 글 1개만 새 글이 되는 watermark"""
+    newest = max(article.published_at for article in articles)
+    return (newest - timedelta(seconds=1)).replace(tzinfo=None)
+
+def timed(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+def run(repeat: int):
+    print(f"{'platform':<10}{'items':>7}{'xml ms':>9}{'full ms':>10}{'since ms':>10}{'normalize full/since ms':>26}")
+    for platform in DEFAULT_ITEMS:
+        parser = PARSER_MAP[platform]
+        content = load_fixture(platform)
+        rss_url = f"fixture://{platform}"
+
+        articles = parser.parse_content(content, rss_url)
+        watermark = newest_watermark(articles)
+        since = list(parser.iter_content_since(content, rss_url, watermark))
+        assert len(since) == 1, f"{platform}: expected 1 new article, got {len(since)}"
+
+        xml_ms = timed(lambda: list(iter_entries(content, parser.feed_backend, rss_url)), repeat)
+        full_ms = timed(lambda: parser.parse_content(content, rss_url), repeat)
+        since_ms = timed(lambda: list(parser.iter_content_since(content, rss_url, watermark)), repeat)
+
+        # 문서 파싱 결과를 재사용해 정규화 단계만 측정
+        entries = list(iter_entries(content, parser.feed_backend, rss_url))
+        base.iter_entries = lambda *_args: iter(entries)
+        try:
+            norm_full_ms = timed(lambda: parser.parse_content(content, rss_url), repeat)
+            norm_since_ms = timed(lambda: list(parser.iter_content_since(content, rss_url, watermark)), repeat)
+        finally:
+            base.iter_entries = iter_entries
+
+        print(
+            f"{platform:<10}{len(articles):>7}{xml_ms:>9.2f}{full_ms:>10.2f}{since_ms:>10.2f}"
+            f"{norm_full_ms:>17.3f} / {norm_since_ms:.3f}"
+        )
+
+    print("\nunordered fallback")
+    for platform in DEFAULT_ITEMS:
+        parser = PARSER_MAP[platform]
+        content = render_feed(platform, seed=len(platform), shuffle=True)
+        rss_url = f"fixture://{platform}/shuffled"
+
+        articles = parser.parse_content(content, rss_url)
+        watermark = newest_watermark(articles)
+        expected = {a.link for a in articles if a.published_at.replace(tzinfo=None) > watermark}
+        got = {a.link for a in parser.iter_content_since(content, rss_url, watermark)}
+        status = "ok" if got == expected else f"MISMATCH {len(got)} != {len(expected)}"
+        print(f"{platform:<10}{len(articles):>7}  new={len(got)} {status}")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,87 @@
+"""
+사용자-플랫폼 조회 메모리 벤치마크
+get_all_user_platforms (리스트) vs iter_user_platforms (서버 사이드 커서 스트리밍)
+
+합성 USER_PLATFORM 행을 로컬 SQLite에 만들고, 각 방식으로 전체 행을 순회할 때의
+최대 메모리(tracemalloc)와 첫 행까지 걸린 시간을 출력한다.
+
+사용법 (post_observer 디렉토리에서):
+    python benchmarks/stream_user_platforms.py            # 10k, 100k
+    python benchmarks/stream_user_platforms.py 10000 50000
+"""
+import os
+import sys
+import time
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "jandi_bench_user_platforms.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from app.dependencies.database import Base, engine, SessionLocal
+from app.models.db_models import User, Platform, UserPlatform
+from app.services import platform_service
+from bench_db import sqlite_safe_uuid
+
+PLATFORMS = ["naver", "tistory", "velog"]
+
+def seed(rows: int):
+    """USER / PLATFORM / USER_PLATFORM 합성 데이터 생성"""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    try:
+        platform_ids = {}
+        for name in PLATFORMS:
+            platform_id = sqlite_safe_uuid()
+            platform_ids[name] = platform_id
+            db.add(Platform(platform_id=platform_id, name=name))
+
+        base = datetime(2025, 1, 1)
+        users, user_platforms = [], []
+        for i in range(rows):
+            user_id = sqlite_safe_uuid()
+            users.append({"user_id": user_id, "email": f"user{i}@example.com", "name": f"user{i}"})
+            user_platforms.append({
+                "user_id": user_id,
+                "platform_id": platform_ids[PLATFORMS[i % len(PLATFORMS)]],
+                "account_id": f"account{i}",
+                "last_upload": base + timedelta(minutes=i),
+            })
+        db.bulk_insert_mappings(User, users)
+        db.bulk_insert_mappings(UserPlatform, user_platforms)
+        db.commit()
+    finally:
+        db.close()
+
+def measure(label: str, iterate):
+    """전체 순회 시 최대 메모리와 첫 행까지 걸린 시간 측정"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    first_row = None
+    count = 0
+    for _ in iterate():
+        if first_row is None:
+            first_row = time.perf_counter() - started
+        count += 1
+    total = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<24} rows={count:<7} peak={peak / 1024 / 1024:8.2f} MiB  "
+          f"first_row={(first_row or 0) * 1000:8.1f} ms  total={total:6.2f} s")
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+
+    for rows in sizes:
+        print(f"\n[{rows} rows]")
+        seed(rows)
+        measure("get_all_user_platforms", platform_service.get_all_user_platforms)
+        measure("iter_user_platforms", platform_service.iter_user_platforms)
+
+    os.remove(DB_PATH)
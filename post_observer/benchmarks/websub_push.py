@@ -0,0 +1,346 @@
+"""
+WebSub 푸시 수신 검증 / 지연 측정
+
+로컬 대역 허브(stand-in hub)와 피드 서버를 띄우고 daemon(ObserverDaemon)을 그대로 돌린다.
+- 허브: 구독 요청에 202 응답 후 콜백으로 구독 의사 확인(hub.challenge), publish하면 토픽의 현재 피드 문서를
+  X-Hub-Signature(sha256 HMAC)와 함께 구독자 콜백으로 배포
+- 피드 서버: 짝수 번째 피드만 rel="hub" 광고 (나머지는 폴링으로만 수집)
+- DB: SQLite 임시 파일, 브로커: 발행 메시지를 메모리에 모으는 가짜 RabbitMQ 연결
+
+확인 항목:
+1. 첫 tick에 허브를 찾아 구독하고, 허브 확인으로 구독이 활성화됨
+2. 구독이 확인된 피드는 다음 tick부터 폴링하지 않고, 광고하지 않는 피드는 계속 폴링 (fallback)
+3. 허브 배포 → new_posts 발행까지 지연 (tick 간격과 무관) vs 폴링 피드의 새 글 발견 지연
+4. 같은 문서를 다시 배포하면 발행하지 않음, 서명이 틀린 배포는 무시, 모르는 콜백은 410
+
+적응형 수집 주기를 끄고(매 tick 전체 폴링) 돌려서 폴링이 줄어드는 양을 그대로 보여준다.
+
+사용법 (post_observer 디렉토리에서):
+    python benchmarks/websub_push.py
+    python benchmarks/websub_push.py --feeds 60 --pushes 20 --tick 3
+"""
+import os
+import sys
+import hmac
+import json
+import time
+import socket
+import asyncio
+import hashlib
+import logging
+import argparse
+import tempfile
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from feed_fixtures import render_feed
+from bench_db import sqlite_safe_uuid
+from observer_harness import CapturingBroker
+
+# 가장 최근 글 발행 시각 (seed 시 last_upload)
+BASE_PUBLISHED = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(days=1)
+POST_INTERVAL = timedelta(hours=1)
+ITEMS = 5
+
+# ---------------------------------------------------------------------------
+# 대역 허브 + 피드 서버
+# ---------------------------------------------------------------------------
+
+class StandInHub:
+    """WebSub 허브와 피드 호스트를 한 서버로 흉내 냄"""
+
+    def __init__(self):
+        self.base_url = None
+        self.versions = {}        # account_id -> 새 글 수
+        self.advertised = set()   # 허브를 광고하는 account_id
+        self.subscriptions = {}   # topic -> {callback: secret}
+        self.polls = {}           # account_id -> 폴링 횟수
+        self.lock = threading.Lock()
+
+    @property
+    def hub_url(self):
+        return f"{self.base_url}/hub"
+
+    def topic(self, account_id: str) -> str:
+        return f"{self.base_url}/feed/velog/{account_id}"
+
+    def feed(self, account_id: str) -> bytes:
+        version = self.versions[account_id]
+        hub = (self.hub_url, self.topic(account_id)) if account_id in self.advertised else None
+        return render_feed(
+            "velog", account_id, items=ITEMS, newest=BASE_PUBLISHED + POST_INTERVAL * version,
+            interval=POST_INTERVAL, new_posts=version, hub=hub,
+        )
+
+    def newest_link(self, account_id: str) -> str:
+        """현재 피드의 가장 최근 글 링크 (render_feed의 글 번호 규칙)"""
+        post_id = 224000000000 + ITEMS + self.versions[account_id]
+        for line in self.feed(account_id).decode().splitlines():
+            if line.startswith("<link>") and line.endswith(f"-{post_id}</link>"):
+                return line[len("<link>"):-len("</link>")]
+        raise AssertionError(f"newest link not found for {account_id}")
+
+    def verify(self, topic: str, callback: str, secret: str, lease_seconds: str):
+        """구독 의사 확인 (WebSub: 콜백이 hub.challenge를 그대로 돌려줘야 구독 성립)"""
+        import httpx
+        challenge = os.urandom(8).hex()
+        response = httpx.get(callback, params={
+            "hub.mode": "subscribe", "hub.topic": topic, "hub.challenge": challenge, "hub.lease_seconds": lease_seconds,
+        })
+        if response.status_code == 200 and response.text == challenge:
+            with self.lock:
+                self.subscriptions.setdefault(topic, {})[callback] = secret
+
+    def publish(self, account_id: str, bump: bool = True, secret_override: str = None) -> list:
+        """새 글을 올리고(bump) 토픽 구독자에게 현재 피드 문서 배포, 콜백 응답 코드 반환"""
+        import httpx
+        if bump:
+            self.versions[account_id] += 1
+        topic = self.topic(account_id)
+        body = self.feed(account_id)
+        statuses = []
+        for callback, secret in list(self.subscriptions.get(topic, {}).items()):
+            signature = hmac.new((secret_override or secret).encode(), body, hashlib.sha256).hexdigest()
+            response = httpx.post(callback, content=body, headers={
+                "Content-Type": "application/rss+xml", "X-Hub-Signature": f"sha256={signature}",
+            })
+            statuses.append(response.status_code)
+        return statuses
+
+    def serve(self):
+        hub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = urlsplit(self.path).path
+                if not path.startswith("/feed/velog/"):
+                    return self._send(404, b"")
+                account_id = path[len("/feed/velog/"):]
+                with hub.lock:
+                    hub.polls[account_id] = hub.polls.get(account_id, 0) + 1
+                self._send(200, hub.feed(account_id), "application/rss+xml; charset=utf-8")
+
+            def do_POST(self):
+                form = {k: v[0] for k, v in parse_qs(self.rfile.read(int(self.headers["Content-Length"])).decode()).items()}
+                if self.path != "/hub" or form.get("hub.mode") != "subscribe":
+                    return self._send(400, b"")
+                self._send(202, b"")
+                threading.Thread(target=hub.verify, args=(
+                    form["hub.topic"], form["hub.callback"], form.get("hub.secret", ""), form.get("hub.lease_seconds", "")
+                ), daemon=True).start()
+
+            def _send(self, status, body, content_type="text/plain"):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+# ---------------------------------------------------------------------------
+# 하네스
+# ---------------------------------------------------------------------------
+
+def seed(feeds: int):
+    """velog 피드마다 사용자 한 명 (last_upload = 피드의 현재 최신 글)"""
+    from app.dependencies.database import Base, engine, SessionLocal
+    from app.models.db_models import User, Platform, UserPlatform
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    try:
+        platform_id = sqlite_safe_uuid()
+        db.add(Platform(platform_id=platform_id, name="velog"))
+        for i in range(feeds):
+            user_id = sqlite_safe_uuid()
+            db.add(User(user_id=user_id, email=f"user{i}@example.com", name=f"user{i}"))
+            db.add(UserPlatform(
+                user_id=user_id, platform_id=platform_id, account_id=f"push{i}",
+                last_upload=BASE_PUBLISHED.replace(tzinfo=None),
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+async def _wait_for(predicate, timeout: float) -> float:
+    """predicate가 참이 될 때까지 기다린 시간 (초과하면 -1)"""
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if predicate():
+            return time.perf_counter() - started
+        await asyncio.sleep(0.005)
+    return -1.0
+
+def _percentile(values, q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+async def scenario(args, hub: StandInHub, receiver_port: int) -> bool:
+    import httpx
+    from app.dependencies.rabbitmq import RabbitMQPublisher
+    from app.dependencies.health_server import start_health_server
+    from app.services.daemon_service import ObserverDaemon
+
+    broker = CapturingBroker()
+    import app.dependencies.rabbitmq as rabbitmq
+    rabbitmq.get_rabbitmq_connection = broker.connect
+
+    def published_links():
+        return {json.loads(body)["article"]["link"] for queue, body in broker.messages if queue == "new_posts"}
+
+    def new_posts_count():
+        return sum(1 for queue, _ in broker.messages if queue == "new_posts")
+
+    checks = []
+
+    def check(name: str, ok: bool, detail: str = ""):
+        checks.append(ok)
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}{f' - {detail}' if detail else ''}")
+
+    hub_feeds = sorted(hub.advertised)
+    poll_feeds = sorted(set(hub.versions) - hub.advertised)
+
+    with RabbitMQPublisher() as publisher:
+        daemon = ObserverDaemon(publisher, tick_seconds=args.tick)
+        server = start_health_server(receiver_port, daemon.health, host="127.0.0.1", routes=daemon.routes())
+        stop = asyncio.Event()
+        task = asyncio.create_task(daemon.run(stop))
+
+        # 1. 첫 tick: 모든 피드 폴링, 허브 광고 피드 구독 → 허브 확인
+        waited = await _wait_for(
+            lambda: sum(len(callbacks) for callbacks in hub.subscriptions.values()) == len(hub_feeds), 10
+        )
+        check("subscribed via stand-in hub", waited >= 0,
+              f"{len(hub.subscriptions)}/{len(hub_feeds)} topics verified in {waited:.2f}s")
+
+        # 2. 다음 tick부터 구독한 피드는 폴링하지 않음
+        with hub.lock:
+            hub.polls.clear()
+        ticks = daemon.ticks
+        await _wait_for(lambda: daemon.ticks >= ticks + 2, args.tick * 3 + 5)
+        with hub.lock:
+            polled = dict(hub.polls)
+        hub_polls = sum(polled.get(account, 0) for account in hub_feeds)
+        fallback_polls = sum(polled.get(account, 0) for account in poll_feeds)
+        check("subscribed feeds skipped by polling", hub_polls == 0 and fallback_polls >= len(poll_feeds),
+              f"2 ticks: {hub_polls} polls of {len(hub_feeds)} pushed feeds, {fallback_polls} polls of {len(poll_feeds)} polled feeds")
+
+        # 3. 배포 → 발행 지연
+        push_latencies = []
+        for i in range(args.pushes):
+            account_id = hub_feeds[i % len(hub_feeds)]
+            started = time.perf_counter()
+            statuses = await asyncio.to_thread(hub.publish, account_id)
+            link = hub.newest_link(account_id)
+            waited = await _wait_for(lambda: link in published_links(), args.tick * 3 + 5)
+            push_latencies.append(time.perf_counter() - started if waited >= 0 else float("inf"))
+            if statuses != [202]:
+                check("callback accepted notification", False, f"statuses {statuses}")
+        delivered = sum(1 for latency in push_latencies if latency != float("inf"))
+        check("pushed posts published", delivered == args.pushes, f"{delivered}/{args.pushes}")
+
+        # 폴링 피드의 새 글은 다음 tick에서야 발견
+        poll_latencies = []
+        for account_id in poll_feeds[:3]:
+            started = time.perf_counter()
+            hub.versions[account_id] += 1
+            link = hub.newest_link(account_id)
+            await _wait_for(lambda: link in published_links(), args.tick * 3 + 5)
+            poll_latencies.append(time.perf_counter() - started)
+
+        # 4. 중복 배포 / 잘못된 서명 / 모르는 콜백
+        # 진행 중인 폴링 tick의 refresh 메시지는 세지 않음
+        count = new_posts_count()
+        await asyncio.to_thread(hub.publish, hub_feeds[0], False)
+        await asyncio.sleep(0.5)
+        check("duplicate push not republished", new_posts_count() == count)
+
+        hub.versions[hub_feeds[1]] += 1
+        statuses = await asyncio.to_thread(hub.publish, hub_feeds[1], False, "wrong-secret")
+        forged = hub.newest_link(hub_feeds[1])
+        await asyncio.sleep(0.5)
+        check("bad signature ignored", statuses == [202] and forged not in published_links(), f"statuses {statuses}")
+
+        async with httpx.AsyncClient() as client:
+            response = await client.post(
+                f"http://127.0.0.1:{receiver_port}/websub/unknown", content=b"<rss/>",
+                headers={"X-Hub-Signature": "sha256=00"},
+            )
+        check("unknown callback gone", response.status_code == 410, f"HTTP {response.status_code}")
+
+        stop.set()
+        await task
+        server.shutdown()
+
+    print()
+    print(f"{'path':<8}{'count':>7}{'p50 ms':>10}{'max ms':>10}")
+    for label, values in (("push", push_latencies), ("poll", poll_latencies)):
+        finite = [value for value in values if value != float("inf")]
+        print(f"{label:<8}{len(values):>7}{_percentile(finite, 0.5) * 1000:>10.1f}{max(finite, default=0) * 1000:>10.1f}")
+    print(f"(tick {args.tick}s: polling latency is bounded by the tick interval, push latency is not)")
+    return all(checks)
+
+def run(args) -> bool:
+    hub = StandInHub()
+    server = hub.serve()
+    receiver_port = _free_port()
+
+    # 앱 모듈이 import 시점에 읽는 설정
+    db_path = os.path.join(tempfile.gettempdir(), "jandi_bench_websub.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["OBSERVER_WEBSUB_CALLBACK_URL"] = f"http://127.0.0.1:{receiver_port}"
+    os.environ["OBSERVER_ADAPTIVE_SCHEDULE"] = "false"
+    logging.basicConfig(level=getattr(logging, args.log_level))
+
+    from app.services import rss_service
+
+    # 파서가 만든 원래 RSS URL을 대역 피드 서버로 변경
+    rss_service.PARSER_MAP["velog"].get_rss_url = hub.topic
+
+    for i in range(args.feeds):
+        account_id = f"push{i}"
+        hub.versions[account_id] = 0
+        if i % 2 == 0:
+            hub.advertised.add(account_id)
+    seed(args.feeds)
+
+    print(f"stand-in hub {hub.base_url}, receiver :{receiver_port}, {args.feeds} feeds ({len(hub.advertised)} advertise a hub)\n")
+    try:
+        return asyncio.run(scenario(args, hub, receiver_port))
+    finally:
+        server.shutdown()
+        if os.path.exists(db_path):
+            os.remove(db_path)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--feeds", type=int, default=20, help="velog 피드 수 (절반이 허브 광고)")
+    parser.add_argument("--pushes", type=int, default=10, help="허브 배포 횟수")
+    parser.add_argument("--tick", type=float, default=2.0, help="daemon tick 간격 (초)")
+    parser.add_argument("--log-level", default="WARNING", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    sys.exit(0 if run(parse_args()) else 1)
@@ -0,0 +1,65 @@
+import os
+import signal
+import asyncio
+import logging
+from dotenv import load_dotenv
+from app.services.daemon_service import ObserverDaemon
+from app.dependencies.database import Base, engine
+from app.dependencies.rabbitmq import RabbitMQPublisher
+from app.dependencies.health_server import start_health_server
+from app.services.shard_service import ShardConfig
+from app.models import db_models
+
+# 환경변수 로드
+load_dotenv()
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+# /healthz, /metrics 포트
+DAEMON_PORT = int(os.getenv("OBSERVER_DAEMON_PORT", "8080"))
+
+async def serve(shard: ShardConfig):
+    """SIGTERM / SIGINT를 받을 때까지 daemon 실행"""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    # 종료 시 남은 메시지 flush 후 연결 종료
+    with RabbitMQPublisher() as publisher:
+        daemon = ObserverDaemon(publisher, shard)
+        # /healthz, /metrics와 WebSub 콜백(OBSERVER_WEBSUB_CALLBACK_URL 설정 시)
+        server = start_health_server(DAEMON_PORT, daemon.health, routes=daemon.routes())
+        try:
+            await daemon.run(stop)
+        finally:
+            server.shutdown()
+
+def main():
+    """Post Observer 상주 실행 함수 (크론잡 대신 Deployment로 띄울 때 사용)"""
+    # observer 전용 테이블(FEED_CACHE 등)이 없으면 생성
+    Base.metadata.create_all(bind=engine)
+
+    # 샤드 설정 (OBSERVER_SHARD_COUNT > 1 이면 이 파드 몫의 피드만 처리)
+    shard = ShardConfig.from_env()
+
+    logger.info("=" * 60)
+    logger.info("Post Observer Daemon Starting...")
+    if shard.enabled:
+        logger.info(f"Shard mode: {shard}")
+    logger.info("=" * 60)
+
+    asyncio.run(serve(shard))
+
+    logger.info("=" * 60)
+    logger.info("Post Observer Daemon Stopped")
+    logger.info("=" * 60)
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,11 @@
-import os
 import logging
 from dotenv import load_dotenv
 from app.services.observer_service import check_new_posts, check_inactive_users
+from app.dependencies.database import Base, engine
+from app.dependencies.rabbitmq import RabbitMQPublisher
+from app.dependencies import metrics
+from app.services.shard_service import ShardConfig
+from app.models import db_models
 
 # 환경변수 로드
 load_dotenv()
@@ -16,17 +20,35 @@ logger = logging.getLogger(__name__)
 
 def main():
     """Post Observer 메인 실행 함수 (인프라 크론잡에서 호출)"""
+    # observer 전용 테이블(FEED_CACHE 등)이 없으면 생성
+    Base.metadata.create_all(bind=engine)
+
+    # 샤드 설정 (OBSERVER_SHARD_COUNT > 1 이면 이 파드 몫의 피드만 처리)
+    shard = ShardConfig.from_env()
+
     logger.info("=" * 60)
     logger.info("Post Observer Service Starting...")
+    if shard.enabled:
+        logger.info(f"Shard mode: {shard}")
     logger.info("=" * 60)
 
-    # 새 글 체크
-    logger.info("Running check_new_posts...")
-    check_new_posts()
-
-    # 미업로드 사용자 체크
-    logger.info("Running check_inactive_users...")
-    check_inactive_users() #여기서 rabbitmq메시지 발행됨
+    try:
+        with metrics.RUN_SECONDS.labels(phase="total").time():
+            # 실행 전체에서 RabbitMQ 연결 하나를 재사용 (종료 시 남은 메시지 flush)
+            with RabbitMQPublisher() as publisher:
+                # 새 글 체크
+                logger.info("Running check_new_posts...")
+                with metrics.RUN_SECONDS.labels(phase="check_new_posts").time():
+                    check_new_posts(publisher, shard)
+
+                # 미업로드 사용자 체크
+                logger.info("Running check_inactive_users...")
+                with metrics.RUN_SECONDS.labels(phase="check_inactive_users").time():
+                    check_inactive_users(publisher, shard) #여기서 rabbitmq메시지 발행됨
+        metrics.LAST_SUCCESS.set_to_current_time()
+    finally:
+        # 실패한 실행도 어느 단계까지 진행됐는지 남도록 항상 내보냄
+        metrics.push_metrics({"shard": str(shard.index)} if shard.enabled else None)
 
     logger.info("=" * 60)
     logger.info("Post Observer Service Completed")
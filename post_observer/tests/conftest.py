@@ -0,0 +1,97 @@
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+import httpx
+import pytest
+
+# app은 import할 때 DATABASE_URL로 엔진을 만든다. 테스트는 임시 sqlite 파일을 쓴다. (저장소 테스트는 필요한 테이블만 만들고 지움)
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'jandi_test_post_observer.db')}")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# 테스트 피드는 벤치마크와 같은 플랫폼 피드 생성기(benchmarks/feed_fixtures.py)로 만든다
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from bench_db import sqlite_safe_uuid
+from feed_fixtures import render_feed
+from observer_harness import CapturingBroker
+
+class Seeder:
+    """테스트용 USER / PLATFORM / USER_PLATFORM 행 생성"""
+
+    def __init__(self, session):
+        self.session = session
+        self.platform_ids = {}
+
+    def user_platform(self, platform_name: str, account_id: str, last_upload=None, user_id=None):
+        """사용자 한 명과 그 사용자의 플랫폼 연동 추가 (user_id 반환)"""
+        from app.models.db_models import User, Platform, UserPlatform
+
+        if platform_name not in self.platform_ids:
+            self.platform_ids[platform_name] = sqlite_safe_uuid()
+            self.session.add(Platform(platform_id=self.platform_ids[platform_name], name=platform_name))
+        user_id = user_id or sqlite_safe_uuid()
+        self.session.add(User(user_id=user_id, email=f"{user_id.hex}@example.com", name=user_id.hex[:8]))
+        self.session.add(UserPlatform(
+            user_id=user_id, platform_id=self.platform_ids[platform_name], account_id=account_id, last_upload=last_upload,
+        ))
+        self.session.commit()
+        return user_id
+
+    def last_upload(self, user_id):
+        from app.models.db_models import UserPlatform
+
+        self.session.expire_all()
+        return self.session.query(UserPlatform.last_upload).filter(UserPlatform.user_id == user_id).scalar()
+
+@pytest.fixture
+def seeder():
+    """모든 테이블을 새로 만든 임시 DB와 행 생성 도우미"""
+    from app.dependencies.database import Base, engine, SessionLocal
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield Seeder(session)
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture
+def broker(monkeypatch):
+    """RabbitMQPublisher가 커밋한 메시지를 모으는 가짜 브로커"""
+    from app.dependencies import rabbitmq
+
+    broker = CapturingBroker()
+    monkeypatch.setattr(rabbitmq, "get_rabbitmq_connection", broker.connect)
+    return broker
+
+class FeedHost:
+    """velog 피드를 계정 이름으로 만들어 주는 httpx.MockTransport 핸들러 (받은 요청 계정을 기록)"""
+
+    def __init__(self, items: int = 3, newest: datetime = datetime(2025, 11, 17, 5, 0)):
+        self.items = items
+        self.newest = newest
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        # https://v2.velog.io/rss/@{account_id}
+        account_id = request.url.path.rsplit("/", 1)[-1].lstrip("@")
+        self.requests.append(account_id)
+        return httpx.Response(200, content=render_feed(
+            "velog", account_id, items=self.items, newest=self.newest, interval=timedelta(hours=1),
+        ))
+
+@pytest.fixture
+def feed_host(monkeypatch):
+    """check_new_posts가 FeedHost로 수집하도록 설정 (적응형 수집 주기는 끄고 매 실행 모든 피드 수집)"""
+    from app.dependencies.http_client import FeedClient
+    from app.services import observer_service, schedule_service
+
+    host = FeedHost()
+    monkeypatch.setattr(schedule_service, "ADAPTIVE_SCHEDULE_ENABLED", False)
+    monkeypatch.setattr(
+        observer_service, "create_feed_client", lambda: FeedClient(httpx.AsyncClient(transport=httpx.MockTransport(host)))
+    )
+    return host
@@ -0,0 +1,139 @@
+import json
+from functools import partial
+from itertools import islice
+from datetime import datetime
+import pytest
+from app.dependencies.database import SessionLocal
+from app.models.db_models import ObserverCheckpoint, ObserverCheckpointFeed
+from app.services import observer_service, platform_service
+from app.services.checkpoint_service import (
+    RunCheckpoint, OUTCOME_FAILED, OUTCOME_NEW_POSTS, OUTCOME_NO_NEW_POSTS, STATUS_RUNNING, STATUS_STOPPED,
+)
+from app.services.platform_service import LastUploadBatch, UserPlatformInfo
+
+NEWEST = datetime(2025, 11, 17, 3, 0)
+ACCOUNTS = [f"a{i}" for i in range(6)]
+
+def user_platforms():
+    return [UserPlatformInfo(f"u{i}", "velog", account_id, last_upload=NEWEST) for i, account_id in enumerate(ACCOUNTS)]
+
+def accounts(ups):
+    return [up.account_id for up in ups]
+
+def checkpoint_row():
+    db = SessionLocal()
+    try:
+        row = db.get(ObserverCheckpoint, 0)
+        return None if row is None else (row.status, row.new_posts, row.remaining_feeds)
+    finally:
+        db.close()
+
+def killed_run(records):
+    """결과를 저장한 뒤 complete 없이 끝난 (파드가 죽은) 실행"""
+    checkpoint = RunCheckpoint()
+    checkpoint.start()
+    for account_id, outcome, new_posts in records:
+        checkpoint.record("velog", account_id, outcome, new_posts)
+    checkpoint.save()
+    return checkpoint
+
+def test_resume_moves_processed_feeds_to_the_back(seeder):
+    killed_run([("a1", OUTCOME_NEW_POSTS, 2), ("a3", OUTCOME_NO_NEW_POSTS, 0), ("a4", OUTCOME_FAILED, 0)])
+
+    checkpoint = RunCheckpoint()
+    checkpoint.start()
+    assert checkpoint.resumed_from == STATUS_RUNNING
+    # 실패한 피드는 처리하지 못한 피드와 함께 먼저, 두 구간은 각각 정렬 순서 유지
+    assert accounts(checkpoint.order(user_platforms)) == ["a0", "a2", "a4", "a5", "a1", "a3"]
+
+def test_new_run_keeps_order(seeder):
+    checkpoint = RunCheckpoint()
+    checkpoint.start()
+    assert checkpoint.resumed_from is None
+    assert accounts(checkpoint.order(user_platforms)) == ACCOUNTS
+
+def test_killed_run_new_posts_carried(seeder):
+    killed_run([("a0", OUTCOME_NEW_POSTS, 2), ("a1", OUTCOME_NEW_POSTS, 3)])
+
+    checkpoint = RunCheckpoint()
+    checkpoint.start()
+    assert checkpoint.carried_new_posts == 5
+    # 이어받은 실행이 저장한 새 글 수도 같은 행에 누적
+    checkpoint.record("velog", "a2", OUTCOME_NEW_POSTS, 1)
+    checkpoint.save()
+    assert checkpoint_row() == (STATUS_RUNNING, 6, None)
+
+def test_deadline_cut_reports_then_carries_next_run(seeder):
+    # 시간 예산으로 멈춘 실행은 새 글 수를 refresh로 보고했으므로 비우고 처리 기록만 남김
+    stopped = killed_run([("a0", OUTCOME_NEW_POSTS, 2), ("a1", OUTCOME_NEW_POSTS, 1)])
+    stopped.complete(remaining_feeds=4)
+    assert checkpoint_row() == (STATUS_STOPPED, 0, 4)
+
+    resumed = RunCheckpoint()
+    resumed.start()
+    assert resumed.resumed_from == STATUS_STOPPED and resumed.carried_new_posts == 0
+    # 이어받은 실행이 피드 하나만 처리하고 죽으면 그 실행의 새 글 수만 다음 실행이 이어받음
+    assert accounts(islice(resumed.order(user_platforms), 4)) == ["a2", "a3", "a4", "a5"]
+    resumed.record("velog", "a2", OUTCOME_NEW_POSTS, 3)
+    resumed.save()
+
+    after = RunCheckpoint()
+    after.start()
+    assert after.carried_new_posts == 3
+    assert accounts(after.order(user_platforms)) == ["a3", "a4", "a5", "a0", "a1", "a2"]
+    # 미룬 피드까지 모두 넘긴 실행이 저장하면 이전 실행들의 처리 기록은 정리
+    after.record("velog", "a3", OUTCOME_NO_NEW_POSTS)
+    after.save()
+    db = SessionLocal()
+    assert [row.account_id for row in db.query(ObserverCheckpointFeed)] == ["a3"]
+    db.close()
+
+def test_completed_pass_clears_checkpoint(seeder):
+    killed_run([("a0", OUTCOME_NEW_POSTS, 1)])
+    checkpoint = RunCheckpoint()
+    checkpoint.start()
+    for up in checkpoint.order(user_platforms):
+        checkpoint.record(up.platform_name, up.account_id, OUTCOME_NO_NEW_POSTS)
+    checkpoint.complete()
+    assert checkpoint_row() is None
+    db = SessionLocal()
+    assert db.query(ObserverCheckpointFeed).count() == 0
+    db.close()
+
+class StreamError(Exception):
+    pass
+
+def test_stream_error_keeps_checkpoint(seeder, broker, feed_host, monkeypatch):
+    for account_id in ACCOUNTS:
+        seeder.user_platform("velog", account_id, last_upload=NEWEST)
+
+    # 피드마다 처리 결과를 저장하도록 한 번에 한 피드씩 청크 하나로
+    monkeypatch.setattr(observer_service, "MAX_INFLIGHT_FEEDS", 1)
+    monkeypatch.setattr(platform_service, "LastUploadBatch", partial(LastUploadBatch, chunk_size=1))
+    # 목록을 네 행 읽은 뒤 DB 오류
+    read = []
+
+    def failing_info(*args, **kwargs):
+        if len(read) == 4:
+            raise StreamError("connection lost")
+        read.append(kwargs["account_id"])
+        return UserPlatformInfo(*args, **kwargs)
+
+    monkeypatch.setattr(platform_service, "UserPlatformInfo", failing_info)
+    with pytest.raises(StreamError):
+        observer_service.check_new_posts()
+    # 일부만 처리한 실행을 끝난 것으로 보지 않음 (refresh 없이 체크포인트 유지)
+    assert [queue for queue, _ in broker.messages if queue == "refresh"] == []
+    status, carried, _ = checkpoint_row()
+    assert status == STATUS_RUNNING
+    published = sum(queue == "new_posts" for queue, _ in broker.messages)
+    assert 0 < carried == published < 2 * len(ACCOUNTS)
+
+    monkeypatch.setattr(platform_service, "UserPlatformInfo", UserPlatformInfo)
+    summary = observer_service.check_new_posts()
+    new_posts = [json.loads(body)["article"]["link"] for queue, body in broker.messages if queue == "new_posts"]
+    refresh = [json.loads(body)["count"] for queue, body in broker.messages if queue == "refresh"]
+    # 모든 피드의 새 글을 한 번씩 발행하고, 앞선 실행이 발행한 개수까지 합산해 보고
+    assert len(new_posts) == len(set(new_posts)) == 2 * len(ACCOUNTS)
+    assert refresh == [len(new_posts)] and summary.new_posts + carried == len(new_posts)
+    assert checkpoint_row() is None
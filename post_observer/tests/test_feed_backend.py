@@ -0,0 +1,32 @@
+import pytest
+from app.parsers import feed_backend
+from app.parsers.feed_backend import FEEDPARSER, LEAN, LeanFeedError, iter_lean_entries
+from feed_fixtures import DEFAULT_ITEMS, load_fixture, render_feed
+# 벤치마크(benchmarks/feed_backend.py)의 경계 사례 피드와 파싱 함수
+from feed_backend import EDGE_CASES, _item, _rss, dump, parse_with
+
+CASES = [(platform, load_fixture(platform)) for platform in DEFAULT_ITEMS]
+CASES += [(platform, render_feed(platform, seed=7, shuffle=True)) for platform in DEFAULT_ITEMS]
+CASES += [("velog", content.encode("utf-8")) for _, content in EDGE_CASES]
+CASES.append(("naver", _rss(_item("한글 제목"), encoding="EUC-KR").encode("euc-kr")))
+IDS = [f"fixture-{p}" for p in DEFAULT_ITEMS] + [f"shuffled-{p}" for p in DEFAULT_ITEMS] + [name for name, _ in EDGE_CASES] + ["euc-kr"]
+
+@pytest.fixture(autouse=True)
+def lean_enabled(monkeypatch):
+    monkeypatch.setattr(feed_backend, "LEAN_FEED_PARSER_ENABLED", True)
+
+@pytest.mark.parametrize("platform, content", CASES, ids=IDS)
+def test_lean_backend_matches_feedparser(platform, content):
+    expected = dump(parse_with(platform, FEEDPARSER, content))
+    assert dump(parse_with(platform, LEAN, content)) == expected
+
+@pytest.mark.parametrize("name", ["truncated", "atom"])
+def test_lean_parser_rejects_unsupported_input(name):
+    content = dict(EDGE_CASES)[name].encode("utf-8")
+    with pytest.raises((LeanFeedError, feed_backend.ParseError)):
+        list(iter_lean_entries(content))
+
+def test_fallback_continues_after_yielded_entries():
+    content = dict(EDGE_CASES)["truncated"].encode("utf-8")
+    entries = list(feed_backend.iter_entries(content, LEAN, "test://truncated"))
+    assert len(entries) == len(feed_backend.feedparser.parse(content).entries)
@@ -0,0 +1,94 @@
+from app.dependencies.database import SessionLocal
+from app.models.db_models import FeedCache, UserPlatform
+from app.models.schemas import FeedValidatorSchema
+from app.services.feed_cache_service import FeedValidatorStore, evict_deregistered
+from app.services.platform_service import UserPlatformInfo
+
+def stored_validators():
+    db = SessionLocal()
+    try:
+        return {(row.user_id, row.platform_name): (row.account_id, row.etag, row.last_modified) for row in db.query(FeedCache)}
+    finally:
+        db.close()
+
+def fetched(etag, last_modified=None):
+    """200 응답으로 검증자가 바뀐 수집 결과"""
+    return FeedValidatorSchema(etag=etag, last_modified=last_modified, fetched=True, changed=True)
+
+def loaded_store():
+    store = FeedValidatorStore()
+    store.load()
+    return store
+
+def subscriber(user_id, account_id="a", platform_name="velog"):
+    return UserPlatformInfo(user_id, platform_name, account_id, last_upload=None)
+
+def test_store_and_load_per_user_platform(seeder):
+    first = seeder.user_platform("velog", "a")
+    second = seeder.user_platform("velog", "a")
+    store = loaded_store()
+    subscribers = [subscriber(first), subscriber(second)]
+    store.apply_shared(subscribers, fetched('"v1"', "Mon, 17 Nov 2025 03:00:00 GMT"))
+    store.save()
+    assert stored_validators() == {
+        (first, "velog"): ("a", '"v1"', "Mon, 17 Nov 2025 03:00:00 GMT"),
+        (second, "velog"): ("a", '"v1"', "Mon, 17 Nov 2025 03:00:00 GMT"),
+    }
+
+    # 다음 실행은 저장된 검증자로 조건부 요청
+    shared = loaded_store().get_shared(subscribers)
+    assert shared.request_headers() == {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 17 Nov 2025 03:00:00 GMT"}
+
+def test_update_writes_only_changed_validators(seeder):
+    first = seeder.user_platform("velog", "a")
+    other = seeder.user_platform("tistory", "b")
+    store = loaded_store()
+    store.apply_shared([subscriber(first)], fetched('"v1"'))
+    store.apply_shared([subscriber(other, "b", "tistory")], fetched('"t1"'))
+    store.save()
+
+    store = loaded_store()
+    store.apply_shared([subscriber(first)], fetched('"v2"'))
+    # 같은 검증자나 304는 저장할 것이 없음
+    store.apply_shared([subscriber(other, "b", "tistory")], fetched('"t1"'))
+    store.apply_shared([subscriber(other, "b", "tistory")], FeedValidatorSchema(fetched=True, not_modified=True))
+    batch = store.take()
+    assert [row["etag"] for row in batch.updates] == ['"v2"'] and not batch.inserts
+    assert store.write(batch)
+    assert stored_validators()[(first, "velog")] == ("a", '"v2"', None)
+    assert stored_validators()[(other, "tistory")] == ("b", '"t1"', None)
+
+def test_new_subscriber_or_account_change_gets_empty_validator(seeder):
+    first = seeder.user_platform("velog", "a")
+    store = loaded_store()
+    store.apply_shared([subscriber(first)], fetched('"v1"'))
+    store.save()
+
+    store = loaded_store()
+    # 신규 구독자가 있으면 같은 피드도 조건부 요청 없이 전체 수집
+    newcomer = seeder.user_platform("velog", "a")
+    assert store.get_shared([subscriber(first), subscriber(newcomer)]).request_headers() == {}
+    # 계정이 바뀌면 이전 계정의 검증자는 쓰지 않고, 새 계정으로 저장
+    assert loaded_store().get(first, "velog", "renamed").etag is None
+    store = loaded_store()
+    store.apply_shared([subscriber(first, "renamed")], fetched('"r1"'))
+    store.save()
+    assert stored_validators()[(first, "velog")] == ("renamed", '"r1"', None)
+
+def test_evict_deregistered(seeder):
+    kept = seeder.user_platform("velog", "a")
+    removed = seeder.user_platform("velog", "b")
+    renamed = seeder.user_platform("velog", "c")
+    store = loaded_store()
+    for user_id, account_id in ((kept, "a"), (removed, "b"), (renamed, "c")):
+        store.apply_shared([subscriber(user_id, account_id)], fetched(f'"{account_id}"'))
+    store.save()
+
+    # 연동 해제와 계정 변경
+    seeder.session.query(UserPlatform).filter(UserPlatform.user_id == removed).delete()
+    seeder.session.query(UserPlatform).filter(UserPlatform.user_id == renamed).update({"account_id": "c2"})
+    seeder.session.commit()
+
+    assert evict_deregistered() == 2
+    assert list(stored_validators()) == [(kept, "velog")]
+    assert evict_deregistered() == 0
@@ -0,0 +1,118 @@
+import asyncio
+import gzip
+import httpx
+import pytest
+from app.dependencies import http_client
+from app.dependencies.http_client import (
+    CircuitBreakerTransport, CircuitOpenError, FeedClient, HostCircuitBreaker, ResponseTooLargeError,
+)
+
+BODY = b'<?xml version="1.0"?><rss version="2.0"><channel><title>x</title></channel></rss>'
+
+def feed_client(handler, max_bytes=0):
+    return FeedClient(httpx.AsyncClient(transport=httpx.MockTransport(handler)), max_bytes=max_bytes)
+
+def fetch(client, url="https://v2.velog.io/rss/a"):
+    async def main():
+        async with client:
+            return await client.get(url)
+    return asyncio.run(main())
+
+def test_get_returns_decoded_body_with_headers():
+    def handler(request):
+        return httpx.Response(
+            200, content=gzip.compress(BODY), headers={"Content-Encoding": "gzip", "ETag": '"v1"'}
+        )
+
+    client = feed_client(handler)
+    response = fetch(client)
+    assert response.content == BODY and response.text == BODY.decode()
+    assert response.headers["etag"] == '"v1"'
+    assert "content-encoding" not in response.headers
+    assert response.headers["content-length"] == str(len(BODY))
+    response.raise_for_status()
+    assert client.stats.responses == 1 and client.stats.body_bytes == len(BODY)
+    assert client.stats.wire_bytes < client.stats.body_bytes
+
+def test_get_stops_reading_large_body():
+    client = feed_client(lambda request: httpx.Response(200, content=BODY * 10), max_bytes=len(BODY))
+    with pytest.raises(ResponseTooLargeError):
+        fetch(client)
+    assert client.stats.too_large == 1
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(http_client.time, "monotonic", clock)
+    return clock
+
+def test_circuit_opens_after_consecutive_failures(clock):
+    breaker = HostCircuitBreaker(failure_threshold=3, cooldown_seconds=30)
+    for _ in range(2):
+        breaker.record("rss.blog.naver.com", ok=False)
+    breaker.record("rss.blog.naver.com", ok=True)
+    # 성공하면 연속 실패는 처음부터
+    for _ in range(2):
+        breaker.record("rss.blog.naver.com", ok=False)
+    assert breaker.allow("rss.blog.naver.com")
+    breaker.record("rss.blog.naver.com", ok=False)
+    assert not breaker.allow("rss.blog.naver.com")
+    assert breaker.allow("v2.velog.io")
+
+def test_half_open_allows_one_probe(clock):
+    breaker = HostCircuitBreaker(failure_threshold=1, cooldown_seconds=30)
+    breaker.record("v2.velog.io", ok=False)
+    clock.now += 31
+    assert breaker.allow("v2.velog.io")
+    assert not breaker.allow("v2.velog.io")
+
+    # 프로브가 실패하면 cooldown부터 다시
+    breaker.record("v2.velog.io", ok=False, probe=True)
+    assert not breaker.allow("v2.velog.io")
+    clock.now += 31
+    assert breaker.allow("v2.velog.io")
+    breaker.record("v2.velog.io", ok=True, probe=True)
+    assert not breaker.is_open("v2.velog.io") and breaker.allow("v2.velog.io")
+
+def test_released_probe_lets_next_request_probe(clock):
+    breaker = HostCircuitBreaker(failure_threshold=1, cooldown_seconds=30)
+    breaker.record("v2.velog.io", ok=False)
+    clock.now += 31
+    assert breaker.allow("v2.velog.io")
+    breaker.release_probe("v2.velog.io")
+    assert breaker.allow("v2.velog.io")
+
+def test_shared_domain_subdomains_share_circuit(clock):
+    breaker = HostCircuitBreaker(failure_threshold=2, shared_domains=["tistory.com"])
+    breaker.record("a.tistory.com", ok=False)
+    breaker.record("b.tistory.com", ok=False)
+    assert not breaker.allow("c.tistory.com")
+    assert breaker.host_key("tistory.com") == "tistory.com"
+    assert breaker.host_key("nottistory.com") == "nottistory.com"
+
+def test_transport_records_server_errors_and_fails_fast(clock):
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.host)
+        return httpx.Response(503)
+
+    breaker = HostCircuitBreaker(failure_threshold=2, cooldown_seconds=30)
+    transport = CircuitBreakerTransport(httpx.MockTransport(handler), breaker)
+
+    async def main():
+        async with httpx.AsyncClient(transport=transport) as client:
+            for _ in range(2):
+                assert (await client.get("https://v2.velog.io/rss/a")).status_code == 503
+            with pytest.raises(CircuitOpenError):
+                await client.get("https://v2.velog.io/rss/b")
+
+    asyncio.run(main())
+    assert len(calls) == 2
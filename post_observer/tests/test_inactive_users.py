@@ -0,0 +1,79 @@
+import json
+import uuid
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy.exc import OperationalError
+from app.dependencies.database import engine
+from app.models.db_models import UserPlatform
+from app.services import platform_service
+from app.services.observer_service import check_inactive_users
+from app.services.platform_service import iter_inactive_user_pages, mark_reminded
+from app.services.shard_service import ShardConfig
+
+# check_inactive_users는 현재 시각 기준
+NOW = datetime.now().replace(microsecond=0)
+INACTIVE = NOW - timedelta(days=45)
+
+def keys(pages):
+    return [(user.user_id, user.platform_id) for page in pages for user in page]
+
+@pytest.fixture
+def users(seeder):
+    """미업로드 사용자 7명과 최근에 쓴 사용자 1명"""
+    inactive = [seeder.user_platform("velog", f"quiet{i}", last_upload=INACTIVE) for i in range(7)]
+    seeder.user_platform("velog", "active", last_upload=NOW - timedelta(days=1))
+    return inactive
+
+def test_keyset_pages_in_key_order(users):
+    pages = list(iter_inactive_user_pages(days=30, page_size=3, now=NOW))
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert keys(pages) == sorted(keys(pages)) and sorted(user_id for user_id, _ in keys(pages)) == sorted(users)
+    assert all(user.days_inactive == 45 for page in pages for user in page)
+
+def test_marking_pages_during_sweep_skips_nothing(users):
+    seen = []
+    for page in iter_inactive_user_pages(days=30, page_size=2, now=NOW):
+        # 앞 페이지의 last_upload를 올려도 다음 페이지는 마지막 키 이후부터
+        assert mark_reminded(page, NOW, days=30) == len(page)
+        seen.extend(page)
+    assert sorted(user.user_id for user in seen) == sorted(users)
+    assert list(iter_inactive_user_pages(days=30, now=NOW)) == []
+
+def test_mark_reminded_keeps_rows_updated_after_lookup(users, seeder):
+    page = next(iter_inactive_user_pages(days=30, page_size=2, now=NOW))
+    # 조회한 뒤 새 글이 반영된 행은 독촉 시각으로 덮어쓰지 않음
+    seeder.session.query(UserPlatform).filter(UserPlatform.user_id == page[0].user_id).update({"last_upload": NOW})
+    seeder.session.commit()
+
+    assert mark_reminded(page, NOW - timedelta(hours=1), days=30) == 1
+    assert seeder.last_upload(page[0].user_id) == NOW
+    assert seeder.last_upload(page[1].user_id) == NOW - timedelta(hours=1)
+
+def test_shards_split_users_in_sql(users):
+    shards = [ShardConfig(index=i, count=3, run_id="run") for i in range(3)]
+    per_shard = [keys(iter_inactive_user_pages(days=30, page_size=2, now=NOW, shard=shard)) for shard in shards]
+    # 샤드 구간은 겹치지 않고 모든 사용자를 한 번씩
+    assert sorted(key for shard_keys in per_shard for key in shard_keys) == sorted(keys(iter_inactive_user_pages(days=30, now=NOW)))
+    for shard, shard_keys in zip(shards, per_shard):
+        lower, upper = shard.user_id_range()
+        assert all((lower is None or user_id >= lower) and (upper is None or user_id < upper) for user_id, _ in shard_keys)
+
+def test_shard_boundary(seeder):
+    # 두 샤드의 경계는 8000...0 (SQLite에서도 숫자가 아니라 UUID 순서로 비교)
+    below = seeder.user_platform("velog", "below", last_upload=INACTIVE, user_id=uuid.UUID("7fffffff-ffff-ffff-ffff-fffffffffffe"))
+    at = seeder.user_platform("velog", "at", last_upload=INACTIVE, user_id=uuid.UUID("80000000-0000-0000-0000-00000000000a"))
+    shards = [ShardConfig(index=i, count=2, run_id="run") for i in range(2)]
+    assert [[user_id for user_id, _ in keys(iter_inactive_user_pages(days=30, now=NOW, shard=shard))] for shard in shards] == [[below], [at]]
+
+def test_lookup_failure_is_raised(users):
+    UserPlatform.__table__.drop(bind=engine)
+    with pytest.raises(OperationalError):
+        list(iter_inactive_user_pages(days=30, now=NOW))
+
+def test_check_inactive_users_reminds_once(users, broker, monkeypatch):
+    monkeypatch.setattr(platform_service, "INACTIVE_SWEEP_PAGE_SIZE", 3)
+    assert check_inactive_users() == len(users)
+    reminded = [json.loads(body)["user_id"] for queue, body in broker.messages if queue == "mail_reminders"]
+    assert sorted(reminded) == sorted(str(user_id) for user_id in users)
+    # last_upload를 올렸으므로 다음 실행에서는 보내지 않음
+    assert check_inactive_users() == 0
@@ -0,0 +1,83 @@
+import pytest
+from app.dependencies.database import Base, engine, SessionLocal
+from app.dependencies.keyed_store import KeyedRowStore
+from app.models.db_models import FeedFingerprint
+
+@pytest.fixture
+def table():
+    FeedFingerprint.__table__.drop(bind=engine, checkfirst=True)
+    Base.metadata.create_all(bind=engine, tables=[FeedFingerprint.__table__])
+    yield
+    FeedFingerprint.__table__.drop(bind=engine)
+
+def stored_hashes():
+    db = SessionLocal()
+    try:
+        return {(row.platform_name, row.account_id): row.content_hash for row in db.query(FeedFingerprint)}
+    finally:
+        db.close()
+
+def row_builder(values):
+    return lambda key: {"platform_name": key[0], "account_id": key[1], "content_hash": values[key]} if key in values else None
+
+def new_store():
+    return KeyedRowStore(FeedFingerprint, ("platform_name", "account_id"), "feed fingerprints")
+
+def test_save_inserts_then_updates_only_changed(table):
+    values = {("velog", "a"): "1", ("velog", "b"): "2"}
+    store = new_store()
+    for key in values:
+        store.changed(key)
+    assert store.save(row_builder(values))
+    assert stored_hashes() == values
+
+    values[("velog", "a")] = "3"
+    store.changed(("velog", "a"))
+    batch = store.take(row_builder(values))
+    assert [row["account_id"] for row in batch.updates] == ["a"] and not batch.inserts
+    assert store.write(batch)
+    assert stored_hashes() == {("velog", "a"): "3", ("velog", "b"): "2"}
+    # 바뀐 것이 없으면 빈 배치
+    assert not store.take(row_builder(values))
+
+def test_load_then_delete(table):
+    values = {("velog", "a"): "1", ("tistory", "b"): "2"}
+    writer = new_store()
+    for key in values:
+        writer.changed(key)
+    writer.save(row_builder(values))
+
+    loaded = {}
+
+    def load_row(row):
+        key = (row.platform_name, row.account_id)
+        loaded[key] = row.content_hash
+        return key
+
+    store = new_store()
+    assert store.load(load_row)
+    assert loaded == values
+
+    store.deleted(("velog", "a"))
+    # 테이블에 없는 키는 지울 것이 없음
+    store.deleted(("velog", "missing"))
+    batch = store.take(row_builder(values))
+    assert batch.deleted == [("velog", "a")]
+    store.write(batch)
+    assert stored_hashes() == {("tistory", "b"): "2"}
+
+def test_failed_write_is_retried_with_current_value(table):
+    values = {("velog", "a"): "1"}
+    store = new_store()
+    store.changed(("velog", "a"))
+    batch = store.take(row_builder(values))
+    FeedFingerprint.__table__.drop(bind=engine)
+    assert not store.write(batch)
+
+    Base.metadata.create_all(bind=engine, tables=[FeedFingerprint.__table__])
+    values[("velog", "a")] = "2"
+    retry = store.take(row_builder(values))
+    # 실패한 INSERT는 다시 INSERT로
+    assert [row["content_hash"] for row in retry.inserts] == ["2"]
+    assert store.write(retry)
+    assert stored_hashes() == {("velog", "a"): "2"}
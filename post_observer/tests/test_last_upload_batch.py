@@ -0,0 +1,108 @@
+import uuid
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy.dialects import postgresql
+from app.dependencies.database import engine
+from app.models.db_models import FeedSeen
+from app.services import seen_service
+from app.services.observer_service import _flush_last_uploads
+from app.services.platform_service import LastUploadBatch, _apply_last_upload_chunk
+from app.services.seen_service import SeenSet, SeenSetBatch, link_key
+
+BEFORE = datetime(2025, 1, 1)
+AFTER = datetime(2025, 1, 2)
+
+class PostgresSession:
+    """postgresql 방언으로 문장을 컴파일하고 RETURNING 결과로 정해 둔 행만 돌려주는 세션"""
+
+    def __init__(self, returning):
+        self.returning = returning
+        self.statements = []
+
+    def get_bind(self):
+        return self
+
+    @property
+    def dialect(self):
+        return postgresql.dialect()
+
+    def execute(self, stmt):
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+        return iter(self.returning)
+
+def test_postgres_chunk_updates_from_values_and_reports_missing():
+    found, gone = uuid.uuid4(), uuid.uuid4()
+    chunk = [(found, "velog", AFTER), (gone, "velog", AFTER)]
+    db = PostgresSession(returning=[(found, "velog")])
+
+    result = _apply_last_upload_chunk(db, chunk)
+    # 청크 하나를 문장 하나로 반영
+    assert len(db.statements) == 1
+    sql = " ".join(db.statements[0].split())
+    assert sql.startswith('UPDATE "USER_PLATFORM" SET last_upload=v.last_upload FROM')
+    assert "(VALUES (" in sql and "AS v (user_id, platform_name, last_upload)" in sql
+    assert 'RETURNING "USER_PLATFORM".user_id, "PLATFORM".name' in sql
+    # RETURNING에 없는 키는 missing
+    assert result.updated == 1 and result.missing == [(gone, "velog")] and result.failed == []
+
+def test_flush_updates_in_chunks_and_reports_missing(seeder):
+    users = [seeder.user_platform("velog", f"a{i}", last_upload=BEFORE) for i in range(3)]
+    batch = LastUploadBatch(chunk_size=2)
+    for user_id in users:
+        batch.add(user_id, "velog", BEFORE)
+        batch.add(user_id, "velog", AFTER)   # 마지막 값만 반영
+    batch.add(users[0], "tistory", AFTER)   # 연동하지 않은 플랫폼
+
+    result = batch.flush()
+    assert result.updated == 3 and result.missing == [(users[0], "tistory")] and result.failed == []
+    assert [seeder.last_upload(user_id) for user_id in users] == [AFTER] * 3
+    assert len(batch) == 0
+
+class FlushingPublisher:
+    def __init__(self):
+        self.flushed = 0
+
+    def flush(self):
+        self.flushed += 1
+
+def pending_seen(user_id):
+    seen = SeenSet(horizon=BEFORE)
+    seen.add([link_key("https://velog.io/@a0/post")])
+    seen_sets = SeenSetBatch()
+    seen_sets.add(user_id, "velog", "a0", seen)
+    return seen_sets
+
+@pytest.fixture
+def seen_enabled(monkeypatch):
+    monkeypatch.setattr(seen_service, "SEEN_SET_ENABLED", True)
+
+def test_last_upload_follows_seen_flush(seeder, seen_enabled):
+    user_id = seeder.user_platform("velog", "a0", last_upload=BEFORE)
+    updates = LastUploadBatch()
+    updates.add(user_id, "velog", AFTER)
+    publisher = FlushingPublisher()
+
+    result = _flush_last_uploads(publisher, updates, pending_seen(user_id))
+    assert publisher.flushed == 1 and result.updated == 1
+    assert seeder.last_upload(user_id) == AFTER
+    assert seeder.session.query(FeedSeen).count() == 1
+
+def test_seen_flush_failure_keeps_last_upload(seeder, seen_enabled):
+    user_id = seeder.user_platform("velog", "a0", last_upload=BEFORE)
+    updates = LastUploadBatch()
+    updates.add(user_id, "velog", AFTER)
+    # 링크 집합 저장 실패
+    FeedSeen.__table__.drop(bind=engine)
+
+    result = _flush_last_uploads(FlushingPublisher(), updates, pending_seen(user_id))
+    assert result.updated == 0 and result.failed == [(user_id, "velog")]
+    assert seeder.last_upload(user_id) == BEFORE
+    assert len(updates) == 0
+
+def test_no_pending_seen_sets_still_bumps_last_upload(seeder):
+    user_id = seeder.user_platform("velog", "a0", last_upload=BEFORE)
+    updates = LastUploadBatch()
+    updates.add(user_id, "velog", BEFORE + timedelta(hours=1))
+
+    result = _flush_last_uploads(FlushingPublisher(), updates, SeenSetBatch())
+    assert result.updated == 1 and seeder.last_upload(user_id) == BEFORE + timedelta(hours=1)
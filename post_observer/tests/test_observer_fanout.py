@@ -0,0 +1,41 @@
+import json
+from collections import Counter
+from datetime import datetime
+from app.services.observer_service import check_new_posts
+
+NEWEST = datetime(2025, 11, 17, 3, 0)
+
+def published(broker):
+    """user_id별 발행한 글 링크 수"""
+    return Counter(json.loads(body)["user_id"] for queue, body in broker.messages if queue == "new_posts")
+
+def test_one_fetch_fans_out_to_new_and_existing_subscribers(seeder, broker, feed_host):
+    existing = seeder.user_platform("velog", "shared", last_upload=NEWEST)
+    new = seeder.user_platform("velog", "shared")
+
+    summary = check_new_posts()
+    assert feed_host.requests == ["shared"] and summary.feeds == 1 and summary.rows == 2
+    # 기존 구독자는 last_upload 이후 글만, 신규 구독자는 피드의 모든 글
+    assert published(broker) == {str(existing): 2, str(new): 3}
+    assert seeder.last_upload(existing) == seeder.last_upload(new) == feed_host.newest
+
+def test_fingerprint_skips_parse_only_when_every_subscriber_has_last_upload(seeder, broker, feed_host):
+    first = seeder.user_platform("velog", "shared", last_upload=NEWEST)
+    check_new_posts()
+    broker.messages.clear()
+
+    # 본문이 같고 모든 구독자가 처리된 적 있으면 파싱 생략
+    assert check_new_posts().unchanged == 1
+    assert published(broker) == {}
+
+    # 신규 구독자가 생기면 본문이 같아도 파싱해서 신규 구독자에게만 발행
+    new = seeder.user_platform("velog", "shared")
+    summary = check_new_posts()
+    assert summary.unchanged == 0 and summary.feeds == 1
+    assert published(broker) == {str(new): 3}
+    assert seeder.last_upload(first) == seeder.last_upload(new) == feed_host.newest
+
+    # 신규 구독자도 처리된 뒤에는 다시 생략
+    broker.messages.clear()
+    assert check_new_posts().unchanged == 1 and published(broker) == {}
+    assert feed_host.requests == ["shared"] * 4
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+import time
+import pytest
+from app.services import observer_service
+from app.services.observer_service import FeedState, _CheckRun, _publish_messages
+from app.services.shard_service import ShardConfig
+
+class SlowPublisher:
+    """브로커 확인을 기다리는 것처럼 flush가 오래 걸리는 발행기"""
+    batch_size = 2
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.published = []
+        self.threads = set()
+
+    def publish_body(self, queue_name, body):
+        self.threads.add(threading.current_thread().name)
+        time.sleep(0.05)
+        if self.fail:
+            raise RuntimeError("boom")
+        self.published.append(body)
+
+def new_run(publisher):
+    return _CheckRun(publisher, ShardConfig(), FeedState())
+
+def test_writes_run_in_order_off_the_event_loop():
+    publisher = SlowPublisher()
+    ticks = []
+
+    async def main():
+        run = new_run(publisher)
+        try:
+            run.submit(_publish_messages, publisher, [("new_posts", "1"), ("new_posts", "2")])
+            run.submit(_publish_messages, publisher, [("new_posts", "3")])
+            # 발행을 기다리는 동안에도 루프는 다른 작업을 진행
+            for _ in range(5):
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+            await run.drain()
+        finally:
+            run.writer.shutdown(wait=True)
+
+    started = time.perf_counter()
+    asyncio.run(main())
+    assert publisher.published == ["1", "2", "3"]
+    assert all(name.startswith("observer-writer") for name in publisher.threads)
+    assert ticks[-1] - started < 0.1
+
+def test_write_failure_skips_later_writes(monkeypatch):
+    publisher = SlowPublisher(fail=True)
+    flushed = []
+    monkeypatch.setattr(observer_service, "_flush_last_uploads", lambda *args: flushed.append(args))
+
+    async def main():
+        run = new_run(publisher)
+        try:
+            run.submit(_publish_messages, publisher, [("new_posts", "1")])
+            run.submit(observer_service._flush_last_uploads, publisher, None, None)
+            await run.drain()
+        finally:
+            run.writer.shutdown(wait=True)
+
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(main())
+    # 발행하지 못한 글의 last_upload는 올리지 않음
+    assert flushed == []
@@ -0,0 +1,91 @@
+import os
+import pickle
+import asyncio
+import signal
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+import httpx
+import pytest
+from app.models.schemas import ArticleRecord
+from app.parsers import parse_pool as parse_pool_module
+from app.parsers.parse_pool import ParsePool, article_from_row, article_to_row, create_parse_pool
+from app.services.rss_service import PARSER_MAP
+from feed_fixtures import DEFAULT_ITEMS, render_feed
+
+PLATFORMS = list(DEFAULT_ITEMS)
+
+def new_parser(platform):
+    # 정렬되지 않은 피드 기록이 테스트끼리 섞이지 않도록 새 인스턴스
+    return type(PARSER_MAP[platform])()
+
+@pytest.fixture(scope="module")
+def pool():
+    with ParsePool(workers=1) as pool:
+        yield pool
+
+def parse(pool, platform, content, watermark=None, unordered=False):
+    return asyncio.run(pool.parse(platform, content, f"test://{platform}", watermark, unordered))
+
+@pytest.mark.parametrize("platform", PLATFORMS)
+def test_pool_matches_in_process_parse(pool, platform):
+    content = render_feed(platform, seed=3)
+    expected = list(new_parser(platform).iter_content_since(content, f"test://{platform}"))
+
+    articles, unordered, parse_seconds = parse(pool, platform, content)
+    assert articles == expected and all(isinstance(article, ArticleRecord) for article in articles)
+    assert [article.to_json() for article in articles] == [article.to_json() for article in expected]
+    assert not unordered and parse_seconds > 0
+
+def test_pool_reports_unordered_feed_and_watermark(pool):
+    content = render_feed("tistory", seed=4, shuffle=True)
+    parser = new_parser("tistory")
+    newest = sorted(article.published_at for article in parser.parse_content(content, "test://tistory"))[-5]
+    watermark = newest.replace(tzinfo=None) - timedelta(seconds=1)
+    expected = list(parser.iter_content_since(content, "test://tistory", watermark))
+
+    articles, unordered, _ = parse(pool, "tistory", content, watermark)
+    # 워커가 정렬되지 않은 피드로 확인한 것을 메인 프로세스에 알림
+    assert unordered and len(articles) == 5
+    assert sorted(article.link for article in articles) == sorted(article.link for article in expected)
+
+def test_parse_async_with_pool_matches_in_process(pool):
+    content = render_feed("velog", "pool", seed=5)
+
+    def fetch(parse_pool):
+        async def main():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=content))) as client:
+                return await new_parser("velog").parse_async("pool", client, parse_pool=parse_pool)
+        return asyncio.run(main())
+
+    assert fetch(pool) == fetch(None) and len(fetch(None)) == DEFAULT_ITEMS["velog"]
+
+def test_dead_worker_fails_feed_and_restarts_pool():
+    content = render_feed("velog", seed=6)
+    with ParsePool(workers=1) as pool:
+        expected, _, _ = parse(pool, "velog", content)
+        for process in list(pool._executor._processes.values()):
+            os.kill(process.pid, signal.SIGKILL)
+            process.join()
+        # 죽은 워커에 넘긴 피드는 수집 실패, 다음 요청은 새 풀에서
+        with pytest.raises(BrokenProcessPool):
+            parse(pool, "velog", content)
+        assert parse(pool, "velog", content)[0] == expected
+
+def test_create_parse_pool_falls_back_when_unavailable(monkeypatch):
+    assert create_parse_pool(0) is None
+
+    def unavailable(self):
+        raise OSError("[Errno 38] Function not implemented")
+
+    monkeypatch.setattr(parse_pool_module.ParsePool, "_create_executor", unavailable)
+    # 풀을 만들 수 없으면 실행을 멈추지 않고 수집 태스크에서 파싱
+    assert create_parse_pool(2) is None
+
+@pytest.mark.parametrize("tags", [None, [], ["파이썬", "회고"]])
+def test_row_round_trip(tags):
+    article = ArticleRecord("제목", "https://velog.io/@a/1", datetime(2025, 11, 17, 3, 0), "https://img/1.png", tags)
+    row = article_to_row(article)
+    # 워커와 주고받는 튜플은 pickle 가능하고 태그 목록 대신 튜플
+    assert row == pickle.loads(pickle.dumps(row)) and (tags is None or isinstance(row[4], tuple))
+    restored = article_from_row(pickle.loads(pickle.dumps(row)))
+    assert restored == article and restored.tags == tags and restored.to_json() == article.to_json()
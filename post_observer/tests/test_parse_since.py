@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from app.services.rss_service import PARSER_MAP
+from feed_fixtures import DEFAULT_ITEMS, render_feed
+
+PLATFORMS = list(DEFAULT_ITEMS)
+
+# render_feed 기본 최근 글 발행 시각
+NEWEST = datetime(2025, 11, 17, 3, 0, tzinfo=timezone.utc)
+
+def new_parser(platform):
+    # 정렬되지 않은 피드 기록이 테스트끼리 섞이지 않도록 새 인스턴스
+    return type(PARSER_MAP[platform])()
+
+def watermark_after(articles, newest):
+    """가장 최근 newest 개만 새 글이 되는 watermark"""
+    published = sorted((article.published_at for article in articles), reverse=True)
+    return published[newest].replace(tzinfo=None)
+
+@pytest.mark.parametrize("platform", PLATFORMS)
+def test_returns_only_articles_after_watermark(platform):
+    parser = new_parser(platform)
+    content = render_feed(platform, seed=1)
+    articles = parser.parse_content(content, "test://feed")
+    watermark = watermark_after(articles, 3)
+
+    since = list(parser.iter_content_since(content, "test://feed", watermark))
+    assert [article.link for article in since] == [article.link for article in articles[:3]]
+    # watermark가 없으면 전체
+    assert [article.link for article in parser.iter_content_since(content, "test://feed")] == [
+        article.link for article in articles
+    ]
+
+@pytest.mark.parametrize("platform", PLATFORMS)
+def test_ordered_feed_stops_normalizing_at_watermark(platform, monkeypatch):
+    parser = new_parser(platform)
+    content = render_feed(platform, seed=1)
+    watermark = watermark_after(parser.parse_content(content, "test://feed"), 1)
+
+    normalized = []
+    normalize = parser._normalize_entry
+    monkeypatch.setattr(parser, "_normalize_entry", lambda entry: normalized.append(entry) or normalize(entry))
+    assert len(list(parser.iter_content_since(content, "test://feed", watermark))) == 1
+    assert len(normalized) == 1
+    assert not parser.known_unordered("test://feed")
+
+@pytest.mark.parametrize("platform", PLATFORMS)
+def test_unordered_feed_falls_back_to_full_scan(platform):
+    parser = new_parser(platform)
+    content = render_feed(platform, seed=1, shuffle=True)
+    articles = parser.parse_content(content, "test://shuffled")
+    watermark = watermark_after(articles, 5)
+    expected = {article.link for article in articles if article.published_at.replace(tzinfo=None) > watermark}
+
+    got = {article.link for article in parser.iter_content_since(content, "test://shuffled", watermark)}
+    assert got == expected
+    assert parser.known_unordered("test://shuffled")
+    # 다음부터는 처음부터 모든 엔트리를 확인
+    assert {a.link for a in parser.iter_content_since(content, "test://shuffled", watermark)} == expected
+
+def test_new_posts_on_same_feed():
+    parser = new_parser("velog")
+    before = render_feed("velog", seed=1)
+    watermark = max(article.published_at for article in parser.parse_content(before, "test://feed")).replace(tzinfo=None)
+
+    after = render_feed("velog", seed=1, new_posts=2, newest=NEWEST + timedelta(days=2))
+    assert len(list(parser.iter_content_since(after, "test://feed", watermark))) == 2
@@ -0,0 +1,77 @@
+import pika
+import pytest
+from app.dependencies import rabbitmq
+from app.dependencies.rabbitmq import RabbitMQPublisher
+
+class FakeChannel:
+    def __init__(self, broker):
+        self.broker = broker
+        self.is_closed = False
+        self._uncommitted = []
+
+    def tx_select(self):
+        pass
+
+    def queue_declare(self, queue, durable):
+        pass
+
+    def basic_publish(self, exchange, routing_key, body, properties):
+        if self.broker.fail:
+            raise pika.exceptions.StreamLostError("boom")
+        self._uncommitted.append((routing_key, body))
+
+    def tx_commit(self):
+        self.broker.commits += 1
+        self.broker.messages += self._uncommitted
+        self._uncommitted = []
+
+class FakeConnection:
+    def __init__(self, broker):
+        self.broker = broker
+        self.is_closed = False
+
+    def channel(self):
+        return FakeChannel(self.broker)
+
+    def close(self):
+        self.is_closed = True
+        self.broker.closed += 1
+
+class FakeBroker:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.messages = []
+        self.commits = 0
+        self.closed = 0
+
+    def connect(self):
+        return FakeConnection(self)
+
+@pytest.fixture
+def broker(monkeypatch):
+    broker = FakeBroker()
+    monkeypatch.setattr(rabbitmq, "get_rabbitmq_connection", broker.connect)
+    return broker
+
+def test_publishes_in_batches_and_flushes_on_close(broker):
+    with RabbitMQPublisher(batch_size=2) as publisher:
+        for i in range(5):
+            publisher.publish_body("new_posts", str(i))
+        # 배치마다 커밋 한 번
+        assert broker.commits == 2
+    assert [body for _, body in broker.messages] == ["0", "1", "2", "3", "4"]
+    assert broker.commits == 3 and broker.closed == 1
+
+def test_close_raises_flush_error_without_exception(broker):
+    broker.fail = True
+    with pytest.raises(pika.exceptions.StreamLostError):
+        with RabbitMQPublisher(max_retries=1) as publisher:
+            publisher.publish_body("new_posts", "1")
+
+def test_flush_error_does_not_mask_exception(broker):
+    broker.fail = True
+    with pytest.raises(ValueError, match="original"):
+        with RabbitMQPublisher(max_retries=1) as publisher:
+            publisher.publish_body("new_posts", "1")
+            raise ValueError("original")
+    assert broker.messages == []
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+from app.models.schemas import ArticleRecord
+from app.services import schedule_service
+from app.services.schedule_service import FeedStats, FeedScheduleStore, poll_interval, update_stats
+
+NOW = datetime(2025, 11, 17, 3, 0)
+
+def article(published_at: datetime) -> ArticleRecord:
+    return ArticleRecord("title", f"https://velog.io/@a/{published_at.isoformat()}", published_at, None, None)
+
+def test_poll_interval_follows_posting_rate():
+    # 하루 한 번 쓰는 블로그는 반나절마다
+    stats = FeedStats(mean_interval_seconds=86400, last_published_at=NOW - timedelta(hours=1))
+    assert poll_interval(stats, NOW) == timedelta(hours=12)
+
+def test_poll_interval_is_clamped():
+    busy = FeedStats(mean_interval_seconds=60, last_published_at=NOW)
+    assert poll_interval(busy, NOW) == schedule_service.MIN_POLL_INTERVAL
+    # 오래 쉬는 블로그도 MAX_STALENESS보다 오래 두지 않음
+    quiet = FeedStats(mean_interval_seconds=3600, last_published_at=NOW - timedelta(days=90))
+    assert poll_interval(quiet, NOW) == schedule_service.MAX_STALENESS
+    assert poll_interval(FeedStats(), NOW) == schedule_service.MIN_POLL_INTERVAL
+
+def test_update_stats_uses_only_new_posts():
+    stats = FeedStats()
+    update_stats(stats, [NOW - timedelta(hours=4), NOW - timedelta(hours=2), NOW])
+    assert stats.mean_interval_seconds == 7200
+    assert stats.last_published_at == NOW
+    # 이미 본 글은 무시, 새 글 간격은 지수 이동 평균
+    update_stats(stats, [NOW - timedelta(hours=2), NOW + timedelta(hours=12)])
+    alpha = schedule_service.INTERVAL_EWMA_ALPHA
+    assert stats.mean_interval_seconds == alpha * 12 * 3600 + (1 - alpha) * 7200
+    assert stats.last_published_at == NOW + timedelta(hours=12)
+
+def test_unknown_feed_is_due():
+    store = FeedScheduleStore(run_started_at=NOW)
+    assert store.is_due("velog", "a")
+
+def test_recorded_feed_waits_for_next_due():
+    store = FeedScheduleStore(run_started_at=NOW)
+    store.record("velog", "a", [article(NOW - timedelta(hours=4)), article(NOW - timedelta(hours=2)), article(NOW)])
+    # 평균 2시간 -> 1시간 뒤
+    store.start_run(NOW + timedelta(minutes=20))
+    assert not store.is_due("velog", "a")
+    store.start_run(NOW + timedelta(hours=1))
+    assert store.is_due("velog", "a")
+
+def test_feed_at_max_staleness_is_due_on_slightly_early_daily_run():
+    # 크론잡이 앞선 실행보다 조금 일찍 시작해도 MAX_STALENESS에 걸린 피드를 한 주기 더 미루지 않음
+    store = FeedScheduleStore(run_started_at=NOW)
+    store.record("velog", "quiet", [article(NOW - timedelta(days=90))])
+    assert store._stats[("velog", "quiet")].next_due_at == NOW + schedule_service.MAX_STALENESS
+
+    store.start_run(NOW + schedule_service.MAX_STALENESS - timedelta(minutes=5))
+    assert store.is_due("velog", "quiet")
+    store.start_run(NOW + schedule_service.MAX_STALENESS - schedule_service.DUE_TOLERANCE - timedelta(minutes=1))
+    assert not store.is_due("velog", "quiet")
@@ -0,0 +1,40 @@
+import json
+from datetime import datetime, timedelta, timezone
+import pytest
+from app.models.schemas import ArticleRecord, ArticleSchema, encode_new_post_message, encode_new_posts_batch_message
+
+KST = timezone(timedelta(hours=9))
+
+ARTICLES = [
+    # naive 발행 시각 (파서가 만드는 기본 형태)
+    ArticleRecord("First post", "https://velog.io/@a/first", datetime(2025, 11, 17, 3, 0), None, None),
+    ArticleRecord("마이크로초", "https://velog.io/@a/micro", datetime(2025, 11, 17, 3, 0, 0, 123456), None, []),
+    # UTC는 pydantic처럼 Z, 다른 오프셋은 그대로
+    ArticleRecord("UTC", "https://a.tistory.com/1", datetime(2025, 11, 17, 3, 0, tzinfo=timezone.utc), "https://img/1.png", ["tech"]),
+    ArticleRecord("KST", "https://a.tistory.com/2", datetime(2025, 11, 17, 12, 0, tzinfo=KST), None, None),
+    # 한글 / 이모지 / 따옴표 / 역슬래시 / 제어 문자
+    ArticleRecord("잔디 🌱 \"심기\" \\ 탭\t줄\n바꿈", "https://blog.naver.com/a/223?x=1&y=2", datetime(2025, 1, 1), "", ["파이썬", "회고"]),
+]
+
+def schema(article: ArticleRecord) -> ArticleSchema:
+    return ArticleSchema(
+        title=article.title, link=article.link, published_at=article.published_at, thumbnail=article.thumbnail, tags=article.tags,
+    )
+
+@pytest.mark.parametrize("article", ARTICLES, ids=lambda article: article.link)
+def test_to_json_matches_schema_dump(article):
+    # 기존 발행 경로 json.dumps(model_dump(mode='json'), ensure_ascii=False)와 바이트 단위로 같음
+    assert article.to_json() == json.dumps(schema(article).model_dump(mode="json"), ensure_ascii=False)
+    # model_dump_json과는 공백만 다르고 같은 값
+    assert json.loads(article.to_json()) == json.loads(schema(article).model_dump_json())
+
+def test_messages_match_schema_dump():
+    old = {"user_id": "user-1", "platform": "velog", "article": schema(ARTICLES[4]).model_dump(mode="json")}
+    assert encode_new_post_message("user-1", "velog", ARTICLES[4]) == json.dumps(old, ensure_ascii=False)
+
+    batch = {"user_id": "user-1", "platform": "velog", "articles": [schema(article).model_dump(mode="json") for article in ARTICLES]}
+    assert encode_new_posts_batch_message("user-1", "velog", ARTICLES) == json.dumps(batch, ensure_ascii=False)
+
+def test_from_schema_round_trip():
+    for article in ARTICLES:
+        assert ArticleRecord.from_schema(schema(article)) == article
@@ -0,0 +1,79 @@
+import os
+from datetime import datetime, timedelta
+import pytest
+from app.models.schemas import ArticleRecord
+from app.services import observer_service
+from app.services.observer_service import _Outbox, _process_feed
+from app.services.platform_service import LastUploadBatch, UserPlatformInfo
+from app.services.seen_service import (
+    SeenSet, SeenSetBatch, bloom_size, link_key, SEEN_BLOOM_CAPACITY, SEEN_BLOOM_FP_RATE, SEEN_RECENT_SIZE,
+)
+
+def random_keys(count):
+    return [os.urandom(8) for _ in range(count)]
+
+@pytest.mark.parametrize("capacity, fp_rate", [(1000, 0.01), (100, 0.001), (5000, 0.05)])
+def test_bloom_size_matches_target_rate(capacity, fp_rate):
+    size, hashes = bloom_size(capacity, fp_rate)
+    # 이론 거짓 양성률 (1 - e^(-kn/m))^k
+    bits = size * 8
+    rate = (1 - (1 - 1 / bits) ** (hashes * capacity)) ** hashes
+    assert rate <= fp_rate * 1.05
+
+def test_false_positive_rate_after_expected_load():
+    seen = SeenSet()
+    keys = random_keys(SEEN_BLOOM_CAPACITY)
+    seen.add(keys)
+    assert all(seen.might_contain(key) for key in keys)
+
+    probes = random_keys(20000)
+    false_positives = sum(seen.might_contain(key) for key in probes)
+    assert false_positives / len(probes) <= SEEN_BLOOM_FP_RATE * 1.5
+
+def test_recent_keeps_latest_and_bloom_keeps_all():
+    seen = SeenSet()
+    keys = random_keys(SEEN_RECENT_SIZE + 10)
+    for key in keys:
+        seen.add([key])
+    assert len(seen.recent) == SEEN_RECENT_SIZE
+    assert keys[-1] in seen and keys[0] not in seen
+    assert seen.might_contain(keys[0])
+
+def test_row_round_trip_keeps_filter_shape():
+    seen = SeenSet(bloom=bytearray(64), hashes=3, horizon=datetime(2025, 1, 1))
+    keys = random_keys(5)
+    seen.add(keys)
+    row = seen.to_row()
+    loaded = SeenSet.from_row(row["recent_keys"], row["bloom"], row["bloom_hashes"], row["horizon"])
+    assert loaded.hashes == 3 and len(loaded.bloom) == 64 and loaded.stored
+    assert all(key in loaded and loaded.might_contain(key) for key in keys)
+
+def article(name, published_at):
+    return ArticleRecord(title=name, link=f"https://velog.io/@a/{name}", published_at=published_at)
+
+def test_process_feed_adds_only_published_links():
+    now = datetime(2025, 1, 10)
+    old = article("old", now - timedelta(days=2))
+    seen = SeenSet(horizon=now - timedelta(days=7))
+    up = UserPlatformInfo("u", "velog", "a", last_upload=now - timedelta(days=1), seen=seen)
+    seen.add([link_key(old.link)])
+    # 집합을 만든 뒤 앞선 실행에서 발행하지 않은 글 (발행 시각이 horizon 이전)
+    skipped = article("skipped", now - timedelta(days=8))
+    fresh = article("fresh", now)
+    outbox = _Outbox()
+
+    new_posts = _process_feed(up, [fresh, old, skipped], outbox, LastUploadBatch(), SeenSetBatch())
+    assert new_posts == 1 and len(outbox) == 1
+    assert link_key(fresh.link) in seen
+    assert link_key(skipped.link) not in seen and not seen.might_contain(link_key(skipped.link))
+
+def test_process_feed_seeds_new_set_with_parsed_links(monkeypatch):
+    monkeypatch.setattr(observer_service, "SEEN_SET_ENABLED", True)
+    now = datetime(2025, 1, 10)
+    processed = article("processed", now - timedelta(days=2))
+    fresh = article("fresh", now)
+    up = UserPlatformInfo("u", "velog", "a", last_upload=now - timedelta(days=1))
+
+    assert _process_feed(up, [fresh, processed], _Outbox(), LastUploadBatch(), SeenSetBatch(), now - timedelta(days=7)) == 1
+    # 기존 규칙으로 이미 처리한 글도 발행한 것으로 기록 (다음 실행에서 소급 발행 글로 보지 않도록)
+    assert link_key(processed.link) in up.seen and link_key(fresh.link) in up.seen
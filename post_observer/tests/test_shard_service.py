@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+import pytest
+from app.models.db_models import ObserverShardRun
+from app.services.shard_service import ShardConfig, finish_shard, shard_of, SHARD_RUN_RETENTION_DAYS
+
+FEEDS = [("velog", "alice"), ("velog", "bob"), ("velog", "carol"), ("velog", "dave"), ("tistory", "alice")]
+
+def test_shard_of_is_stable_crc32():
+    # 파드가 달라도 같은 번호 (hash()처럼 프로세스마다 바뀌면 피드가 샤드 사이를 옮겨 다님)
+    assert [shard_of(platform_name, account_id, 4) for platform_name, account_id in FEEDS] == [1, 2, 1, 3, 0]
+
+def test_each_feed_owned_by_exactly_one_shard():
+    shards = [ShardConfig(index=i, count=4, run_id="run") for i in range(4)]
+    for platform_name, account_id in FEEDS:
+        owners = [shard.index for shard in shards if shard.owns(platform_name, account_id)]
+        assert owners == [shard_of(platform_name, account_id, 4)]
+    # 샤드 모드가 아니면 모든 피드 처리
+    assert all(ShardConfig().owns(platform_name, account_id) for platform_name, account_id in FEEDS)
+
+def test_user_id_ranges_cover_uuid_space():
+    assert ShardConfig().user_id_range() == (None, None)
+    ranges = [ShardConfig(index=i, count=3, run_id="run").user_id_range() for i in range(3)]
+    # 처음과 끝은 열려 있고 앞 샤드의 상한이 다음 샤드의 하한
+    assert ranges[0][0] is None and ranges[-1][1] is None
+    assert all(previous[1] == current[0] for previous, current in zip(ranges, ranges[1:]))
+    assert [bound.int for bound in (ranges[0][1], ranges[1][1])] == [(1 << 128) // 3, (2 << 128) // 3]
+
+@pytest.mark.parametrize("index, count", [(0, 0), (2, 2), (-1, 2)])
+def test_invalid_shard_rejected(index, count):
+    with pytest.raises(ValueError):
+        ShardConfig(index=index, count=count)
+
+def test_from_env_uses_job_completion_index(monkeypatch):
+    monkeypatch.setenv("OBSERVER_SHARD_COUNT", "3")
+    monkeypatch.delenv("OBSERVER_SHARD_INDEX", raising=False)
+    monkeypatch.setenv("JOB_COMPLETION_INDEX", "2")
+    monkeypatch.setenv("OBSERVER_RUN_ID", "post-observer-1234")
+    shard = ShardConfig.from_env()
+    assert (shard.index, shard.count, shard.run_id, shard.enabled) == (2, 3, "post-observer-1234", True)
+
+def test_last_shard_publishes_aggregated_refresh(seeder):
+    published = []
+    shards = [ShardConfig(index=i, count=3, run_id="run-1") for i in range(3)]
+
+    assert not finish_shard(shards[2], 4, published.append)
+    assert not finish_shard(shards[0], 1, published.append)
+    assert published == []
+    assert finish_shard(shards[1], 2, published.append)
+    assert published == [7]
+
+    # 모든 샤드가 끝난 뒤 재시도된 샤드는 다시 발행하지 않음
+    assert not finish_shard(shards[0], 1, published.append)
+    assert published == [7]
+
+def test_retried_shard_overwrites_count(seeder):
+    published = []
+    shards = [ShardConfig(index=i, count=2, run_id="run-2") for i in range(2)]
+
+    finish_shard(shards[0], 5, published.append)
+    # 같은 샤드가 재시도되면 앞선 시도의 개수를 덮어씀 (두 번 더하지 않음)
+    finish_shard(shards[0], 3, published.append)
+    assert finish_shard(shards[1], 1, published.append)
+    assert published == [4]
+    assert seeder.session.query(ObserverShardRun).filter(ObserverShardRun.run_id == "run-2").count() == 2
+
+def test_runs_are_aggregated_separately_and_old_runs_pruned(seeder):
+    old = datetime.utcnow() - timedelta(days=SHARD_RUN_RETENTION_DAYS + 1)
+    seeder.session.add(ObserverShardRun(run_id="old", shard_index=0, shard_count=2, new_posts=9, finished_at=old))
+    seeder.session.commit()
+
+    published = []
+    finish_shard(ShardConfig(index=0, count=2, run_id="run-3"), 1, published.append)
+    finish_shard(ShardConfig(index=0, count=2, run_id="run-4"), 10, published.append)
+    assert finish_shard(ShardConfig(index=1, count=2, run_id="run-3"), 2, published.append)
+    assert published == [3]
+
+    seeder.session.expire_all()
+    assert {row.run_id for row in seeder.session.query(ObserverShardRun)} == {"run-3", "run-4"}
@@ -0,0 +1,130 @@
+import os
+import hmac
+import asyncio
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qsl
+import httpx
+import pytest
+from app.dependencies.health_server import start_health_server
+from app.dependencies.http_client import FeedClient
+from app.dependencies.rabbitmq import RabbitMQPublisher
+from app.services import platform_service, websub_service
+from app.services.observer_service import process_pushed_feed
+from app.services.websub_service import CALLBACK_PATH, WebSubReceiver, WebSubStore, subscribe
+from feed_fixtures import render_feed
+
+HUB_URL = "https://hub.example.com/"
+TOPIC_URL = "https://v2.velog.io/rss/push"
+NEWEST = datetime(2025, 11, 17, 3, 0, tzinfo=timezone.utc)
+
+class StandInHub:
+    """
+    로컬 대역 허브
+
+    구독 요청을 받으면 콜백으로 구독 의사를 확인하고(hub.challenge), publish하면 토픽 문서를
+    X-Hub-Signature(sha256 HMAC)와 함께 구독자 콜백으로 배포한다.
+    """
+
+    def __init__(self):
+        self.subscriptions = {}   # topic -> (callback, secret)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        """허브 엔드포인트 (httpx.MockTransport 핸들러)"""
+        form = dict(parse_qsl(request.content.decode()))
+        if form.get("hub.mode") != "subscribe":
+            return httpx.Response(400)
+        # 실제 허브는 202 응답 후 비동기로 확인하지만 테스트에서는 응답 전에 확인
+        challenge = os.urandom(8).hex()
+        response = httpx.get(form["hub.callback"], params={
+            "hub.mode": "subscribe", "hub.topic": form["hub.topic"], "hub.challenge": challenge,
+            "hub.lease_seconds": form["hub.lease_seconds"],
+        })
+        if response.status_code == 200 and response.text == challenge:
+            self.subscriptions[form["hub.topic"]] = (form["hub.callback"], form["hub.secret"])
+        return httpx.Response(202)
+
+    def publish(self, topic: str, body: bytes, secret: str = None) -> int:
+        callback, subscribed_secret = self.subscriptions[topic]
+        signature = hmac.new((secret or subscribed_secret).encode(), body, hashlib.sha256).hexdigest()
+        return httpx.post(callback, content=body, headers={
+            "Content-Type": "application/rss+xml", "X-Hub-Signature": f"sha256={signature}",
+        }).status_code
+
+def feed(new_posts: int) -> bytes:
+    return render_feed(
+        "velog", "push", items=3, newest=NEWEST + timedelta(hours=new_posts), interval=timedelta(hours=1),
+        new_posts=new_posts, hub=(HUB_URL, TOPIC_URL),
+    )
+
+@pytest.fixture
+def receiver(monkeypatch):
+    """수신기(health_server 라우트)를 띄우고 (저장소, 받은 배포 목록, 콜백 주소) 반환"""
+    store = WebSubStore()
+    pushes = []
+    receiver = WebSubReceiver(lambda: store, lambda subscription, body: pushes.append((subscription, body)) or True)
+    server = start_health_server(0, lambda: (True, {}), host="127.0.0.1", routes={CALLBACK_PATH: receiver.handle})
+    callback_url = f"http://127.0.0.1:{server.server_port}"
+    monkeypatch.setattr(websub_service, "WEBSUB_CALLBACK_URL", callback_url)
+    try:
+        yield store, pushes, callback_url
+    finally:
+        server.shutdown()
+
+def subscribe_all(store: WebSubStore, hub: StandInHub):
+    async def main():
+        async with FeedClient(httpx.AsyncClient(transport=httpx.MockTransport(hub.handle))) as client:
+            return [await subscribe(client, subscription) for subscription in store.due_for_subscribe(datetime.utcnow())]
+    return asyncio.run(main())
+
+def test_subscription_verified_by_hub(receiver):
+    store, _, _ = receiver
+    hub = StandInHub()
+    store.advertised("velog", "push", HUB_URL, TOPIC_URL)
+    assert not store.is_active("velog", "push")
+
+    assert subscribe_all(store, hub) == [True]
+    assert TOPIC_URL in hub.subscriptions
+    assert store.is_active("velog", "push")
+    # 최근에 요청한 구독은 다시 요청하지 않음
+    assert store.due_for_subscribe(datetime.utcnow()) == []
+
+def test_signed_push_published_once(receiver, seeder, broker):
+    store, pushes, _ = receiver
+    hub = StandInHub()
+    user_id = seeder.user_platform("velog", "push", last_upload=NEWEST.replace(tzinfo=None))
+    store.advertised("velog", "push", HUB_URL, TOPIC_URL)
+    subscribe_all(store, hub)
+
+    def handle_pushes():
+        # daemon처럼 배포마다 DB 상태(last_upload, 링크 집합)로 구독자를 만들어 처리
+        subscribers = list(platform_service.iter_user_platforms())
+        with RabbitMQPublisher() as publisher:
+            new_posts = sum(process_pushed_feed(publisher, subscribers, body, s.topic_url) for s, body in pushes)
+        pushes.clear()
+        return new_posts
+
+    body = feed(new_posts=2)
+    assert hub.publish(TOPIC_URL, body) == 202
+    assert handle_pushes() == 2
+    links = [json.loads(message)["article"]["link"] for queue, message in broker.messages if queue == "new_posts"]
+    assert len(links) == 2 and seeder.last_upload(user_id) == (NEWEST + timedelta(hours=2)).replace(tzinfo=None)
+
+    # 같은 문서를 다시 배포해도 다시 발행하지 않음
+    assert hub.publish(TOPIC_URL, body) == 202
+    assert handle_pushes() == 0
+    assert [queue for queue, _ in broker.messages].count("new_posts") == 2
+
+def test_bad_signature_and_unknown_callback_ignored(receiver):
+    store, pushes, callback_url = receiver
+    hub = StandInHub()
+    store.advertised("velog", "push", HUB_URL, TOPIC_URL)
+    subscribe_all(store, hub)
+
+    # 서명이 틀린 배포는 명세대로 2xx로 응답하되 버림
+    assert hub.publish(TOPIC_URL, feed(new_posts=1), secret="wrong-secret") == 202
+    assert pushes == []
+
+    response = httpx.post(f"{callback_url}{CALLBACK_PATH}unknown", content=b"<rss/>", headers={"X-Hub-Signature": "sha256=00"})
+    assert response.status_code == 410